@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".aac", ".flac", ".ogg", ".mp4")
+DEFAULT_BATCH_WORKERS = 2
+REPORT_FILENAME = "batch_report.json"
+
+# One pipeline per worker process, built by the pool initializer so imports,
+# station config and the transcript store handle are paid for once per worker.
+_WORKER_PIPELINE: Optional[StorySegmentationPipeline] = None
+
+
+@dataclass
+class BatchItem:
+    audio_path: Path
+    output_dir: Path
+
+
+@dataclass
+class BatchFileResult:
+    audio_path: Path
+    output_dir: Path
+    manifest_path: Optional[Path] = None
+    duration_s: float = 0.0
+    wall_s: float = 0.0
+    segments: int = 0
+    stage_s: Dict[str, float] = field(default_factory=dict)
+    worker: int = 0
+    error: Optional[str] = None
+    failed_stages: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "audio": str(self.audio_path),
+            "output_dir": str(self.output_dir),
+            "manifest": str(self.manifest_path) if self.manifest_path else None,
+            "duration_s": round(self.duration_s, 3),
+            "wall_s": round(self.wall_s, 3),
+            "segments": self.segments,
+            "stage_s": {name: round(value, 6) for name, value in self.stage_s.items()},
+            "worker": self.worker,
+            "error": self.error,
+            "failed_stages": self.failed_stages,
+        }
+
+
+@dataclass
+class BatchReport:
+    files: List[BatchFileResult] = field(default_factory=list)
+    wall_s: float = 0.0
+    workers: int = 1
+
+    @property
+    def audio_s(self) -> float:
+        return sum(item.duration_s for item in self.files if item.ok)
+
+    @property
+    def failures(self) -> int:
+        return sum(1 for item in self.files if not item.ok)
+
+    @property
+    def audio_hours_per_wall_hour(self) -> float:
+        """Seconds of audio segmented per second of wall time, across all workers."""
+
+        return self.audio_s / self.wall_s if self.wall_s > 0 else 0.0
+
+    @property
+    def stage_s(self) -> Dict[str, float]:
+        """Time spent in each stage, summed over every file that finished."""
+
+        totals: Dict[str, float] = {}
+        for item in self.files:
+            for name, value in item.stage_s.items():
+                totals[name] = totals.get(name, 0.0) + value
+        return totals
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "files": len(self.files),
+            "failures": self.failures,
+            "workers": self.workers,
+            "audio_s": round(self.audio_s, 3),
+            "wall_s": round(self.wall_s, 3),
+            "audio_hours_per_wall_hour": round(self.audio_hours_per_wall_hour, 3),
+            "stage_s": {name: round(value, 6) for name, value in self.stage_s.items()},
+            "results": [item.to_payload() for item in self.files],
+        }
+
+
+def collect_batch_items(source: Path, out_dir: Path) -> List[BatchItem]:
+    """Files to segment from a directory of audio or a CSV manifest.
+
+    A directory is searched recursively for :data:`AUDIO_EXTENSIONS` and each
+    file gets ``out_dir/<relative path without suffix>``. A CSV needs an
+    ``audio`` (or ``path``) column and may name an ``out`` directory per row;
+    relative paths in it resolve against the CSV's own directory, and rows
+    without ``out`` get ``out_dir/<path relative to the CSV without suffix>``.
+    Two files mapping to the same output directory raise :class:`ValueError`,
+    since their workers would overwrite each other's manifest and clips.
+    """
+
+    source = source.expanduser().resolve()
+    out_dir = out_dir.expanduser()
+    if source.is_dir():
+        return _unique_outputs(
+            [
+                BatchItem(audio_path=path, output_dir=_default_output(path, source, out_dir))
+                for path in sorted(source.rglob("*"))
+                if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS
+            ]
+        )
+
+    items: List[BatchItem] = []
+    with source.open(newline="") as handle:
+        reader = csv.DictReader(handle)
+        fieldnames = reader.fieldnames or []
+        column = next((name for name in ("audio", "path") if name in fieldnames), None)
+        if column is None:
+            raise ValueError(f"{source} needs an 'audio' or 'path' column")
+        for row in reader:
+            value = (row.get(column) or "").strip()
+            if not value:
+                continue
+            audio_path = _resolve(source.parent, value)
+            out_value = (row.get("out") or "").strip()
+            output_dir = (
+                _resolve(source.parent, out_value)
+                if out_value
+                else _default_output(audio_path, source.parent, out_dir)
+            )
+            items.append(BatchItem(audio_path=audio_path, output_dir=output_dir))
+    return _unique_outputs(items)
+
+
+def run_batch(
+    items: Sequence[BatchItem],
+    config: PipelineConfig,
+    *,
+    workers: int = DEFAULT_BATCH_WORKERS,
+    report_path: Optional[Path] = None,
+) -> BatchReport:
+    """Segment every item, ``workers`` files at a time, and write the throughput report.
+
+    Each worker process keeps one :class:`StorySegmentationPipeline` for its
+    lifetime. With ``workers <= 1`` the files run in this process instead. A
+    failing file is recorded in the report and does not stop the batch.
+    """
+
+    workers = max(1, min(workers, len(items) or 1))
+    started = time.perf_counter()
+    if workers == 1:
+        _init_worker(config)
+        results = []
+        for item in items:
+            results.append(_run_item(item))
+            _log_result(results[-1])
+    else:
+        results_by_index: Dict[int, BatchFileResult] = {}
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(config,)
+        ) as pool:
+            futures = {pool.submit(_run_item, item): idx for idx, item in enumerate(items)}
+            for future in as_completed(futures):
+                result = future.result()
+                results_by_index[futures[future]] = result
+                _log_result(result)
+        results = [results_by_index[idx] for idx in range(len(items))]
+
+    report = BatchReport(files=results, wall_s=time.perf_counter() - started, workers=workers)
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(report.to_payload(), indent=2))
+    logger.info(
+        "Batch finished",
+        extra={
+            "files": len(report.files),
+            "failures": report.failures,
+            "audio_s": round(report.audio_s, 1),
+            "wall_s": round(report.wall_s, 1),
+            "audio_hours_per_wall_hour": round(report.audio_hours_per_wall_hour, 2),
+        },
+    )
+    return report
+
+
+def _init_worker(config: PipelineConfig) -> None:
+    global _WORKER_PIPELINE
+    _WORKER_PIPELINE = StorySegmentationPipeline(config=config)
+
+
+def _run_item(item: BatchItem) -> BatchFileResult:
+    result = BatchFileResult(
+        audio_path=item.audio_path, output_dir=item.output_dir, worker=os.getpid()
+    )
+    if _WORKER_PIPELINE is None:  # pragma: no cover - initializer always runs first
+        raise RuntimeError("Batch worker was not initialized")
+    started = time.perf_counter()
+    try:
+        outcome = _WORKER_PIPELINE.run(audio_path=item.audio_path, output_dir=item.output_dir)
+    except Exception as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+    else:
+        result.manifest_path = outcome.manifest_path
+        result.duration_s = outcome.metadata.duration_s if outcome.metadata else 0.0
+        result.segments = len(outcome.segments)
+        result.failed_stages = list(outcome.failed_stages)
+        if outcome.metrics:
+            stages = [(m.name, m.wall_s) for m in outcome.metrics if m.parent is None]
+        else:
+            stages = [(timing.name, timing.duration_s) for timing in outcome.stage_timings]
+        for name, duration_s in stages:
+            result.stage_s[name] = result.stage_s.get(name, 0.0) + duration_s
+    result.wall_s = time.perf_counter() - started
+    return result
+
+
+def _log_result(result: BatchFileResult) -> None:
+    if result.ok:
+        logger.info(
+            "Segmented file",
+            extra={
+                "audio": str(result.audio_path),
+                "segments": result.segments,
+                "duration_s": round(result.duration_s, 1),
+                "wall_s": round(result.wall_s, 1),
+            },
+        )
+    else:
+        logger.warning(
+            "Segmentation failed", extra={"audio": str(result.audio_path), "error": result.error}
+        )
+
+
+def _default_output(audio_path: Path, base: Path, out_dir: Path) -> Path:
+    try:
+        return out_dir / audio_path.relative_to(base).with_suffix("")
+    except ValueError:
+        return out_dir / audio_path.stem
+
+
+def _unique_outputs(items: List[BatchItem]) -> List[BatchItem]:
+    seen: Dict[Path, Path] = {}
+    for item in items:
+        other = seen.setdefault(item.output_dir, item.audio_path)
+        if other != item.audio_path:
+            raise ValueError(
+                f"{other} and {item.audio_path} would both write to {item.output_dir}; "
+                "give one of them its own 'out' directory"
+            )
+    return items
+
+
+def _resolve(base: Path, value: str) -> Path:
+    path = Path(value).expanduser()
+    return path if path.is_absolute() else (base / path).resolve()
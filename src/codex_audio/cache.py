@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+from codex_audio.boundary.candidates import BoundaryCandidate
+from codex_audio.features.embeddings import AudioEmbedding, EmbeddingMatrix
+from codex_audio.features.spectrogram import FrameFeatures
+from codex_audio.features.vad import VadSegment
+from codex_audio.text_features.embeddings import ChunkEmbedding, ChunkEmbeddingMatrix
+from codex_audio.text_features.segments import TextChunk
+from codex_audio.transcription import TranscriptionOutput
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CACHE_MAX_BYTES = 5 * 1024**3
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class ArtifactCodec(Generic[T]):
+    """How one artifact type is written to and read from a cache entry."""
+
+    suffix: str
+    dump: Callable[[T, Path], None]
+    load: Callable[[Path], T]
+
+
+class ArtifactCache:
+    """Content-addressed artifact store with size-based LRU eviction.
+
+    Entries live at ``<root>/<key><suffix>``. Reads refresh the entry's mtime, and
+    each write evicts the least recently used entries until the directory fits in
+    ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, *, max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self.root = root.expanduser().resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Pipeline stages run on a thread pool and share one cache instance.
+        self._lock = threading.Lock()
+
+    def path_for(self, key: str, suffix: str) -> Path:
+        return self.root / f"{key}{suffix}"
+
+    def lookup(self, key: str, suffix: str) -> Optional[Path]:
+        path = self.path_for(key, suffix)
+        with self._lock:
+            if not path.exists():
+                self.misses += 1
+                return None
+            self.hits += 1
+        _touch(path)
+        return path
+
+    def get(self, key: str, codec: ArtifactCodec[T]) -> Optional[T]:
+        path = self.lookup(key, codec.suffix)
+        if path is None:
+            return None
+        try:
+            return codec.load(path)
+        except Exception as exc:  # pragma: no cover - corrupt entry
+            logger.warning(
+                "Dropping unreadable cache entry", extra={"path": str(path), "error": str(exc)}
+            )
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, value: T, codec: ArtifactCodec[T]) -> Path:
+        target = self.path_for(key, codec.suffix)
+        with tempfile.NamedTemporaryFile(
+            dir=self.root, prefix=".tmp-", suffix=codec.suffix, delete=False
+        ) as handle:
+            tmp_path = Path(handle.name)
+        try:
+            codec.dump(value, tmp_path)
+            os.replace(tmp_path, target)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self.evict(keep=target)
+        return target
+
+    def store_file(self, key: str, suffix: str, source: Path) -> Path:
+        """Copy an existing file into the cache.
+
+        The file is copied rather than hard-linked: callers rewrite their working
+        files in place, which would silently corrupt a shared inode.
+        """
+
+        target = self.path_for(key, suffix)
+        tmp_path = self.root / f".tmp-{key}{suffix}"
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, target)
+        _touch(target)
+        self.evict(keep=target)
+        return target
+
+    def size_bytes(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self, *, keep: Optional[Path] = None) -> int:
+        """Remove least recently used entries until the cache fits in ``max_bytes``."""
+
+        if self.max_bytes is None:
+            return 0
+        with self._lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+            entries.sort(key=lambda item: item[0])
+            total = sum(size for _, size, _ in entries)
+            freed = 0
+            for _, size, entry in entries:
+                if total <= self.max_bytes:
+                    break
+                if keep is not None and entry == keep:
+                    continue
+                entry.unlink(missing_ok=True)
+                total -= size
+                freed += size
+        if freed:
+            logger.debug(
+                "Evicted cache entries", extra={"freed_bytes": freed, "root": str(self.root)}
+            )
+        return freed
+
+    def _entries(self) -> List[Path]:
+        return [
+            entry
+            for entry in self.root.iterdir()
+            if entry.is_file() and not entry.name.startswith(".tmp-")
+        ]
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable digest of JSON-serializable key parts (config values, upstream keys)."""
+
+    encoded = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _touch(path: Path) -> None:
+    try:
+        os.utime(path)
+    except OSError:  # pragma: no cover - entry removed concurrently
+        pass
+
+
+def _dump_json(path: Path, payload: Any) -> None:
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _load_json(path: Path) -> Any:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _dump_vad_segments(segments: Sequence[VadSegment], path: Path) -> None:
+    _dump_json(path, [[seg.start_s, seg.end_s, seg.label] for seg in segments])
+
+
+def _load_vad_segments(path: Path) -> List[VadSegment]:
+    return [VadSegment(float(start), float(end), label) for start, end, label in _load_json(path)]
+
+
+def _dump_audio_embeddings(embeddings: Sequence[AudioEmbedding], path: Path) -> None:
+    matrix = EmbeddingMatrix.from_embeddings(embeddings)
+    with path.open("wb") as handle:
+        np.savez(handle, vectors=matrix.vectors, start_s=matrix.start_s, end_s=matrix.end_s)
+
+
+def _load_audio_embeddings(path: Path) -> EmbeddingMatrix:
+    with np.load(path, allow_pickle=False) as data:
+        return EmbeddingMatrix(data["vectors"], data["start_s"], data["end_s"])
+
+
+def _dump_frame_features(features: FrameFeatures, path: Path) -> None:
+    with path.open("wb") as handle:
+        np.savez(
+            handle,
+            shape=np.asarray(
+                [features.sample_rate, features.frame_samples, features.num_samples],
+                dtype=np.int64,
+            ),
+            abs_sum=features.abs_sum,
+            sample_sum=features.sample_sum,
+            square_sum=features.square_sum,
+            peak=features.peak,
+            band_magnitudes=features.band_magnitudes,
+        )
+
+
+def _load_frame_features(path: Path) -> FrameFeatures:
+    with np.load(path, allow_pickle=False) as data:
+        sample_rate, frame_samples, num_samples = (int(value) for value in data["shape"])
+        return FrameFeatures(
+            sample_rate=sample_rate,
+            frame_samples=frame_samples,
+            num_samples=num_samples,
+            abs_sum=data["abs_sum"],
+            sample_sum=data["sample_sum"],
+            square_sum=data["square_sum"],
+            peak=data["peak"],
+            band_magnitudes=data["band_magnitudes"],
+        )
+
+
+def _dump_chunk_embeddings(embeddings: Sequence[ChunkEmbedding], path: Path) -> None:
+    matrix = ChunkEmbeddingMatrix.from_embeddings(embeddings)
+    with path.open("wb") as handle:
+        np.savez(
+            handle,
+            vectors=matrix.vectors,
+            start_s=matrix.start_s,
+            end_s=matrix.end_s,
+            texts=np.asarray([chunk.text for chunk in matrix.chunks], dtype=np.str_),
+        )
+
+
+def _load_chunk_embeddings(path: Path) -> ChunkEmbeddingMatrix:
+    with np.load(path, allow_pickle=False) as data:
+        chunks = [
+            TextChunk(start_s=float(start), end_s=float(end), text=str(text))
+            for start, end, text in zip(data["start_s"], data["end_s"], data["texts"])
+        ]
+        return ChunkEmbeddingMatrix(chunks, data["vectors"])
+
+
+def _dump_transcription(transcription: TranscriptionOutput, path: Path) -> None:
+    _dump_json(path, transcription.to_payload())
+
+
+def _load_transcription(path: Path) -> TranscriptionOutput:
+    return TranscriptionOutput.from_payload(_load_json(path))
+
+
+def _dump_candidates(candidates: Sequence[BoundaryCandidate], path: Path) -> None:
+    _dump_json(path, [asdict(candidate) for candidate in candidates])
+
+
+def _load_candidates(path: Path) -> List[BoundaryCandidate]:
+    return [BoundaryCandidate(**item) for item in _load_json(path)]
+
+
+VAD_SEGMENTS: ArtifactCodec[Sequence[VadSegment]] = ArtifactCodec(
+    ".vad.json", _dump_vad_segments, _load_vad_segments
+)
+AUDIO_EMBEDDINGS: ArtifactCodec[Sequence[AudioEmbedding]] = ArtifactCodec(
+    ".audio_emb.npz", _dump_audio_embeddings, _load_audio_embeddings
+)
+FRAME_FEATURES: ArtifactCodec[FrameFeatures] = ArtifactCodec(
+    ".frames.npz", _dump_frame_features, _load_frame_features
+)
+TEXT_EMBEDDINGS: ArtifactCodec[Sequence[ChunkEmbedding]] = ArtifactCodec(
+    ".text_emb.npz", _dump_chunk_embeddings, _load_chunk_embeddings
+)
+TRANSCRIPTION: ArtifactCodec[TranscriptionOutput] = ArtifactCodec(
+    ".transcript.json", _dump_transcription, _load_transcription
+)
+BOUNDARY_CANDIDATES: ArtifactCodec[Sequence[BoundaryCandidate]] = ArtifactCodec(
+    ".candidates.json", _dump_candidates, _load_candidates
+)
+JSON: ArtifactCodec[Any] = ArtifactCodec(
+    ".json", lambda value, path: _dump_json(path, value), _load_json
+)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, TypeVar
+
+from codex_audio.cache import ArtifactCodec
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+CHECKPOINT_DIRNAME = "checkpoints"
+LEDGER_FILENAME = "ledger.json"
+STAGE_DONE = "done"
+STAGE_FAILED = "failed"
+
+
+@dataclass
+class StageRecord:
+    """Ledger entry: how a stage last ended and the key of the inputs it ran on."""
+
+    status: str
+    key: Optional[str] = None
+    error: Optional[str] = None
+    updated_at: float = 0.0
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "key": self.key,
+            "error": self.error,
+            "updated_at": round(self.updated_at, 3),
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "StageRecord":
+        return cls(
+            status=str(payload.get("status") or ""),
+            key=payload.get("key"),
+            error=payload.get("error"),
+            updated_at=float(payload.get("updated_at") or 0.0),
+        )
+
+
+class StageLedger:
+    """Checkpointed stage outputs of one working directory and how each stage ended.
+
+    Outputs live at ``<root>/<stage><suffix>``; ``<root>/ledger.json`` maps each
+    stage to ``done`` or ``failed`` with the cache key of its inputs. A fresh
+    ledger starts empty. With ``resume=True``, :meth:`load` returns the output
+    of every stage that completed on the same key, so only failed, missing or
+    stale stages run again. Without a ``root`` nothing is written: the ledger
+    only tracks which stages of the run failed.
+    """
+
+    def __init__(self, root: Optional[Path] = None, *, resume: bool = False) -> None:
+        self.root = root.expanduser().resolve() if root is not None else None
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / LEDGER_FILENAME if self.root is not None else None
+        self.resume = resume and self.root is not None
+        self.prefix = ""
+        self.records: Dict[str, StageRecord] = self._read() if resume else {}
+        self.resumed: List[str] = []
+        self._ran: Set[str] = set()
+        # Feature stages run on a thread pool and share one ledger.
+        self._lock = threading.Lock()
+        if not resume:
+            self._write()
+
+    def scoped(self, name: str) -> "StageLedger":
+        """A view of this ledger whose stage names are prefixed with ``name.``."""
+
+        view = copy.copy(self)
+        view.prefix = f"{self.prefix}{name}."
+        return view
+
+    def load(self, stage: str, key: str, codec: ArtifactCodec[T]) -> Optional[T]:
+        name = self.prefix + stage
+        with self._lock:
+            record = self.records.get(name)
+        if not self.resume or record is None or record.status != STAGE_DONE:
+            return None
+        if record.key != key or self.root is None:
+            return None
+        path = self.root / f"{name}{codec.suffix}"
+        try:
+            value = codec.load(path)
+        except Exception as exc:
+            logger.warning(
+                "Ignoring unreadable checkpoint", extra={"path": str(path), "error": str(exc)}
+            )
+            return None
+        with self._lock:
+            self.resumed.append(name)
+            self._ran.add(name)
+        logger.info("Stage resumed from checkpoint", extra={"stage": name})
+        return value
+
+    def complete(
+        self, stage: str, key: str, value: T, codec: ArtifactCodec[T]
+    ) -> Optional[Path]:
+        name = self.prefix + stage
+        target = None
+        if self.root is not None:
+            target = self.root / f"{name}{codec.suffix}"
+            tmp_path = self.root / f".tmp-{name}{codec.suffix}"
+            try:
+                codec.dump(value, tmp_path)
+                os.replace(tmp_path, target)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+        self._set(name, StageRecord(STAGE_DONE, key=key, updated_at=time.time()))
+        return target
+
+    def fail(self, stage: str, key: Optional[str], error: BaseException) -> None:
+        name = self.prefix + stage
+        message = f"{type(error).__name__}: {error}"
+        self._set(name, StageRecord(STAGE_FAILED, key=key, error=message, updated_at=time.time()))
+
+    def failed(self) -> List[str]:
+        """Stages of this run that failed; ``--resume`` runs them again."""
+
+        with self._lock:
+            return sorted(
+                name
+                for name in self._ran
+                if self.records.get(name, StageRecord("")).status == STAGE_FAILED
+            )
+
+    def discard(self) -> None:
+        """Delete the checkpoints once nothing is left for ``--resume`` to retry."""
+
+        if self.root is not None:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def _set(self, name: str, record: StageRecord) -> None:
+        with self._lock:
+            self.records[name] = record
+            self._ran.add(name)
+            self._write()
+
+    def _write(self) -> None:
+        if self.path is None:
+            return
+        payload = {name: record.to_payload() for name, record in sorted(self.records.items())}
+        tmp_path = self.path.with_name(f".tmp-{self.path.name}")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> Dict[str, StageRecord]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            return {name: StageRecord.from_payload(item) for name, item in payload.items()}
+        except (OSError, ValueError, AttributeError) as exc:
+            logger.warning(
+                "Ignoring unreadable stage ledger",
+                extra={"path": str(self.path), "error": str(exc)},
+            )
+            return {}
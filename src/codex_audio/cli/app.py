@@ -1,17 +1,40 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 from typing import Optional
 
 import typer
 from rich.console import Console
 
-from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
+from codex_audio.batch import (
+    DEFAULT_BATCH_WORKERS,
+    REPORT_FILENAME,
+    collect_batch_items,
+    run_batch,
+)
+from codex_audio.clipper.virtual import VirtualClipReader
+from codex_audio.pipeline import (
+    DEFAULT_WINDOW_OVERLAP_S,
+    PipelineConfig,
+    StorySegmentationPipeline,
+)
 from codex_audio.evaluation.runner import EvaluationRunner
+from codex_audio.ingest import iter_pcm_blocks
+from codex_audio.server import (
+    DEFAULT_PORT,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_SERVER_WORKERS,
+    SegmentationService,
+    make_server,
+)
 from codex_audio.sweeps.grid import SweepRunner
+from codex_audio.transcription.store import DEFAULT_TRANSCRIPT_STORE, TranscriptStore
 
 console = Console()
 app = typer.Typer(help="News audio story segmentation CLI")
+transcripts_app = typer.Typer(help="Manage the persistent transcript store")
+app.add_typer(transcripts_app, name="transcripts")
 
 
 @app.command()
@@ -20,9 +43,73 @@ def segment(
     station: str = typer.Option("CKNW", "--station", "-s", help="Station identifier"),
     out_dir: Path = typer.Option(Path("out"), "--out", "-o", help="Output directory"),
     config: Optional[Path] = typer.Option(None, help="Station config override"),
+    streaming_ingest: bool = typer.Option(
+        False, "--streaming-ingest", help="Decode through ffmpeg in fixed-size blocks"
+    ),
+    cache: bool = typer.Option(
+        False, "--cache", help="Reuse stage outputs cached under the working directory"
+    ),
+    transcription_chunk_s: Optional[float] = typer.Option(
+        None,
+        "--transcription-chunk-s",
+        help="Transcribe in parallel sessions of about this many seconds, cut at silences",
+    ),
+    transcript_store: Optional[Path] = typer.Option(
+        None, "--transcript-store", help="SQLite file reused across runs for Azure transcripts"
+    ),
+    clip_backend: str = typer.Option(
+        "ffmpeg",
+        "--clip-backend",
+        help=(
+            "ffmpeg (one process per clip), ffmpeg_single (one pass), native (no ffmpeg) "
+            "or virtual (offsets into the normalized WAV only)"
+        ),
+    ),
+    trace: Optional[Path] = typer.Option(
+        None, "--trace", help="Write per-stage timings as a Chrome trace JSON file"
+    ),
+    profile_dir: Optional[Path] = typer.Option(
+        None, "--profile-dir", help="Dump a cProfile .prof file per stage into this directory"
+    ),
+    window_s: Optional[float] = typer.Option(
+        None,
+        "--window-s",
+        min=1.0,
+        help="Segment long recordings in blocks of this many seconds to bound memory",
+    ),
+    window_overlap_s: float = typer.Option(
+        DEFAULT_WINDOW_OVERLAP_S,
+        "--window-overlap-s",
+        min=0.0,
+        help="Seconds at the end of each block that are re-planned by the next one",
+    ),
+    checkpoint: bool = typer.Option(
+        False,
+        "--checkpoint",
+        help="Keep stage outputs under <work>/checkpoints until the run has no failed stages",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Reuse stages checkpointed by an earlier run; rerun only failed or missing ones",
+    ),
 ) -> None:
     pipeline = StorySegmentationPipeline(
-        config=PipelineConfig(station=station, config_path=config)
+        config=PipelineConfig(
+            station=station,
+            config_path=config,
+            streaming_ingest=streaming_ingest,
+            cache_enabled=cache,
+            transcription_chunk_s=transcription_chunk_s,
+            transcript_store=transcript_store,
+            clip_backend=clip_backend,
+            trace_path=trace,
+            profile_dir=profile_dir,
+            window_s=window_s,
+            window_overlap_s=window_overlap_s,
+            checkpoints_enabled=checkpoint,
+            resume=resume,
+        )
     )
     result = pipeline.run(audio_path=audio_path, output_dir=out_dir)
     if result.normalized_audio:
@@ -31,12 +118,210 @@ def segment(
         console.print(f"Generated {len(result.segments)} segments", style="cyan")
     else:
         console.print("No segments generated", style="yellow")
+    if result.windows:
+        console.print(f"Segmented in {len(result.windows)} windows of up to {window_s:.0f}s")
     if result.clip_paths:
         console.print(f"Clips written to {result.clip_paths[0].parent}")
     if result.transcript_path:
         console.print(f"Transcript written to {result.transcript_path}")
     if result.manifest_path:
         console.print(f"Manifest written to {result.manifest_path}")
+    if result.resumed_stages:
+        console.print(f"Resumed {len(result.resumed_stages)} stages from checkpoints")
+    if result.failed_stages:
+        console.print(
+            f"Stages failed: {', '.join(result.failed_stages)}; "
+            f"{_retry_hint(checkpoint or resume)}",
+            style="yellow",
+        )
+
+
+@app.command("segment-batch")
+def segment_batch(
+    source: Path = typer.Argument(
+        ..., exists=True, readable=True, help="Directory of audio files or a CSV manifest"
+    ),
+    station: str = typer.Option("CKNW", "--station", "-s", help="Station identifier"),
+    out_dir: Path = typer.Option(Path("out"), "--out", "-o", help="Output directory"),
+    config: Optional[Path] = typer.Option(None, help="Station config override"),
+    workers: int = typer.Option(
+        DEFAULT_BATCH_WORKERS, "--workers", "-w", min=1, help="Files segmented in parallel"
+    ),
+    report: Optional[Path] = typer.Option(
+        None, "--report", help=f"Throughput report path (defaults to <out>/{REPORT_FILENAME})"
+    ),
+    cache: bool = typer.Option(
+        False, "--cache", help="Reuse stage outputs cached under each working directory"
+    ),
+    transcription_chunk_s: Optional[float] = typer.Option(
+        None,
+        "--transcription-chunk-s",
+        help="Transcribe in parallel sessions of about this many seconds, cut at silences",
+    ),
+    transcript_store: Optional[Path] = typer.Option(
+        None, "--transcript-store", help="SQLite file reused across runs for Azure transcripts"
+    ),
+    clip_backend: str = typer.Option("ffmpeg", "--clip-backend", help="See `segment`"),
+    checkpoint: bool = typer.Option(
+        False,
+        "--checkpoint",
+        help="Keep stage outputs under <work>/checkpoints until the run has no failed stages",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Reuse stages checkpointed by an earlier run; rerun only failed or missing ones",
+    ),
+) -> None:
+    items = collect_batch_items(source, out_dir)
+    if not items:
+        console.print(f"No audio files found in {source}", style="yellow")
+        raise typer.Exit(code=1)
+    report_path = report or out_dir / REPORT_FILENAME
+    result = run_batch(
+        items,
+        PipelineConfig(
+            station=station,
+            config_path=config,
+            cache_enabled=cache,
+            transcription_chunk_s=transcription_chunk_s,
+            transcript_store=transcript_store,
+            clip_backend=clip_backend,
+            checkpoints_enabled=checkpoint,
+            resume=resume,
+        ),
+        workers=workers,
+        report_path=report_path,
+    )
+    console.print(
+        f"Segmented {len(result.files) - result.failures}/{len(result.files)} files "
+        f"({result.audio_s / 3600:.2f} h of audio in {result.wall_s / 3600:.2f} h, "
+        f"{result.audio_hours_per_wall_hour:.1f} audio-hours per wall-hour)",
+        style="green" if not result.failures else "yellow",
+    )
+    for item in result.files:
+        if not item.ok:
+            console.print(f"Failed {item.audio_path}: {item.error}", style="red")
+        elif item.failed_stages:
+            console.print(
+                f"Degraded {item.audio_path}: {', '.join(item.failed_stages)} failed",
+                style="yellow",
+            )
+    if any(item.failed_stages or not item.ok for item in result.files):
+        console.print(_retry_hint(checkpoint or resume).capitalize())
+    console.print(f"Report written to {report_path}")
+
+
+@app.command("segment-stream")
+def segment_stream(
+    source: str = typer.Argument(..., help="Audio file or stream URL decoded by ffmpeg"),
+    station: str = typer.Option("CKNW", "--station", "-s", help="Station identifier"),
+    out_dir: Path = typer.Option(Path("out"), "--out", "-o", help="Output directory"),
+    config: Optional[Path] = typer.Option(None, help="Station config override"),
+    update_s: float = typer.Option(
+        10.0, "--update-s", min=0.1, help="Re-plan the open story after this much new audio"
+    ),
+    clips: bool = typer.Option(False, "--clips", help="Write a WAV per committed story"),
+) -> None:
+    pipeline = StorySegmentationPipeline(config=PipelineConfig(station=station, config_path=config))
+    out_dir.mkdir(parents=True, exist_ok=True)
+    segmenter = pipeline.rolling_segmenter(
+        clip_dir=out_dir / "clips" if clips else None,
+        clip_stem=Path(source).stem or "stream",
+        update_s=update_s,
+    )
+    events_path = out_dir / "events.jsonl"
+    sample_rate = pipeline.config.sample_rate
+    with events_path.open("a") as events_file:
+        blocks = iter_pcm_blocks(source, sample_rate=sample_rate, block_samples=sample_rate)
+        try:
+            for block in blocks:
+                for event in segmenter.push(block):
+                    events_file.write(json.dumps(event.to_payload()) + "\n")
+                    events_file.flush()
+                    console.print(
+                        f"Story {event.index}: {event.start_s:.1f}-{event.end_s:.1f}s "
+                        f"({event.label}, {event.latency_s:.1f}s after its end)"
+                    )
+        except KeyboardInterrupt:
+            console.print("Stopping; committing the open story", style="yellow")
+        for event in segmenter.flush():
+            events_file.write(json.dumps(event.to_payload()) + "\n")
+    console.print(f"Latency: {segmenter.latency_summary()}")
+    console.print(f"Events written to {events_path}")
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Address to listen on"),
+    port: int = typer.Option(DEFAULT_PORT, "--port", "-p", help="HTTP port"),
+    station: str = typer.Option(
+        "CKNW", "--station", "-s", help="Station for jobs that do not name one"
+    ),
+    socket_path: Optional[Path] = typer.Option(
+        None, "--socket", help="Listen on this Unix socket instead of host:port"
+    ),
+    workers: int = typer.Option(
+        DEFAULT_SERVER_WORKERS, "--workers", "-w", min=1, help="Jobs segmented in parallel"
+    ),
+    queue_size: int = typer.Option(
+        DEFAULT_QUEUE_SIZE, "--queue-size", min=1, help="Jobs waiting before submits get 503"
+    ),
+    config_dir: Path = typer.Option(
+        Path("config/stations"), "--config-dir", help="Directory of <station>.yaml configs"
+    ),
+    cache: bool = typer.Option(
+        False, "--cache", help="Reuse stage outputs cached under each working directory"
+    ),
+    transcription_chunk_s: Optional[float] = typer.Option(
+        None,
+        "--transcription-chunk-s",
+        help="Transcribe in parallel sessions of about this many seconds, cut at silences",
+    ),
+    transcript_store: Optional[Path] = typer.Option(
+        None, "--transcript-store", help="SQLite file reused across runs for Azure transcripts"
+    ),
+    clip_backend: str = typer.Option("ffmpeg", "--clip-backend", help="See `segment`"),
+) -> None:
+    service = SegmentationService(
+        PipelineConfig(
+            station=station,
+            cache_enabled=cache,
+            transcription_chunk_s=transcription_chunk_s,
+            transcript_store=transcript_store,
+            clip_backend=clip_backend,
+        ),
+        workers=workers,
+        queue_size=queue_size,
+        config_dir=config_dir,
+    )
+    server = make_server(service, host=host, port=port, socket_path=socket_path)
+    address = socket_path or f"http://{host}:{server.server_address[1]}"
+    console.print(
+        f"Serving on {address}: POST /jobs, GET /jobs/<id>[?wait=<s>], GET /stats",
+        style="green",
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("Stopping; finishing queued jobs", style="yellow")
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+
+
+@app.command("materialize-clips")
+def materialize_clips(
+    manifest: Path = typer.Argument(..., exists=True, readable=True),
+    out_dir: Optional[Path] = typer.Option(
+        None, "--out", "-o", help="Clip directory (defaults to clips/ next to the manifest)"
+    ),
+) -> None:
+    reader = VirtualClipReader(manifest)
+    paths = reader.materialize(out_dir or manifest.parent / "clips")
+    console.print(f"Wrote {len(paths)} clips and updated {manifest}", style="green")
 
 
 @app.command()
@@ -61,5 +346,46 @@ def sweep(
     console.print(result)
 
 
+@transcripts_app.command("stats")
+def transcripts_stats(
+    store: Path = typer.Option(DEFAULT_TRANSCRIPT_STORE, "--store", help="Transcript store file"),
+) -> None:
+    with TranscriptStore(store) as transcripts:
+        stats = transcripts.stats()
+    console.print(f"{stats['entries']} transcripts, {stats['bytes'] / 1e6:.1f} MB in {store}")
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = f" ({stats['hits'] / lookups:.0%} hit rate)" if lookups else ""
+    console.print(f"{stats['hits']} hits, {stats['misses']} misses{hit_rate}")
+
+
+@transcripts_app.command("prune")
+def transcripts_prune(
+    store: Path = typer.Option(DEFAULT_TRANSCRIPT_STORE, "--store", help="Transcript store file"),
+    max_age_days: Optional[float] = typer.Option(
+        None, min=0.0, help="Drop transcripts not used for this many days"
+    ),
+    max_size_mb: Optional[float] = typer.Option(
+        None, min=0.0, help="Drop least recently used transcripts beyond this size"
+    ),
+) -> None:
+    max_age_s = max_age_days * 86_400 if max_age_days is not None else None
+    max_bytes = int(max_size_mb * 1_000_000) if max_size_mb is not None else None
+    with TranscriptStore(store) as transcripts:
+        removed = transcripts.prune(max_age_s=max_age_s, max_bytes=max_bytes)
+        stats = transcripts.stats()
+    console.print(
+        f"Removed {removed} transcripts; {stats['entries']} remain ({stats['bytes'] / 1e6:.1f} MB)"
+    )
+
+
+def _retry_hint(checkpointed: bool) -> str:
+    if checkpointed:
+        return "rerun with --resume to retry only the failed stages"
+    return "rerun with --checkpoint to keep the other stages for a later --resume"
+
+
 def run() -> None:
+    from dotenv import load_dotenv
+
+    load_dotenv()
     app()
@@ -2,35 +2,49 @@ from __future__ import annotations
 
 import subprocess
 from pathlib import Path
-from typing import List, Sequence, Tuple
+from typing import List, Optional, Sequence, Tuple
 
+from codex_audio.ingest import AudioBuffer
 from codex_audio.utils import get_logger
 
 logger = get_logger(__name__)
 
 
 FFMPEG_CMD = "ffmpeg"
+# Each output is an open file in the ffmpeg process; stay well under ulimit -n.
+DEFAULT_OUTPUTS_PER_PROCESS = 200
+# Clip name prefix for an in-memory buffer when the caller names no source.
+DEFAULT_CLIP_STEM = "audio"
 
 
 def clip_segments(
-    source: Path, segments: Sequence[Tuple[float, float]], out_dir: Path
+    source: Path | AudioBuffer,
+    segments: Sequence[Tuple[float, float]],
+    out_dir: Path,
+    *,
+    stem: Optional[str] = None,
 ) -> List[Path]:
-    source = source.expanduser().resolve()
-    if not source.exists():
-        raise FileNotFoundError(f"Source audio not found: {source}")
+    """Cut each range into ``<stem>_segment_NNN.wav`` with one ffmpeg process per clip.
+
+    ``stem`` defaults to the source file's stem; pass the original recording's
+    stem when ``source`` is a normalized or cached copy, or a buffer with no path.
+    """
+
+    if isinstance(source, AudioBuffer):
+        if source.path is None:
+            return _write_buffer_clips(source, segments, out_dir, stem=stem)
+        source = source.path
+    source = _resolved_source(source)
+    stem = stem or source.stem
 
     out_dir = out_dir.expanduser().resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
     clipped_paths: List[Path] = []
     for idx, (start, end) in enumerate(segments, start=1):
-        start_s = max(0.0, float(start))
-        end_s = max(0.0, float(end))
-        if end_s <= start_s:
-            raise ValueError("Segment end must be greater than start")
-
+        start_s, end_s = validated_range(start, end)
         duration = end_s - start_s
-        output_path = out_dir / f"{source.stem}_segment_{idx:03}.wav"
+        output_path = out_dir / f"{stem}_segment_{idx:03}.wav"
         cmd = [
             FFMPEG_CMD,
             "-y",
@@ -50,10 +64,121 @@ def clip_segments(
             str(output_path),
         ]
         logger.debug("Running ffmpeg clip", extra={"cmd": cmd, "output": str(output_path)})
-        try:
-            subprocess.run(cmd, check=True)
-        except FileNotFoundError as exc:
-            raise RuntimeError("ffmpeg executable not found in PATH") from exc
+        _run_ffmpeg(cmd)
         clipped_paths.append(output_path)
 
     return clipped_paths
+
+
+def clip_segments_single_pass(
+    source: Path | AudioBuffer,
+    segments: Sequence[Tuple[float, float]],
+    out_dir: Path,
+    *,
+    outputs_per_process: int = DEFAULT_OUTPUTS_PER_PROCESS,
+    stem: Optional[str] = None,
+) -> List[Path]:
+    """Like :func:`clip_segments`, but one ffmpeg process decodes the source for many clips.
+
+    The input is split with ``asplit`` and each branch is cut with a sample-accurate
+    ``atrim``, so ranges that share an edge still meet without a gap or overlap.
+    Up to ``outputs_per_process`` clips are written per process; each batch seeks
+    to its first range instead of decoding from the top of the file.
+    """
+
+    if outputs_per_process <= 0:
+        raise ValueError("outputs_per_process must be positive")
+    if isinstance(source, AudioBuffer):
+        if source.path is None:
+            return _write_buffer_clips(source, segments, out_dir, stem=stem)
+        source = source.path
+    source = _resolved_source(source)
+    stem = stem or source.stem
+    ranges = [validated_range(start, end) for start, end in segments]
+
+    out_dir = out_dir.expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    output_paths = [
+        out_dir / f"{stem}_segment_{idx:03}.wav" for idx in range(1, len(ranges) + 1)
+    ]
+
+    for first in range(0, len(ranges), outputs_per_process):
+        batch = ranges[first : first + outputs_per_process]
+        batch_paths = output_paths[first : first + outputs_per_process]
+        offset = min(start for start, _ in batch)
+        cmd = [
+            FFMPEG_CMD,
+            "-y",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-ss",
+            f"{offset:.6f}",
+            "-i",
+            str(source),
+            "-filter_complex",
+            _split_trim_graph(batch, offset),
+        ]
+        for idx, output_path in enumerate(batch_paths):
+            cmd.extend(["-map", f"[o{idx}]", "-acodec", "pcm_s16le", "-ac", "1", str(output_path)])
+        logger.debug(
+            "Running single-pass ffmpeg clip",
+            extra={"clips": len(batch), "first_output": str(batch_paths[0])},
+        )
+        _run_ffmpeg(cmd)
+
+    return output_paths
+
+
+def _split_trim_graph(ranges: Sequence[Tuple[float, float]], offset: float) -> str:
+    labels = "".join(f"[s{idx}]" for idx in range(len(ranges)))
+    chains = [f"[0:a]asplit={len(ranges)}{labels}"]
+    for idx, (start, end) in enumerate(ranges):
+        chains.append(
+            f"[s{idx}]atrim=start={start - offset:.6f}:end={end - offset:.6f},"
+            f"asetpts=PTS-STARTPTS[o{idx}]"
+        )
+    return ";".join(chains)
+
+
+def _run_ffmpeg(cmd: List[str]) -> None:
+    try:
+        subprocess.run(cmd, check=True)
+    except FileNotFoundError as exc:
+        raise RuntimeError("ffmpeg executable not found in PATH") from exc
+
+
+def _resolved_source(source: Path) -> Path:
+    source = source.expanduser().resolve()
+    if not source.exists():
+        raise FileNotFoundError(f"Source audio not found: {source}")
+    return source
+
+
+def _write_buffer_clips(
+    buffer: AudioBuffer,
+    segments: Sequence[Tuple[float, float]],
+    out_dir: Path,
+    *,
+    stem: Optional[str] = None,
+) -> List[Path]:
+    """Slice an in-memory buffer that has no WAV on disk for ffmpeg to read."""
+
+    out_dir = out_dir.expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    clipped_paths: List[Path] = []
+    for idx, (start, end) in enumerate(segments, start=1):
+        start_s, end_s = validated_range(start, end)
+        output_path = out_dir / f"{stem or DEFAULT_CLIP_STEM}_segment_{idx:03}.wav"
+        buffer.slice(start_s, end_s).write_wav(output_path)
+        clipped_paths.append(output_path)
+    return clipped_paths
+
+
+def validated_range(start: float, end: float) -> Tuple[float, float]:
+    start_s = max(0.0, float(start))
+    end_s = max(0.0, float(end))
+    if end_s <= start_s:
+        raise ValueError("Segment end must be greater than start")
+    return start_s, end_s
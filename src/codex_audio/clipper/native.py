@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from codex_audio.clipper.ffmpeg import DEFAULT_CLIP_STEM, validated_range
+from codex_audio.ingest import AudioBuffer
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CLIP_WORKERS = 4
+
+
+def clip_segments_native(
+    source: Path | AudioBuffer,
+    segments: Sequence[Tuple[float, float]],
+    out_dir: Path,
+    *,
+    max_workers: int = DEFAULT_CLIP_WORKERS,
+    stem: Optional[str] = None,
+) -> List[Path]:
+    """Write each range of the normalized PCM as a 16-bit WAV, in process.
+
+    A path is memory-mapped with :meth:`AudioBuffer.from_wav`, so every clip is
+    a view of the source samples copied straight to disk. Range edges round to
+    the nearest sample, so adjacent ranges share their edge sample index and
+    stay gap-free. Output names match :func:`codex_audio.clipper.ffmpeg.clip_segments`.
+    """
+
+    import soundfile as sf
+
+    if isinstance(source, AudioBuffer):
+        buffer = source
+    else:
+        buffer = AudioBuffer.from_wav(source)
+    if stem is None:
+        stem = buffer.path.stem if buffer.path is not None else DEFAULT_CLIP_STEM
+    ranges = [validated_range(start, end) for start, end in segments]
+
+    out_dir = out_dir.expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    output_paths = [out_dir / f"{stem}_segment_{idx:03}.wav" for idx in range(1, len(ranges) + 1)]
+
+    def write_clip(job: Tuple[Path, Tuple[float, float]]) -> Path:
+        output_path, (start_s, end_s) = job
+        start = buffer.sample_index(start_s)
+        end = max(start, buffer.sample_index(end_s))
+        sf.write(
+            str(output_path),
+            buffer.samples[start:end],
+            buffer.sample_rate,
+            subtype="PCM_16",
+            format="WAV",
+        )
+        return output_path
+
+    workers = max(1, min(max_workers, len(ranges) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clip") as pool:
+        written = list(pool.map(write_clip, zip(output_paths, ranges)))
+    logger.debug("Wrote native clips", extra={"clips": len(written), "workers": workers})
+    return written
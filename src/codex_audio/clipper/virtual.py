@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from codex_audio.clipper.ffmpeg import validated_range
+from codex_audio.clipper.native import clip_segments_native
+from codex_audio.ingest import PCM_SAMPLE_WIDTH, AudioBuffer, read_wav_layout
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_STREAM_BLOCK_BYTES = 1 << 20
+
+
+@dataclass
+class VirtualClip:
+    """A story as a sample range of the normalized WAV instead of a file of its own.
+
+    ``byte_offset``/``byte_length`` locate the range's PCM inside the WAV file;
+    they are ``None`` when the normalized audio was not a 16-bit mono WAV on disk.
+    """
+
+    start_s: float
+    end_s: float
+    start_sample: int
+    end_sample: int
+    byte_offset: Optional[int] = None
+    byte_length: Optional[int] = None
+
+    @property
+    def num_samples(self) -> int:
+        return self.end_sample - self.start_sample
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {
+            "start_sample": self.start_sample,
+            "end_sample": self.end_sample,
+            "byte_offset": self.byte_offset,
+            "byte_length": self.byte_length,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "VirtualClip":
+        return cls(
+            start_s=float(payload["start"]),
+            end_s=float(payload["end"]),
+            start_sample=int(payload["start_sample"]),
+            end_sample=int(payload["end_sample"]),
+            byte_offset=payload.get("byte_offset"),
+            byte_length=payload.get("byte_length"),
+        )
+
+
+def plan_virtual_clips(
+    audio: AudioBuffer, segments: Sequence[Tuple[float, float]]
+) -> List[VirtualClip]:
+    """Sample and byte offsets of each range, rounded the way the native clipper rounds."""
+
+    data_offset: Optional[int] = None
+    if audio.path is not None and audio.path.exists():
+        layout = read_wav_layout(audio.path)
+        if layout is not None and layout.channels == 1 and layout.sample_width == PCM_SAMPLE_WIDTH:
+            data_offset = layout.data_offset
+
+    clips: List[VirtualClip] = []
+    for start, end in segments:
+        start_s, end_s = validated_range(start, end)
+        start_sample = audio.sample_index(start_s)
+        end_sample = max(start_sample, audio.sample_index(end_s))
+        clips.append(
+            VirtualClip(
+                start_s=start_s,
+                end_s=end_s,
+                start_sample=start_sample,
+                end_sample=end_sample,
+                byte_offset=(
+                    data_offset + start_sample * PCM_SAMPLE_WIDTH
+                    if data_offset is not None
+                    else None
+                ),
+                byte_length=(
+                    (end_sample - start_sample) * PCM_SAMPLE_WIDTH
+                    if data_offset is not None
+                    else None
+                ),
+            )
+        )
+    return clips
+
+
+class VirtualClipReader:
+    """Reads stories out of the normalized WAV referenced by a ``segments.json``.
+
+    The WAV is memory-mapped once; :meth:`buffer` returns views into it and
+    :meth:`stream` yields the raw PCM bytes of a story. Manifests written
+    without offsets are supported by rounding ``start``/``end`` to samples.
+    """
+
+    def __init__(self, manifest_path: Path) -> None:
+        self.manifest_path = manifest_path.expanduser().resolve()
+        self._payload = json.loads(self.manifest_path.read_text())
+        normalized = self._payload.get("normalized_audio")
+        if not normalized:
+            raise ValueError(f"{self.manifest_path} does not reference a normalized WAV")
+        self.audio_path = Path(normalized)
+        self._source: Optional[AudioBuffer] = None
+        self.clips = [self._clip(segment) for segment in self._payload.get("segments", [])]
+
+    def __len__(self) -> int:
+        return len(self.clips)
+
+    @property
+    def source(self) -> AudioBuffer:
+        if self._source is None:
+            self._source = AudioBuffer.from_wav(self.audio_path)
+        return self._source
+
+    def buffer(self, index: int) -> AudioBuffer:
+        """Samples of story ``index`` as a zero-copy view of the normalized WAV."""
+
+        clip = self.clips[index]
+        source = self.source
+        return AudioBuffer(
+            samples=source.samples[clip.start_sample : clip.end_sample],
+            sample_rate=source.sample_rate,
+        )
+
+    def stream(
+        self, index: int, *, block_bytes: int = DEFAULT_STREAM_BLOCK_BYTES
+    ) -> Iterator[bytes]:
+        """Yield the little-endian 16-bit PCM of story ``index`` in blocks."""
+
+        clip = self.clips[index]
+        if clip.byte_offset is None or clip.byte_length is None:
+            raise ValueError("Manifest has no byte offsets for this clip")
+        remaining = clip.byte_length
+        with self.audio_path.open("rb") as handle:
+            handle.seek(clip.byte_offset)
+            while remaining > 0:
+                block = handle.read(min(block_bytes, remaining))
+                if not block:
+                    break
+                remaining -= len(block)
+                yield block
+
+    def materialize(self, out_dir: Path) -> List[Path]:
+        """Write every story as a WAV and record the paths in the manifest."""
+
+        ranges = [(clip.start_s, clip.end_s) for clip in self.clips]
+        paths = clip_segments_native(self.source, ranges, out_dir)
+        for segment, path in zip(self._payload.get("segments", []), paths):
+            segment["clip_path"] = str(path)
+        self.manifest_path.write_text(json.dumps(self._payload, indent=2))
+        logger.info(
+            "Materialized virtual clips",
+            extra={"clips": len(paths), "out": str(out_dir), "manifest": str(self.manifest_path)},
+        )
+        return paths
+
+    def _clip(self, segment: Dict[str, Any]) -> VirtualClip:
+        if segment.get("start_sample") is not None and segment.get("end_sample") is not None:
+            return VirtualClip.from_payload(segment)
+        return plan_virtual_clips(self.source, [(segment["start"], segment["end"])])[0]
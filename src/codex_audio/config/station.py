@@ -4,7 +4,6 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict
 
-import yaml
 
 DEFAULT_BOUNDARY_WEIGHTS = {
     "anchor_return": 3.0,
@@ -45,6 +44,8 @@ class StationConfig:
 
 
 def load_station_config(path: Path) -> StationConfig:
+    import yaml
+
     data = yaml.safe_load(path.read_text()) if path and path.exists() else {}
     if data is None:
         data = {}
@@ -1,13 +1,17 @@
-from .vad import VadSegment, run_vad
-from .embeddings import AudioEmbedding, get_audio_embeddings
+from .vad import VadSegment, VadTimeline, run_vad
+from .embeddings import AudioEmbedding, EmbeddingMatrix, get_audio_embeddings
+from .silence import SilenceMap
 from .diarization import DiarizationSegment, run_diarization
 from .patterns import find_anchor_return_candidates
 
 __all__ = [
     "VadSegment",
+    "VadTimeline",
     "run_vad",
     "AudioEmbedding",
+    "EmbeddingMatrix",
     "get_audio_embeddings",
+    "SilenceMap",
     "DiarizationSegment",
     "run_diarization",
     "find_anchor_return_candidates",
@@ -6,10 +6,11 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
-try:
-    import azure.cognitiveservices.speech as speechsdk
-except ImportError:  # pragma: no cover - dependency managed via extras
-    speechsdk = None  # type: ignore[assignment]
+from codex_audio.utils.lazy import LazyImports
+
+# The Speech SDK loads on first use and is ``None`` when not installed.
+_lazy = LazyImports(globals(), optional=True, speechsdk="azure.cognitiveservices.speech")
+__getattr__ = _lazy.module_getattr
 
 _WORD_SCALE = 10_000_000
 
@@ -35,6 +36,7 @@ def run_diarization(
     audio_path = audio_path.expanduser().resolve()
     if not audio_path.exists():
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    speechsdk = _lazy("speechsdk")
     if speechsdk is None:
         raise RuntimeError(
             "azure-cognitiveservices-speech is not installed. Install dependency to enable diarization."
@@ -2,13 +2,24 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Sequence
+from typing import Any, Iterator, List, Optional, Sequence, overload
 
 import numpy as np
-import soundfile as sf
+from numpy.lib.stride_tricks import sliding_window_view
+
+from codex_audio.features.spectrogram import (
+    BAND_EDGES_HZ,
+    FrameFeatures,
+    band_matrix,
+    compute_frame_features,
+)
+from codex_audio.ingest import AudioBuffer
 
 DEFAULT_WINDOW_S = 3.0
 DEFAULT_HOP_RATIO = 0.5
+DEFAULT_BATCH_SAMPLES = 1 << 22
+AUDIO_EMBEDDING_MODES = ("stft", "spectrogram")
+EMBEDDING_DIM = 4 + len(BAND_EDGES_HZ) + 1
 
 
 @dataclass
@@ -18,48 +29,253 @@ class AudioEmbedding:
     vector: List[float]
 
 
+class EmbeddingMatrix(Sequence[Any]):
+    """Contiguous float32 embedding vectors with their window start/end times.
+
+    Behaves like the ``List[AudioEmbedding]`` it replaces: ``len``, iteration and
+    integer indexing yield ``AudioEmbedding`` rows, and slicing returns another
+    matrix. Hot paths should use ``vectors``/``start_s``/``end_s`` directly.
+    """
+
+    def __init__(self, vectors: np.ndarray, start_s: np.ndarray, end_s: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(len(vectors), -1 if len(vectors) else 0)
+        self.vectors = vectors
+        self.start_s = np.asarray(start_s, dtype=np.float64)
+        self.end_s = np.asarray(end_s, dtype=np.float64)
+        if not len(self.vectors) == len(self.start_s) == len(self.end_s):
+            raise ValueError("Embedding vectors and time arrays must have the same length")
+
+    @classmethod
+    def from_embeddings(cls, embeddings: Sequence[Any]) -> "EmbeddingMatrix":
+        if isinstance(embeddings, EmbeddingMatrix):
+            return embeddings
+        starts, ends = embedding_bounds(embeddings)
+        return cls(embedding_vectors(embeddings), starts, ends)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1] if self.vectors.ndim == 2 else 0
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "EmbeddingMatrix": ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return self._take(index)
+        row = range(len(self))[index]
+        return self._row(row)
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in range(len(self)):
+            yield self._row(row)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, EmbeddingMatrix):
+            return (
+                np.array_equal(self.vectors, other.vectors)
+                and np.array_equal(self.start_s, other.start_s)
+                and np.array_equal(self.end_s, other.end_s)
+            )
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rows={len(self)}, dim={self.dim})"
+
+    def _row(self, row: int) -> Any:
+        return AudioEmbedding(
+            start_s=float(self.start_s[row]),
+            end_s=float(self.end_s[row]),
+            vector=self.vectors[row].tolist(),
+        )
+
+    def _take(self, index: slice) -> "EmbeddingMatrix":
+        return EmbeddingMatrix(self.vectors[index], self.start_s[index], self.end_s[index])
+
+
+def embedding_vectors(embeddings: Sequence[Any]) -> np.ndarray:
+    """Stack embedding vectors into an ``(N, D)`` array without per-row copies for matrices."""
+
+    if isinstance(embeddings, EmbeddingMatrix):
+        return embeddings.vectors
+    if not len(embeddings):
+        return np.zeros((0, 0), dtype=np.float64)
+    try:
+        return np.asarray([emb.vector for emb in embeddings], dtype=np.float64)
+    except ValueError as exc:
+        raise ValueError("Embedding vectors must have the same length") from exc
+
+
+def embedding_bounds(embeddings: Sequence[Any]) -> tuple[np.ndarray, np.ndarray]:
+    """Start/end times for audio windows or text chunks (which carry them on ``.text``)."""
+
+    if isinstance(embeddings, EmbeddingMatrix):
+        return embeddings.start_s, embeddings.end_s
+    spans = [getattr(emb, "text", emb) for emb in embeddings]
+    starts = np.array([span.start_s for span in spans], dtype=np.float64)
+    ends = np.array([span.end_s for span in spans], dtype=np.float64)
+    return starts, ends
+
+
+def adjacent_cosine_similarity(embeddings: Sequence[Any]) -> np.ndarray:
+    """Cosine similarity between each embedding and the next; zero-norm pairs score 0."""
+
+    vectors = embedding_vectors(embeddings)
+    if len(vectors) < 2:
+        return np.zeros(0, dtype=np.float64)
+    vectors = vectors.astype(np.float64, copy=False)
+    dots = np.einsum("ij,ij->i", vectors[:-1], vectors[1:])
+    norms = np.linalg.norm(vectors, axis=1)
+    denominators = norms[:-1] * norms[1:]
+    similarities = np.zeros_like(dots)
+    np.divide(dots, denominators, out=similarities, where=denominators > 0)
+    return similarities
+
+
 def get_audio_embeddings(
-    audio_path: Path,
+    audio: Path | AudioBuffer,
     *,
     window_s: float = DEFAULT_WINDOW_S,
     hop_ratio: float = DEFAULT_HOP_RATIO,
-) -> List[AudioEmbedding]:
+    mode: str = "stft",
+    frames: Optional[FrameFeatures] = None,
+) -> EmbeddingMatrix:
+    """Embed overlapping analysis windows of ``audio``.
+
+    ``mode="stft"`` transforms each window exactly. ``mode="spectrogram"`` runs one
+    short-frame spectrogram and sums frames per window, so its cost does not grow
+    as the hop shrinks; window edges are then snapped to the frame grid. Pass
+    ``frames`` from :func:`get_frame_features` to re-window them without another
+    FFT. The two modes scale band energies differently (see :class:`FrameFeatures`),
+    so only compare vectors computed in the same mode.
+    """
+
+    if mode not in AUDIO_EMBEDDING_MODES:
+        raise ValueError(f"Unknown audio embedding mode: {mode}")
     if window_s <= 0:
         raise ValueError("window_s must be positive")
     if hop_ratio <= 0 or hop_ratio > 1:
         raise ValueError("hop_ratio must be in (0, 1]")
 
-    audio_path = audio_path.expanduser().resolve()
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    if mode == "spectrogram":
+        frames = frames if frames is not None else get_frame_features(audio)
+        vectors, starts, ends = frames.embed_windows(window_s=window_s, hop_ratio=hop_ratio)
+    else:
+        samples, sample_rate = _load_samples(audio)
+        vectors, starts, ends = compute_embedding_matrix(
+            samples, sample_rate, window_s=window_s, hop_ratio=hop_ratio
+        )
+    return EmbeddingMatrix(vectors, starts, ends)
 
-    samples, sample_rate = sf.read(str(audio_path), always_2d=False)
-    if samples.ndim > 1:
-        samples = samples.mean(axis=1)
-    samples = samples.astype(np.float32)
+
+def get_frame_features(audio: Path | AudioBuffer) -> FrameFeatures:
+    """The short-frame spectrogram summary behind ``mode="spectrogram"``."""
+
+    samples, sample_rate = _load_samples(audio)
+    return compute_frame_features(samples, sample_rate)
+
+
+def compute_embedding_matrix(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    window_s: float = DEFAULT_WINDOW_S,
+    hop_ratio: float = DEFAULT_HOP_RATIO,
+    batch_samples: int = DEFAULT_BATCH_SAMPLES,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Embed every analysis window at once.
+
+    Returns an ``(N, EMBEDDING_DIM)`` float32 matrix with window start/end times.
+    Windows are read through a strided view of ``samples`` and transformed in
+    batches of roughly ``batch_samples`` samples, so memory stays bounded on
+    day-long inputs. Rows match :func:`_compute_embedding` on the same windows.
+    """
+
+    if window_s <= 0:
+        raise ValueError("window_s must be positive")
+    if hop_ratio <= 0 or hop_ratio > 1:
+        raise ValueError("hop_ratio must be in (0, 1]")
+
+    samples = np.asarray(samples)
+    total_samples = len(samples)
+    if not total_samples or not sample_rate:
+        empty = np.zeros(0, dtype=np.float64)
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32), empty, empty
 
     window_samples = max(1, int(window_s * sample_rate))
     hop_samples = max(1, int(window_samples * hop_ratio))
-    total_samples = len(samples)
+    start_indices = np.arange(0, total_samples, hop_samples)
+
+    if total_samples >= window_samples:
+        full_windows = sliding_window_view(samples, window_samples)[::hop_samples]
+    else:
+        full_windows = np.zeros((0, window_samples), dtype=samples.dtype)
+    # Windows running past the end are zero-padded, like the per-window loop did.
+    tail_starts = start_indices[len(full_windows) :]
+    tail_windows = np.zeros((len(tail_starts), window_samples), dtype=samples.dtype)
+    for row, start_idx in enumerate(tail_starts):
+        chunk = samples[start_idx:]
+        tail_windows[row, : len(chunk)] = chunk
+
+    taper = np.hanning(window_samples)
+    bins = band_matrix(window_samples, sample_rate)
+    batch_windows = max(1, batch_samples // window_samples)
+
+    vectors = np.empty((len(start_indices), EMBEDDING_DIM), dtype=np.float32)
+    row = 0
+    for windows in (full_windows, tail_windows):
+        for offset in range(0, len(windows), batch_windows):
+            batch = windows[offset : offset + batch_windows]
+            vectors[row : row + len(batch)] = _embed_batch(batch, taper, bins)
+            row += len(batch)
+
+    starts = start_indices / sample_rate
+    return vectors, starts, starts + window_s
+
+
+def _embed_batch(windows: np.ndarray, taper: np.ndarray, bins: np.ndarray) -> np.ndarray:
+    from scipy import fft as sp_fft
+
+    frames = windows.astype(np.float64)
+    spectrum = np.abs(sp_fft.rfft(frames * taper, axis=1, workers=-1))
+    magnitude = np.abs(frames)
+    vectors = np.column_stack(
+        [
+            magnitude.mean(axis=1),
+            frames.std(axis=1),
+            magnitude.max(axis=1),
+            spectrum.sum(axis=1) + 1e-8,
+            spectrum @ bins,
+        ]
+    )
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
 
-    embeddings: List[AudioEmbedding] = []
-    start_idx = 0
-    while start_idx < total_samples:
-        end_idx = start_idx + window_samples
-        segment = samples[start_idx:end_idx]
-        if len(segment) < window_samples:
-            segment = np.pad(segment, (0, window_samples - len(segment)), mode="constant")
-        start_s = start_idx / sample_rate
-        end_s = start_s + window_s
-        vector = _compute_embedding(segment, sample_rate)
-        embeddings.append(AudioEmbedding(start_s=start_s, end_s=end_s, vector=vector))
-        start_idx += hop_samples
 
-    if not embeddings and total_samples:
-        vector = _compute_embedding(samples, sample_rate)
-        embeddings.append(AudioEmbedding(start_s=0.0, end_s=window_s, vector=vector))
+def _load_samples(audio: Path | AudioBuffer) -> tuple[np.ndarray, int]:
+    if isinstance(audio, AudioBuffer):
+        return audio.as_float32(), audio.sample_rate
 
-    return embeddings
+    audio_path = audio.expanduser().resolve()
+    if not audio_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+    import soundfile as sf
+
+    samples, sample_rate = sf.read(str(audio_path), always_2d=False)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    return samples.astype(np.float32), int(sample_rate)
 
 
 def _compute_embedding(segment: np.ndarray, sample_rate: int) -> List[float]:
@@ -70,7 +286,7 @@ def _compute_embedding(segment: np.ndarray, sample_rate: int) -> List[float]:
     freqs = np.fft.rfftfreq(len(windowed), d=1.0 / sample_rate)
 
     total_energy = float(np.sum(spectrum) + 1e-8)
-    band_edges = [200, 1000, 4000]
+    band_edges = BAND_EDGES_HZ
     band_energies = []
     prev = 0.0
     for cutoff in band_edges:
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, Literal, Tuple
+
+import numpy as np
+
+from codex_audio.ingest import AudioBuffer
+
+DEFAULT_MIN_GAP_MS = 120
+DEFAULT_SILENCE_MARGIN_DB = 16.0
+DEFAULT_BLOCK_MS = 60_000
+_MAX_AMPLITUDE = float(1 << 15)
+
+
+@dataclass
+class SilenceMap:
+    """Every silent ``min_gap_ms`` window of a recording, built once and queried by range.
+
+    This reproduces pydub's ``detect_silence`` at a 1 ms seek step: a window
+    starting at millisecond ``j`` is silent when the integer RMS of its samples is
+    at or below the threshold, where the threshold sits ``silence_margin_db``
+    under the dBFS of the whole recording. Silent window starts are stored as
+    sorted runs (``run_first``/``run_last``, inclusive), and runs closer than
+    ``min_gap_ms`` share a ``run_group`` because pydub merges them into one gap.
+    Results match pydub exactly when the sample rate is a whole number of kHz.
+    """
+
+    duration_ms: int
+    sample_rate: int
+    min_gap_ms: int
+    silence_margin_db: float
+    silence_thresh_db: float
+    run_first: np.ndarray
+    run_last: np.ndarray
+    run_group: np.ndarray
+
+    @classmethod
+    def from_buffer(
+        cls,
+        audio: AudioBuffer,
+        *,
+        min_gap_ms: int = DEFAULT_MIN_GAP_MS,
+        silence_margin_db: float = DEFAULT_SILENCE_MARGIN_DB,
+        block_ms: int = DEFAULT_BLOCK_MS,
+    ) -> "SilenceMap":
+        return cls.from_samples(
+            audio.samples,
+            audio.sample_rate,
+            min_gap_ms=min_gap_ms,
+            silence_margin_db=silence_margin_db,
+            block_ms=block_ms,
+        )
+
+    @classmethod
+    def from_samples(
+        cls,
+        samples: np.ndarray,
+        sample_rate: int,
+        *,
+        min_gap_ms: int = DEFAULT_MIN_GAP_MS,
+        silence_margin_db: float = DEFAULT_SILENCE_MARGIN_DB,
+        block_ms: int = DEFAULT_BLOCK_MS,
+    ) -> "SilenceMap":
+        """Scan mono int16 ``samples`` in blocks of ``block_ms`` window starts."""
+
+        if min_gap_ms <= 0:
+            raise ValueError("min_gap_ms must be positive")
+        samples = np.asarray(samples)
+        num_samples = len(samples)
+        per_ms = sample_rate / 1000.0
+        duration_ms = round(1000 * (num_samples / sample_rate))
+
+        total = _square_sum(samples)
+        rms = int(math.sqrt(total / num_samples)) if num_samples else 0
+        dbfs = 20 * math.log(rms / _MAX_AMPLITUDE, 10) if rms else -math.inf
+        silence_thresh_db = dbfs - silence_margin_db
+        threshold = 10 ** (silence_thresh_db / 20) * _MAX_AMPLITUDE
+
+        firsts: List[np.ndarray] = []
+        lasts: List[np.ndarray] = []
+        last_start = duration_ms - min_gap_ms
+        for block_start in range(0, last_start + 1, max(1, block_ms)):
+            block_end = min(block_start + block_ms, last_start + 1)
+            edges = np.floor(
+                np.arange(block_start, block_end + min_gap_ms, dtype=np.float64) * per_ms
+            ).astype(np.int64)
+            base = int(edges[0])
+            chunk = np.zeros(int(edges[-1]) - base, dtype=np.int64)
+            available = samples[base : min(int(edges[-1]), num_samples)]
+            chunk[: len(available)] = available
+            prefix = np.zeros(len(chunk) + 1, dtype=np.int64)
+            np.cumsum(chunk * chunk, out=prefix[1:])
+
+            lo = edges[: block_end - block_start] - base
+            hi = edges[min_gap_ms:] - base
+            counts = hi - lo
+            sums = (prefix[hi] - prefix[lo]).astype(np.float64)
+            window_rms = np.floor(
+                np.sqrt(np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0))
+            )
+            silent = window_rms <= threshold
+
+            flips = np.flatnonzero(np.diff(np.concatenate([[0], silent.astype(np.int8), [0]])))
+            if len(flips):
+                firsts.append(flips[::2] + block_start)
+                lasts.append(flips[1::2] - 1 + block_start)
+
+        run_first, run_last = _join_runs(firsts, lasts)
+        breaks = run_first[1:] > run_last[:-1] + min_gap_ms
+        run_group = np.concatenate([[0], np.cumsum(breaks)]).astype(np.int64)
+        return cls(
+            duration_ms=duration_ms,
+            sample_rate=sample_rate,
+            min_gap_ms=min_gap_ms,
+            silence_margin_db=silence_margin_db,
+            silence_thresh_db=silence_thresh_db,
+            run_first=run_first,
+            run_last=run_last,
+            run_group=run_group[: len(run_first)],
+        )
+
+    def gaps_in(self, start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """What ``detect_silence`` reports for ``audio[start_ms:end_ms]``, in absolute ms."""
+
+        start_ms = max(0, min(start_ms, self.duration_ms))
+        end_ms = max(start_ms, min(end_ms, self.duration_ms))
+        per_ms = self.sample_rate / 1000.0
+        frames = int(end_ms * per_ms) - int(start_ms * per_ms)
+        window_ms = round(1000 * (frames / self.sample_rate))
+        if window_ms < self.min_gap_ms:
+            return []
+
+        lo, hi = start_ms, start_ms + window_ms - self.min_gap_ms
+        first_run = int(np.searchsorted(self.run_last, lo, side="left"))
+        last_run = int(np.searchsorted(self.run_first, hi, side="right")) - 1
+        gaps: List[Tuple[int, int]] = []
+        run = first_run
+        while run <= last_run:
+            group_end = run
+            while group_end < last_run and self.run_group[group_end + 1] == self.run_group[run]:
+                group_end += 1
+            first = max(int(self.run_first[run]), lo)
+            last = min(int(self.run_last[group_end]), hi)
+            gaps.append((first, last + self.min_gap_ms))
+            run = group_end + 1
+        return gaps
+
+    def snap(
+        self, target_ms: int, *, lookaround_ms: int, prefer: Literal["start", "end"]
+    ) -> int:
+        """Move ``target_ms`` to the nearest gap edge within ``+/- lookaround_ms``.
+
+        ``prefer="end"`` snaps to where a gap ends (speech resumes) and
+        ``prefer="start"`` to where one begins; ties go to the earlier gap.
+        """
+
+        window_start = max(0, target_ms - lookaround_ms)
+        window_end = min(self.duration_ms, target_ms + lookaround_ms)
+        if window_start >= window_end:
+            return target_ms
+        best = None
+        best_distance = math.inf
+        for gap_start, gap_end in self.gaps_in(window_start, window_end):
+            anchor = gap_end if prefer == "end" else gap_start
+            distance = abs(anchor - target_ms)
+            if distance < best_distance:
+                best_distance = distance
+                best = anchor
+        if best is None:
+            return target_ms
+        return max(0, min(self.duration_ms, best))
+
+
+def _square_sum(samples: np.ndarray, block: int = 1 << 22) -> int:
+    total = 0
+    for start in range(0, len(samples), block):
+        chunk = samples[start : start + block].astype(np.int64)
+        total += int(np.dot(chunk, chunk))
+    return total
+
+
+def _join_runs(
+    firsts: List[np.ndarray], lasts: List[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatenate per-block runs, fusing runs that continue across a block edge."""
+
+    if not firsts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty.copy()
+    run_first = np.concatenate(firsts).astype(np.int64)
+    run_last = np.concatenate(lasts).astype(np.int64)
+    keep = np.concatenate([[True], run_first[1:] != run_last[:-1] + 1])
+    starts = run_first[keep]
+    ends = run_last[np.concatenate([keep[1:], [True]])]
+    return starts, ends
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+DEFAULT_FRAME_S = 0.032
+DEFAULT_BATCH_FRAMES = 8192
+BAND_EDGES_HZ = (200, 1000, 4000)
+
+
+@dataclass
+class FrameFeatures:
+    """Per-frame amplitude statistics and band magnitudes for one signal.
+
+    Frames are non-overlapping blocks of ``frame_samples`` samples. Every column
+    is additive across frames (except ``peak``), so any analysis window made of
+    whole frames can be summarized from prefix sums without another FFT. This is
+    what lets window size and hop be swept on the same features.
+
+    Summed frame magnitudes equal a single window FFT only for tonal input; for
+    broadband noise they come out smaller by roughly ``sqrt(frame / window)``, so
+    band columns weigh less against the amplitude columns than in the STFT mode.
+    Vectors of the two modes are therefore not interchangeable.
+    """
+
+    sample_rate: int
+    frame_samples: int
+    num_samples: int
+    abs_sum: np.ndarray
+    sample_sum: np.ndarray
+    square_sum: np.ndarray
+    peak: np.ndarray
+    band_magnitudes: np.ndarray
+
+    @property
+    def num_frames(self) -> int:
+        return len(self.peak)
+
+    def embed_windows(
+        self, *, window_s: float, hop_ratio: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Embedding matrix for the same window grid as the STFT mode.
+
+        Window edges are snapped to the nearest frame, and windows running past
+        the end are treated as zero-padded, matching the STFT mode's tail handling.
+        """
+
+        if window_s <= 0:
+            raise ValueError("window_s must be positive")
+        if hop_ratio <= 0 or hop_ratio > 1:
+            raise ValueError("hop_ratio must be in (0, 1]")
+
+        columns = 4 + self.band_magnitudes.shape[1]
+        if not self.num_samples:
+            empty = np.zeros(0, dtype=np.float64)
+            return np.zeros((0, columns), dtype=np.float32), empty, empty
+
+        window_samples = max(1, int(window_s * self.sample_rate))
+        hop_samples = max(1, int(window_samples * hop_ratio))
+        start_indices = np.arange(0, self.num_samples, hop_samples)
+
+        width = max(1, int(round(window_samples / self.frame_samples)))
+        first = np.minimum(
+            np.rint(start_indices / self.frame_samples).astype(np.int64), self.num_frames
+        )
+        last = np.minimum(first + width, self.num_frames)
+        span = float(width * self.frame_samples)
+
+        def window_sum(values: np.ndarray) -> np.ndarray:
+            prefix = np.zeros((len(values) + 1,) + values.shape[1:], dtype=np.float64)
+            np.cumsum(values, axis=0, out=prefix[1:])
+            return prefix[last] - prefix[first]
+
+        mean_abs = window_sum(self.abs_sum) / span
+        mean = window_sum(self.sample_sum) / span
+        variance = np.maximum(window_sum(self.square_sum) / span - mean * mean, 0.0)
+        bands = window_sum(self.band_magnitudes)
+
+        padded_peak = np.concatenate([self.peak, np.zeros(width, dtype=self.peak.dtype)])
+        window_peak = sliding_window_view(padded_peak, width)[first].max(axis=1)
+
+        vectors = np.column_stack(
+            [mean_abs, np.sqrt(variance), window_peak, bands.sum(axis=1) + 1e-8, bands]
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+
+        starts = start_indices / self.sample_rate
+        return vectors.astype(np.float32), starts, starts + window_s
+
+
+def compute_frame_features(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    frame_s: float = DEFAULT_FRAME_S,
+    batch_frames: int = DEFAULT_BATCH_FRAMES,
+) -> FrameFeatures:
+    """Run the short-frame spectrogram once and keep only per-frame summaries.
+
+    The full spectrogram is reduced to band magnitudes batch by batch, so a
+    day-long recording needs a few values per frame rather than every bin.
+    """
+
+    from scipy import fft as sp_fft
+
+    if frame_s <= 0:
+        raise ValueError("frame_s must be positive")
+    samples = np.asarray(samples)
+    frame_samples = max(1, int(round(frame_s * sample_rate)))
+    num_frames = -(-len(samples) // frame_samples)
+    bands = len(BAND_EDGES_HZ) + 1
+
+    abs_sum = np.zeros(num_frames, dtype=np.float64)
+    sample_sum = np.zeros(num_frames, dtype=np.float64)
+    square_sum = np.zeros(num_frames, dtype=np.float64)
+    peak = np.zeros(num_frames, dtype=np.float64)
+    band_magnitudes = np.zeros((num_frames, bands), dtype=np.float64)
+
+    taper = np.hanning(frame_samples)
+    bins = band_matrix(frame_samples, sample_rate)
+    for first in range(0, num_frames, batch_frames):
+        last = min(first + batch_frames, num_frames)
+        chunk = samples[first * frame_samples : last * frame_samples].astype(np.float64)
+        frames = np.zeros((last - first) * frame_samples, dtype=np.float64)
+        frames[: len(chunk)] = chunk
+        frames = frames.reshape(last - first, frame_samples)
+
+        magnitude = np.abs(frames)
+        abs_sum[first:last] = magnitude.sum(axis=1)
+        sample_sum[first:last] = frames.sum(axis=1)
+        square_sum[first:last] = np.square(frames).sum(axis=1)
+        peak[first:last] = magnitude.max(axis=1)
+        spectrum = np.abs(sp_fft.rfft(frames * taper, axis=1, workers=-1))
+        band_magnitudes[first:last] = spectrum @ bins
+
+    return FrameFeatures(
+        sample_rate=sample_rate,
+        frame_samples=frame_samples,
+        num_samples=len(samples),
+        abs_sum=abs_sum,
+        sample_sum=sample_sum,
+        square_sum=square_sum,
+        peak=peak,
+        band_magnitudes=band_magnitudes,
+    )
+
+
+def band_matrix(fft_size: int, sample_rate: int) -> np.ndarray:
+    """0/1 matrix mapping rfft bins to the embedding's frequency bands."""
+
+    freqs = np.fft.rfftfreq(fft_size, d=1.0 / sample_rate)
+    edges = [0.0, *BAND_EDGES_HZ, np.inf]
+    matrix = np.zeros((len(freqs), len(edges) - 1), dtype=np.float64)
+    for column, (low, high) in enumerate(zip(edges[:-1], edges[1:])):
+        matrix[(freqs >= low) & (freqs < high), column] = 1.0
+    return matrix
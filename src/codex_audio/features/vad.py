@@ -2,12 +2,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Iterator, List, Literal
+from typing import Iterable, Iterator, List, Literal, Optional, Sequence, Tuple, overload
 
-from pydub import AudioSegment
-import webrtcvad
+import numpy as np
+
+from codex_audio.ingest import AudioBuffer
+from codex_audio.utils.lazy import LazyImports
+
+_lazy = LazyImports(globals(), webrtcvad="webrtcvad")
+__getattr__ = _lazy.module_getattr
 
 FRAME_DURATION_OPTIONS = (10, 20, 30)
+VAD_SAMPLE_RATE = 16_000
 SPEECH_LABEL: Literal["speech"] = "speech"
 SILENCE_LABEL: Literal["silence"] = "silence"
 
@@ -22,6 +28,126 @@ class VadSegment:
         return max(0.0, self.end_s - self.start_s)
 
 
+class VadTimeline(Sequence[VadSegment]):
+    """VAD segments as parallel start/end/label arrays, sorted by start.
+
+    Assumes the segments do not overlap, as :func:`run_vad` produces them, so
+    ends are sorted too and every query is a binary search. Still reads like
+    the ``List[VadSegment]`` it indexes, so it can be passed wherever a list
+    of segments is expected.
+    """
+
+    def __init__(self, start_s: np.ndarray, end_s: np.ndarray, is_silence: np.ndarray) -> None:
+        self.start_s = np.asarray(start_s, dtype=np.float64)
+        self.end_s = np.asarray(end_s, dtype=np.float64)
+        self.is_silence = np.asarray(is_silence, dtype=bool)
+        if not len(self.start_s) == len(self.end_s) == len(self.is_silence):
+            raise ValueError("VAD start, end and label arrays must have the same length")
+        silence = np.flatnonzero(self.is_silence)
+        self._silence_index = silence
+        self._silence_start = self.start_s[silence]
+        self._silence_end = self.end_s[silence]
+
+    @classmethod
+    def from_segments(cls, segments: Sequence[VadSegment]) -> "VadTimeline":
+        if isinstance(segments, VadTimeline):
+            return segments
+        ordered = sorted(segments, key=lambda seg: seg.start_s)
+        return cls(
+            np.array([seg.start_s for seg in ordered], dtype=np.float64),
+            np.array([seg.end_s for seg in ordered], dtype=np.float64),
+            np.array([seg.label == SILENCE_LABEL for seg in ordered], dtype=bool),
+        )
+
+    def __len__(self) -> int:
+        return len(self.start_s)
+
+    @overload
+    def __getitem__(self, index: int) -> VadSegment: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "VadTimeline": ...
+
+    def __getitem__(self, index: int | slice) -> VadSegment | "VadTimeline":
+        if isinstance(index, slice):
+            return VadTimeline(self.start_s[index], self.end_s[index], self.is_silence[index])
+        row = range(len(self))[index]
+        return self._segment(row)
+
+    def __iter__(self) -> Iterator[VadSegment]:
+        for row in range(len(self)):
+            yield self._segment(row)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(segments={len(self)})"
+
+    def duration(self, index: int) -> float:
+        return max(0.0, float(self.end_s[index] - self.start_s[index]))
+
+    def index_at(self, time_s: float) -> Optional[int]:
+        """Index of the earliest segment with ``start_s <= time_s <= end_s``."""
+
+        row = int(np.searchsorted(self.end_s, time_s, side="left"))
+        if row < len(self) and self.start_s[row] <= time_s:
+            return row
+        return None
+
+    def label_at(self, time_s: float) -> Optional[str]:
+        row = self.index_at(time_s)
+        if row is None:
+            return None
+        return SILENCE_LABEL if self.is_silence[row] else SPEECH_LABEL
+
+    def silences_overlapping(self, start_s: float, end_s: float) -> np.ndarray:
+        """Indices of the silences that overlap ``(start_s, end_s)`` by more than a point."""
+
+        first = int(np.searchsorted(self._silence_end, start_s, side="right"))
+        last = int(np.searchsorted(self._silence_start, end_s, side="left"))
+        rows = self._silence_index[first:last]
+        overlap = np.minimum(self.end_s[rows], end_s) - np.maximum(self.start_s[rows], start_s)
+        return rows[overlap > 0]
+
+    def silence_overlap(self, start_s: np.ndarray, end_s: np.ndarray) -> np.ndarray:
+        """Longest stretch of silence inside each ``[start_s[i], end_s[i]]`` window.
+
+        Vectorized over windows: each pass handles the k-th silence of every
+        window, so the loop runs as many times as the busiest window has silences.
+        """
+
+        start_s = np.asarray(start_s, dtype=np.float64)
+        end_s = np.asarray(end_s, dtype=np.float64)
+        first = np.searchsorted(self._silence_end, start_s, side="right")
+        last = np.searchsorted(self._silence_start, end_s, side="left")
+        longest = np.zeros(len(start_s), dtype=np.float64)
+        for offset in range(int((last - first).max(initial=0))):
+            row = first + offset
+            active = row < last
+            row = np.where(active, row, 0)
+            overlap = np.minimum(self._silence_end[row], end_s) - np.maximum(
+                self._silence_start[row], start_s
+            )
+            np.maximum(longest, np.where(active, overlap, 0.0), out=longest)
+        return longest
+
+    def longest_silence_in(self, start_s: float, end_s: float) -> Optional[int]:
+        """Index of the longest silence overlapping the window; ties go to the earliest."""
+
+        rows = self.silences_overlapping(start_s, end_s)
+        if not len(rows):
+            return None
+        durations = self.end_s[rows] - self.start_s[rows]
+        best = int(np.argmax(durations))
+        if durations[best] <= 0:
+            return None
+        return int(rows[best])
+
+    def _segment(self, row: int) -> VadSegment:
+        label: Literal["speech", "silence"] = (
+            SILENCE_LABEL if self.is_silence[row] else SPEECH_LABEL
+        )
+        return VadSegment(float(self.start_s[row]), float(self.end_s[row]), label)
+
+
 def _yield_frames(raw_data: bytes, frame_size: int) -> Iterator[bytes]:
     for idx in range(0, len(raw_data), frame_size):
         chunk = raw_data[idx : idx + frame_size]
@@ -30,14 +156,15 @@ def _yield_frames(raw_data: bytes, frame_size: int) -> Iterator[bytes]:
 
 
 def run_vad(
-    audio_path: Path,
+    audio: Path | AudioBuffer,
     *,
     aggressiveness: int = 2,
     frame_duration_ms: int = 30,
 ) -> List[VadSegment]:
-    audio_path = audio_path.expanduser().resolve()
-    if not audio_path.exists():
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    if not isinstance(audio, AudioBuffer):
+        audio = audio.expanduser().resolve()
+        if not audio.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio}")
 
     if aggressiveness < 0 or aggressiveness > 3:
         raise ValueError("Aggressiveness must be between 0 and 3")
@@ -46,23 +173,21 @@ def run_vad(
             f"frame_duration_ms must be one of {FRAME_DURATION_OPTIONS}, got {frame_duration_ms}"
         )
 
-    audio = AudioSegment.from_file(audio_path)
-    mono = audio.set_channels(1).set_frame_rate(16_000).set_sample_width(2)
-    frame_size = int(mono.frame_rate * (frame_duration_ms / 1000.0) * mono.sample_width)
-    raw_data = mono.raw_data
+    raw_data, sample_rate, total_duration = _vad_pcm(audio)
+    frame_size = int(sample_rate * (frame_duration_ms / 1000.0) * 2)
 
     if len(raw_data) < frame_size:
         frame_padding = frame_size - len(raw_data)
         raw_data += b"\0" * frame_padding
 
-    vad = webrtcvad.Vad(aggressiveness)
+    vad = _lazy("webrtcvad").Vad(aggressiveness)
     segments: List[VadSegment] = []
     current_label: Literal["speech", "silence"] | None = None
     segment_start = 0.0
 
     for idx, frame in enumerate(_yield_frames(raw_data, frame_size)):
         frame_start = idx * (frame_duration_ms / 1000.0)
-        is_speech = vad.is_speech(frame, mono.frame_rate)
+        is_speech = vad.is_speech(frame, sample_rate)
         label: Literal["speech", "silence"] = SPEECH_LABEL if is_speech else SILENCE_LABEL
         if current_label is None:
             current_label = label
@@ -73,7 +198,6 @@ def run_vad(
             current_label = label
             segment_start = frame_start
 
-    total_duration = len(mono) / 1000.0
     if current_label is None:
         return []
     segments.append(VadSegment(segment_start, total_duration, current_label))
@@ -82,6 +206,21 @@ def run_vad(
     return consolidated
 
 
+def _vad_pcm(audio: Path | AudioBuffer) -> Tuple[bytes, int, float]:
+    """Return 16 kHz mono 16-bit PCM bytes, the sample rate, and duration in seconds."""
+
+    if isinstance(audio, AudioBuffer) and audio.sample_rate == VAD_SAMPLE_RATE:
+        return audio.pcm_bytes(), audio.sample_rate, audio.duration_ms / 1000.0
+    if isinstance(audio, AudioBuffer):
+        segment = audio.as_audio_segment()
+    else:
+        from pydub import AudioSegment
+
+        segment = AudioSegment.from_file(audio)
+    mono = segment.set_channels(1).set_frame_rate(VAD_SAMPLE_RATE).set_sample_width(2)
+    return mono.raw_data, mono.frame_rate, len(mono) / 1000.0
+
+
 def _merge_zero_length_segments(segments: Iterable[VadSegment]) -> List[VadSegment]:
     result: List[VadSegment] = []
     for segment in segments:
@@ -1,10 +1,30 @@
 ﻿from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import struct
+import subprocess
+import threading
+import wave
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import IO, TYPE_CHECKING, Any, Deque, Dict, Iterator, Optional, Tuple
 
-from pydub import AudioSegment, effects
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pydub import AudioSegment
+
+PCM_SAMPLE_WIDTH = 2
+PCM_MAX_AMPLITUDE = 32768
+NORMALIZE_HEADROOM_DB = 0.1  # matches pydub.effects.normalize
+STREAM_BLOCK_S = 30.0
+FFMPEG_CMD = "ffmpeg"
+FFPROBE_CMD = "ffprobe"
+FFMPEG_STDERR_TAIL_LINES = 20
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+_SAMPLE_FMT_BITS = {"u8": 8, "s16": 16, "s32": 32, "s64": 64, "flt": 32, "dbl": 64}
 
 
 @dataclass
@@ -19,14 +39,169 @@ class AudioMetadata:
     sample_width: int
 
 
-def load_and_normalize_audio(
+@dataclass
+class AudioBuffer:
+    """Decoded mono 16-bit PCM shared by every pipeline stage.
+
+    ``samples`` is either an in-memory array or a read-only memory map over the
+    normalized WAV at ``path``. ``path`` is ``None`` when nothing was written to
+    disk; stages that need a file (Azure STT, ffmpeg) call :meth:`write_wav`.
+    """
+
+    samples: np.ndarray
+    sample_rate: int
+    path: Optional[Path] = None
+    _segment: Any = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def num_samples(self) -> int:
+        return int(self.samples.shape[0])
+
+    @property
+    def duration_s(self) -> float:
+        return self.num_samples / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def duration_ms(self) -> int:
+        """Length in milliseconds, rounded the same way as ``len(AudioSegment)``."""
+
+        if not self.sample_rate:
+            return 0
+        return round(1000 * (self.num_samples / self.sample_rate))
+
+    def as_float32(self) -> np.ndarray:
+        return self.samples.astype(np.float32) / 32768.0
+
+    def pcm_bytes(self) -> bytes:
+        return np.asarray(self.samples, dtype="<i2").tobytes()
+
+    def as_audio_segment(self) -> AudioSegment:
+        """Return a pydub view of the buffer, built once and reused."""
+
+        if self._segment is None:
+            from pydub import AudioSegment
+
+            self._segment = AudioSegment(
+                data=self.pcm_bytes(),
+                sample_width=PCM_SAMPLE_WIDTH,
+                frame_rate=self.sample_rate,
+                channels=1,
+            )
+        return self._segment
+
+    def sample_index(self, time_s: float) -> int:
+        index = int(round(max(0.0, time_s) * self.sample_rate))
+        return min(index, self.num_samples)
+
+    def slice(self, start_s: float, end_s: float) -> "AudioBuffer":
+        start = self.sample_index(start_s)
+        end = max(start, self.sample_index(end_s))
+        return AudioBuffer(samples=self.samples[start:end], sample_rate=self.sample_rate)
+
+    def write_wav(self, path: Path) -> Path:
+        """Write the buffer as a PCM WAV and remember it as the backing file."""
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_pcm_wav(path, self.samples, self.sample_rate)
+        self.path = path
+        return path
+
+    @classmethod
+    def from_wav(cls, path: Path, *, mmap: bool = True) -> "AudioBuffer":
+        """Load a WAV file, memory-mapping it when it is already 16-bit mono PCM."""
+
+        path = path.expanduser().resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Audio file not found: {path}")
+        layout = read_wav_layout(path)
+        if layout is not None and layout.channels == 1 and layout.sample_width == PCM_SAMPLE_WIDTH:
+            if mmap and layout.num_frames:
+                samples = np.memmap(
+                    path,
+                    dtype="<i2",
+                    mode="r",
+                    offset=layout.data_offset,
+                    shape=(layout.num_frames,),
+                )
+            else:
+                with path.open("rb") as handle:
+                    handle.seek(layout.data_offset)
+                    samples = np.fromfile(handle, dtype="<i2", count=layout.num_frames)
+            return cls(samples=samples, sample_rate=layout.sample_rate, path=path)
+
+        import soundfile as sf
+
+        data, sample_rate = sf.read(str(path), dtype="int16", always_2d=True)
+        mono = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+        return cls(samples=mono.astype(np.int16), sample_rate=int(sample_rate), path=path)
+
+
+@dataclass
+class WavLayout:
+    """Location of the PCM payload inside a RIFF/WAVE file."""
+
+    sample_rate: int
+    channels: int
+    sample_width: int
+    data_offset: int
+    num_frames: int
+
+
+def read_wav_layout(path: Path) -> Optional[WavLayout]:
+    """Parse the RIFF header of ``path``; return ``None`` for non-PCM files."""
+
+    with path.open("rb") as handle:
+        header = handle.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        fmt: Optional[Tuple[int, int, int, int]] = None
+        while True:
+            chunk_header = handle.read(8)
+            if len(chunk_header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                body = handle.read(chunk_size)
+                audio_format, channels, sample_rate = struct.unpack("<HHI", body[:8])
+                bits_per_sample = struct.unpack("<H", body[14:16])[0]
+                fmt = (audio_format, channels, sample_rate, bits_per_sample)
+                if chunk_size % 2:
+                    handle.seek(1, 1)
+                continue
+            if chunk_id == b"data":
+                if fmt is None or fmt[0] not in (_WAVE_FORMAT_PCM, _WAVE_FORMAT_EXTENSIBLE):
+                    return None
+                _, channels, sample_rate, bits_per_sample = fmt
+                sample_width = bits_per_sample // 8
+                data_offset = handle.tell()
+                available = path.stat().st_size - data_offset
+                data_size = min(chunk_size, available)
+                frame_width = max(1, channels * sample_width)
+                return WavLayout(
+                    sample_rate=sample_rate,
+                    channels=channels,
+                    sample_width=sample_width,
+                    data_offset=data_offset,
+                    num_frames=data_size // frame_width,
+                )
+            handle.seek(chunk_size + (chunk_size % 2), 1)
+
+
+def normalized_wav_path(source_path: Path, work_dir: Path) -> Path:
+    return work_dir / f"{source_path.stem}_normalized.wav"
+
+
+def load_audio_buffer(
     source_path: Path,
     work_dir: Optional[Path] = None,
     target_sample_rate: int = 16_000,
-) -> Tuple[AudioMetadata, Path]:
-    """Create a normalized 16 kHz mono WAV copy of ``source_path``.
+    *,
+    write_wav: bool = True,
+) -> Tuple[AudioMetadata, AudioBuffer]:
+    """Decode ``source_path`` once into a normalized 16 kHz mono :class:`AudioBuffer`.
 
-    Returns tuple of (metadata, normalized_path).
+    The normalized WAV is only written when ``write_wav`` is true; the buffer is
+    the handoff between stages either way.
     """
 
     source_path = source_path.expanduser().resolve()
@@ -35,9 +210,8 @@ def load_and_normalize_audio(
 
     if work_dir is None:
         work_dir = source_path.parent / "work"
-    work_dir.mkdir(parents=True, exist_ok=True)
 
-    normalized_path = work_dir / f"{source_path.stem}_normalized.wav"
+    from pydub import AudioSegment, effects
 
     audio = AudioSegment.from_file(source_path)
     metadata = AudioMetadata(
@@ -50,7 +224,261 @@ def load_and_normalize_audio(
     )
 
     normalized = audio.set_frame_rate(target_sample_rate).set_channels(1)
+    normalized = normalized.set_sample_width(PCM_SAMPLE_WIDTH)
     normalized = effects.normalize(normalized)
-    normalized.export(normalized_path, format="wav")
+    buffer = AudioBuffer(
+        samples=np.frombuffer(normalized.raw_data, dtype="<i2"),
+        sample_rate=target_sample_rate,
+    )
+    if write_wav:
+        work_dir.mkdir(parents=True, exist_ok=True)
+        buffer.write_wav(normalized_wav_path(source_path, work_dir))
+
+    return metadata, buffer
+
+
+def load_and_normalize_audio(
+    source_path: Path,
+    work_dir: Optional[Path] = None,
+    target_sample_rate: int = 16_000,
+) -> Tuple[AudioMetadata, Path]:
+    """Create a normalized 16 kHz mono WAV copy of ``source_path``.
+
+    Returns tuple of (metadata, normalized_path).
+    """
+
+    metadata, buffer = load_audio_buffer(
+        source_path, work_dir=work_dir, target_sample_rate=target_sample_rate, write_wav=True
+    )
+    assert buffer.path is not None
+    return metadata, buffer.path
+
+
+def stream_audio_buffer(
+    source_path: Path,
+    work_dir: Optional[Path] = None,
+    target_sample_rate: int = 16_000,
+    *,
+    block_s: float = STREAM_BLOCK_S,
+) -> Tuple[AudioMetadata, AudioBuffer]:
+    """Normalize ``source_path`` through an ffmpeg pipe in fixed-size PCM blocks.
+
+    Blocks are appended to the normalized WAV while the peak is tracked, then the
+    peak gain is applied in place over a memory map, so resident memory depends on
+    ``block_s`` rather than on the recording length. The metadata matches
+    :func:`load_audio_buffer`; the returned buffer is memory-mapped.
+    """
+
+    if block_s <= 0:
+        raise ValueError("block_s must be positive")
+    source_path = source_path.expanduser().resolve()
+    if not source_path.exists():
+        raise FileNotFoundError(f"Audio file not found: {source_path}")
+
+    if work_dir is None:
+        work_dir = source_path.parent / "work"
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    metadata = probe_audio_metadata(source_path, target_sample_rate=target_sample_rate)
+    normalized_path = normalized_wav_path(source_path, work_dir)
+    block_samples = max(1, int(block_s * target_sample_rate))
+
+    peak = 0
+    with wave.open(str(normalized_path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(PCM_SAMPLE_WIDTH)
+        handle.setframerate(target_sample_rate)
+        for block in iter_pcm_blocks(
+            source_path, sample_rate=target_sample_rate, block_samples=block_samples
+        ):
+            if block.size:
+                peak = max(peak, int(np.abs(block.astype(np.int32)).max()))
+            handle.writeframes(block.tobytes())
+
+    _normalize_wav_in_place(normalized_path, peak=peak, block_samples=block_samples)
+    return metadata, AudioBuffer.from_wav(normalized_path)
+
+
+def iter_pcm_blocks(
+    source_path: Path | str,
+    *,
+    sample_rate: int = 16_000,
+    block_samples: int = int(STREAM_BLOCK_S * 16_000),
+) -> Iterator[np.ndarray]:
+    """Yield mono 16-bit PCM blocks of ``block_samples`` decoded by ffmpeg.
+
+    ``source_path`` may also be any input ffmpeg opens itself, such as a stream URL.
+    """
+
+    cmd = [
+        FFMPEG_CMD,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostdin",
+        "-i",
+        str(source_path),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-acodec",
+        "pcm_s16le",
+        "-f",
+        "s16le",
+        "-",
+    ]
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError as exc:
+        raise RuntimeError("ffmpeg executable not found in PATH") from exc
+
+    # ffmpeg logs one line per bad frame; drain stderr concurrently so a full
+    # pipe never blocks the decoder while we wait on stdout.
+    stderr_tail: Deque[bytes] = deque(maxlen=FFMPEG_STDERR_TAIL_LINES)
+    drain = threading.Thread(target=_drain_lines, args=(process.stderr, stderr_tail), daemon=True)
+    drain.start()
+    block_bytes = max(1, block_samples) * PCM_SAMPLE_WIDTH
+    try:
+        while True:
+            chunk = _read_exact(process.stdout, block_bytes)
+            usable = len(chunk) - (len(chunk) % PCM_SAMPLE_WIDTH)
+            if usable:
+                yield np.frombuffer(chunk[:usable], dtype="<i2")
+            if len(chunk) < block_bytes:
+                break
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        drain.join()
+        process.stderr.close()
+    if returncode != 0:
+        message = b"".join(stderr_tail).decode(errors="replace").strip()
+        raise RuntimeError(f"ffmpeg failed to decode {source_path}: {message}")
+
+
+def _drain_lines(stream: IO[bytes], tail: Deque[bytes]) -> None:
+    for line in iter(stream.readline, b""):
+        tail.append(line)
+
+
+def probe_audio_metadata(source_path: Path, *, target_sample_rate: int = 16_000) -> AudioMetadata:
+    """Read :class:`AudioMetadata` from headers without decoding the audio.
+
+    Sample widths follow pydub: 24-bit PCM is reported as 4 bytes, and lossy
+    float-planar codecs as 16-bit.
+    """
+
+    source_path = source_path.expanduser().resolve()
+    layout = read_wav_layout(source_path)
+    if layout is not None:
+        sample_rate = layout.sample_rate
+        channels = layout.channels
+        bits = layout.sample_width * 8
+        frames = layout.num_frames
+    else:
+        stream = _ffprobe_audio_stream(source_path)
+        sample_rate = int(stream.get("sample_rate") or 0)
+        channels = int(stream.get("channels") or 0)
+        bits = _probe_bits_per_sample(stream)
+        frames = _probe_frame_count(stream, sample_rate)
+    if not sample_rate:
+        raise RuntimeError(f"Unable to determine sample rate of {source_path}")
+
+    sample_width = 4 if bits == 24 else max(1, bits // 8)
+    return AudioMetadata(
+        source_path=source_path,
+        duration_s=round(1000 * (frames / sample_rate)) / 1000.0,
+        sample_rate=sample_rate,
+        channels=channels,
+        normalized_sample_rate=target_sample_rate,
+        sample_width=sample_width,
+    )
+
+
+def _ffprobe_audio_stream(source_path: Path) -> Dict[str, Any]:
+    cmd = [
+        FFPROBE_CMD,
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "stream=codec_name,sample_rate,channels,sample_fmt,bits_per_sample,"
+        "bits_per_raw_sample,duration_ts,time_base,duration",
+        "-of",
+        "json",
+        str(source_path),
+    ]
+    try:
+        completed = subprocess.run(cmd, check=True, capture_output=True)
+    except FileNotFoundError as exc:
+        raise RuntimeError("ffprobe executable not found in PATH") from exc
+    streams = json.loads(completed.stdout or b"{}").get("streams") or []
+    if not streams:
+        raise RuntimeError(f"No audio stream found in {source_path}")
+    return dict(streams[0])
+
+
+def _probe_bits_per_sample(stream: Dict[str, Any]) -> int:
+    sample_fmt = str(stream.get("sample_fmt") or "")
+    if sample_fmt == "fltp" and stream.get("codec_name") in {"mp3", "mp4", "aac", "webm", "ogg"}:
+        return 16
+    for key in ("bits_per_sample", "bits_per_raw_sample"):
+        try:
+            bits = int(stream.get(key) or 0)
+        except (TypeError, ValueError):
+            bits = 0
+        if bits:
+            return bits
+    return _SAMPLE_FMT_BITS.get(sample_fmt.rstrip("p"), 16)
+
+
+def _probe_frame_count(stream: Dict[str, Any], sample_rate: int) -> int:
+    if stream.get("time_base") == f"1/{sample_rate}" and stream.get("duration_ts"):
+        return int(stream["duration_ts"])
+    try:
+        return int(round(float(stream.get("duration") or 0.0) * sample_rate))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _normalize_wav_in_place(path: Path, *, peak: int, block_samples: int) -> None:
+    """Apply pydub-style peak normalization to a 16-bit mono WAV block by block."""
+
+    layout = read_wav_layout(path)
+    if peak <= 0 or layout is None or not layout.num_frames:
+        return
+    target_peak = PCM_MAX_AMPLITUDE * (10 ** (-NORMALIZE_HEADROOM_DB / 20))
+    factor = target_peak / peak
+    samples = np.memmap(
+        path, dtype="<i2", mode="r+", offset=layout.data_offset, shape=(layout.num_frames,)
+    )
+    for start in range(0, layout.num_frames, block_samples):
+        block = samples[start : start + block_samples].astype(np.float64) * factor
+        samples[start : start + block_samples] = np.clip(
+            np.floor(block), -PCM_MAX_AMPLITUDE, PCM_MAX_AMPLITUDE - 1
+        )
+    samples.flush()
+    del samples
+
+
+def _read_exact(stream: IO[bytes], size: int) -> bytes:
+    parts = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        parts.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(parts)
+
 
-    return metadata, normalized_path
+def _write_pcm_wav(path: Path, samples: np.ndarray, sample_rate: int) -> None:
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(PCM_SAMPLE_WIDTH)
+        handle.setframerate(sample_rate)
+        handle.writeframes(np.asarray(samples, dtype="<i2").tobytes())
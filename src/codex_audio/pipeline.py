@@ -1,43 +1,84 @@
 ﻿from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field
+import os
+import shutil
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Sequence
-
-from dotenv import load_dotenv
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, TypeVar
 
 from codex_audio.boundary.candidates import BoundaryCandidate
-from codex_audio.clipper.ffmpeg import clip_segments
+from codex_audio.cache import (
+    AUDIO_EMBEDDINGS,
+    BOUNDARY_CANDIDATES,
+    DEFAULT_CACHE_MAX_BYTES,
+    FRAME_FEATURES,
+    JSON,
+    TEXT_EMBEDDINGS,
+    TRANSCRIPTION,
+    VAD_SEGMENTS,
+    ArtifactCache,
+    ArtifactCodec,
+    cache_key,
+    file_digest,
+)
+from codex_audio.checkpoints import CHECKPOINT_DIRNAME, StageLedger
+from codex_audio.clipper.ffmpeg import clip_segments, clip_segments_single_pass
+from codex_audio.clipper.native import clip_segments_native
+from codex_audio.clipper.virtual import plan_virtual_clips
 from codex_audio.config.station import StationConfig, load_station_config
-from codex_audio.features.embeddings import AudioEmbedding, get_audio_embeddings
-from codex_audio.features.vad import VadSegment, run_vad
-from codex_audio.ingest import AudioMetadata, load_and_normalize_audio
+from codex_audio.features.embeddings import (
+    AUDIO_EMBEDDING_MODES,
+    AudioEmbedding,
+    get_audio_embeddings,
+    get_frame_features,
+)
+from codex_audio.features.silence import SilenceMap
+from codex_audio.features.spectrogram import DEFAULT_FRAME_S
+from codex_audio.features.vad import VadSegment, VadTimeline, run_vad
+from codex_audio.ingest import (
+    AudioBuffer,
+    AudioMetadata,
+    load_audio_buffer,
+    normalized_wav_path,
+    stream_audio_buffer,
+)
 from codex_audio.segmentation import (
     ChangePoint,
+    SELECTION_MODES,
     RefinementParams,
     SegmentPlan,
     build_segments,
     compute_change_points,
     from_vad,
     refine_chunk_segments,
+    refine_global_segments,
 )
 from codex_audio.segmentation.selection import SegmentConstraint
+from codex_audio.stages import DEFAULT_MAX_WORKERS, StageGraph, StageTiming
+from codex_audio.streaming import DEFAULT_UPDATE_S, RollingSegmenter
 from codex_audio.text_features import TextChunk, build_text_chunks, detect_topic_boundaries
 from codex_audio.text_features.embeddings import DEFAULT_EMBED_MODEL, ChunkEmbedding, embed_chunks
+from codex_audio.text_features.topic_segments import DEFAULT_LLM_CONCURRENCY
 from codex_audio.transcription import (
+    QuoteIndex,
     TranscriptWord,
     TranscriptionOutput,
     match_quote_to_timestamps,
     refine_range_with_silence,
     transcribe_audio,
+    transcribe_chunked,
 )
-from codex_audio.utils import get_logger
-
-load_dotenv()
+from codex_audio.transcription.chunked import DEFAULT_TRANSCRIPTION_WORKERS
+from codex_audio.transcription.store import TranscriptStore, audio_digest, transcript_key
+from codex_audio.utils import StageMetrics, StageProfiler, get_logger
+from codex_audio.utils.clients import ClientCache
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
 DEFAULT_AUDIO_WINDOW_S = 5.0
 DEFAULT_AUDIO_HOP_RATIO = 0.5
 DEFAULT_TEXT_CHUNK_S = 5.0
@@ -48,6 +89,13 @@ DEFAULT_CANDIDATE_MIN_SCORE = 0.8
 DEFAULT_HARD_MIN_SCORE = 1.2
 DEFAULT_SNAP_WINDOW_S = 1.0
 DEFAULT_SMOOTHING_WINDOW = 1
+# "ffmpeg" runs one process per clip, "ffmpeg_single" cuts every clip in one pass,
+# "native" slices the normalized PCM in process and "virtual" writes no clips, only
+# the offsets of each story inside the normalized WAV.
+CLIP_BACKENDS = ("ffmpeg", "ffmpeg_single", "native", "virtual")
+DEFAULT_WINDOW_OVERLAP_S = 300.0
+# Label of a cut forced at a window seam because one story outlasted the window.
+WINDOW_SEAM_LABEL = "window_seam"
 
 
 @dataclass
@@ -64,6 +112,21 @@ class PipelineConfig:
     transcription_language: str = "en-CA"
     transcription_key: Optional[str] = None
     transcription_region: Optional[str] = None
+    write_normalized_wav: bool = True
+    streaming_ingest: bool = False
+    cache_enabled: bool = False
+    cache_max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES
+    max_stage_workers: int = DEFAULT_MAX_WORKERS
+    transcription_chunk_s: Optional[float] = None
+    transcription_workers: int = DEFAULT_TRANSCRIPTION_WORKERS
+    transcript_store: Optional[Path] = None
+    clip_backend: str = "ffmpeg"
+    trace_path: Optional[Path] = None
+    profile_dir: Optional[Path] = None
+    window_s: Optional[float] = None
+    window_overlap_s: float = DEFAULT_WINDOW_OVERLAP_S
+    checkpoints_enabled: bool = False
+    resume: bool = False
 
     def resolve_station_config(self) -> StationConfig:
         if self.config_path:
@@ -80,6 +143,31 @@ class PipelineResult:
     metadata: Optional[AudioMetadata] = None
     clip_paths: List[Path] = field(default_factory=list)
     transcript_path: Optional[Path] = None
+    stage_timings: List[StageTiming] = field(default_factory=list)
+    metrics: List[StageMetrics] = field(default_factory=list)
+    windows: List["WindowSummary"] = field(default_factory=list)
+    failed_stages: List[str] = field(default_factory=list)
+    resumed_stages: List[str] = field(default_factory=list)
+
+
+@dataclass
+class WindowSummary:
+    """One block of a windowed run and the part of it that was committed."""
+
+    index: int
+    start_s: float
+    end_s: float
+    committed_end_s: float
+    segments: int
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "start": round(self.start_s, 3),
+            "end": round(self.end_s, 3),
+            "committed_end": round(self.committed_end_s, 3),
+            "segments": self.segments,
+        }
 
 
 class StorySegmentationPipeline:
@@ -91,6 +179,11 @@ class StorySegmentationPipeline:
         self._llm_segmentation_enabled = bool(text_cfg.get("llm_segmentation"))
         self._llm_model = text_cfg.get("llm_model")
         self._llm_prompt = text_cfg.get("llm_prompt")
+        self._transcript_store = (
+            TranscriptStore(config.transcript_store) if config.transcript_store else None
+        )
+        # SDK clients outlive a run, so a warm pipeline keeps its connections.
+        self._clients = ClientCache()
         logger.debug(
             "Initialized pipeline",
             extra={"station": self.station_config.name, "sample_rate": self.station_config.sample_rate},
@@ -100,134 +193,697 @@ class StorySegmentationPipeline:
         output_dir.mkdir(parents=True, exist_ok=True)
 
         work_dir = self.config.working_dir or (output_dir / "work")
-        metadata, normalized_path = load_and_normalize_audio(
-            audio_path, work_dir=work_dir, target_sample_rate=self.config.sample_rate
-        )
-
-        vad_segments = run_vad(
-            normalized_path,
-            aggressiveness=self.config.vad_aggressiveness,
-            frame_duration_ms=self.config.vad_frame_duration_ms,
-        )
-
-        boundary_candidates = from_vad(
-            vad_segments,
-            min_silence_s=self.config.min_silence_s,
-        )
-        chunk_plans = build_segments(
-            boundary_candidates,
-            duration_s=metadata.duration_s,
-            min_segment_s=self.config.min_segment_s,
-        )
-
-        audio_embeddings = self._compute_audio_embeddings(normalized_path)
-
-        transcription: Optional[TranscriptionOutput] = None
-        if self.config.transcription_enabled:
-            transcription = self._run_transcription(normalized_path)
-
-        text_chunks = self._build_text_chunks(transcription.words) if transcription else []
-        text_embeddings = self._build_text_embeddings(text_chunks)
-
-        transcript_words = transcription.words if transcription else None
-        llm_candidates: List[BoundaryCandidate] = []
-        if self._llm_segmentation_enabled and transcription and transcription.words:
-            llm_candidates = self._generate_llm_candidates(transcription.words, audio_path=normalized_path)
-
-        change_kwargs = self._change_point_kwargs()
-        change_points = compute_change_points(
-            audio_embeddings=audio_embeddings,
-            text_embeddings=text_embeddings or None,
-            vad_segments=vad_segments,
-            diarization_segments=None,
-            transcript_words=transcript_words,
-            **change_kwargs,
-        )
+        cache = self._open_cache(work_dir)
+        ledger = self._open_ledger(work_dir, audio_path)
+        keys = self._artifact_keys(audio_path) if cache or ledger.root is not None else {}
+        store = self._transcript_store
+        store_lookups = (store.hits, store.misses) if store else (0, 0)
+        profiler = StageProfiler(profile_dir=self.config.profile_dir)
+        with profiler.stage("ingest") as record:
+            metadata, audio = self._load_audio(
+                audio_path, work_dir, cache=cache, cache_key=keys.get("audio"), ledger=ledger
+            )
+            record.items = audio.num_samples
 
-        segment_plans = self._refine_chunks(
-            chunk_plans=chunk_plans,
-            change_points=change_points,
-            vad_segments=vad_segments,
-            transcript_words=transcript_words,
-            extra_candidates=llm_candidates,
-        )
+        windows: List[WindowSummary] = []
+        if self.config.window_s and audio.duration_s > self.config.window_s:
+            segment_plans, transcription, timings, windows = self._segment_windowed(
+                audio, metadata, work_dir, cache, keys, profiler=profiler, ledger=ledger
+            )
+        else:
+            graph = self._feature_graph(
+                audio, metadata, work_dir, cache, keys, profiler=profiler, ledger=ledger
+            )
+            features = graph.run(max_workers=self.config.max_stage_workers, profiler=profiler)
+            segment_plans, transcription = self._segment_features(
+                features, duration_s=metadata.duration_s, profiler=profiler
+            )
+            timings = features.timings
 
         segment_ranges = [(plan.start_s, plan.end_s) for plan in segment_plans]
-        clip_dir = output_dir / "clips"
-        clip_paths = clip_segments(normalized_path, segment_ranges, clip_dir)
-
-        transcription_payload: Optional[dict[str, Any]] = None
-        transcript_path: Optional[Path] = None
-        if transcription:
-            transcription_payload = transcription.to_payload()
-            transcript_path = output_dir / "transcript.json"
-            transcript_path.write_text(json.dumps(transcription_payload, indent=2))
-
-        segments_payload: List[dict[str, Any]] = []
-        for idx, plan in enumerate(segment_plans):
-            clip_path = clip_paths[idx] if idx < len(clip_paths) else None
-            segments_payload.append(
-                {
-                    "start": plan.start_s,
-                    "end": plan.end_s,
-                    "label": plan.label,
-                    "clip_path": str(clip_path) if clip_path else None,
-                }
+        with profiler.stage("clipping") as record:
+            if self.config.clip_backend == "virtual":
+                audio = self._pin_normalized_wav(audio, normalized_wav_path(audio_path, work_dir))
+            virtual_clips = plan_virtual_clips(audio, segment_ranges)
+            clip_dir = output_dir / "clips"
+            clip_paths = self._write_clips(
+                audio, segment_ranges, clip_dir, stem=audio_path.stem
             )
+            record.items = len(clip_paths)
 
+        failed_stages = ledger.failed()
         manifest_path = output_dir / "segments.json"
-        manifest_payload = {
-            "audio": str(audio_path),
-            "normalized_audio": str(normalized_path),
-            "segments": segments_payload,
-            "metadata": {
-                "duration_s": metadata.duration_s,
-                "sample_rate": metadata.sample_rate,
-                "channels": metadata.channels,
-            },
-            "transcript": transcription_payload,
-            "transcript_path": str(transcript_path) if transcript_path else None,
-        }
-        manifest_path.write_text(json.dumps(manifest_payload, indent=2))
+        with profiler.stage("manifest") as record:
+            transcription_payload: Optional[dict[str, Any]] = None
+            transcript_path: Optional[Path] = None
+            if transcription:
+                transcription_payload = transcription.to_payload()
+                transcript_path = output_dir / "transcript.json"
+                transcript_path.write_text(json.dumps(transcription_payload, indent=2))
+
+            segments_payload: List[dict[str, Any]] = []
+            for idx, plan in enumerate(segment_plans):
+                clip_path = clip_paths[idx] if idx < len(clip_paths) else None
+                segments_payload.append(
+                    {
+                        "start": plan.start_s,
+                        "end": plan.end_s,
+                        "label": plan.label,
+                        "clip_path": str(clip_path) if clip_path else None,
+                        **virtual_clips[idx].to_payload(),
+                    }
+                )
+
+            manifest_payload = {
+                "audio": str(audio_path),
+                "normalized_audio": str(audio.path) if audio.path else None,
+                "segments": segments_payload,
+                "metadata": {
+                    "duration_s": metadata.duration_s,
+                    "sample_rate": metadata.sample_rate,
+                    "channels": metadata.channels,
+                },
+                "transcript": transcription_payload,
+                "transcript_path": str(transcript_path) if transcript_path else None,
+                "stage_timings": [timing.to_payload() for timing in timings],
+                "failed_stages": failed_stages,
+            }
+            if windows:
+                manifest_payload["windows"] = [window.to_payload() for window in windows]
+            record.items = len(segments_payload)
+        # The manifest carries the metrics up to here; the write that encodes it
+        # is timed as its own stage in the trace, the log and PipelineResult.metrics.
+        manifest_payload["metrics"] = profiler.to_payload()
+        with profiler.stage("manifest_write") as write_record:
+            manifest_path.write_text(json.dumps(manifest_payload, indent=2))
+        if self.config.trace_path is not None:
+            profiler.write_chrome_trace(self.config.trace_path)
+        if not failed_stages:
+            ledger.discard()
         logger.info(
             "Pipeline executed",
             extra={
                 "audio": str(audio_path),
-                "normalized": str(normalized_path),
+                "normalized": str(audio.path) if audio.path else None,
                 "segments": len(segment_plans),
                 "clips": len(clip_paths),
                 "out": str(manifest_path),
                 "transcript": bool(transcription_payload),
+                "cache_hits": cache.hits if cache else 0,
+                "cache_misses": cache.misses if cache else 0,
+                "transcript_store_hits": store.hits - store_lookups[0] if store else 0,
+                "transcript_store_misses": store.misses - store_lookups[1] if store else 0,
+                "resumed_stages": len(ledger.resumed),
+                "failed_stages": failed_stages,
+                "manifest_write_s": round(write_record.wall_s, 6),
             },
         )
         return PipelineResult(
             segments=segments_payload,
             output_dir=output_dir,
             manifest_path=manifest_path,
-            normalized_audio=normalized_path,
+            normalized_audio=audio.path,
             metadata=metadata,
             clip_paths=clip_paths,
             transcript_path=transcript_path,
+            stage_timings=timings,
+            metrics=list(profiler.metrics),
+            windows=windows,
+            failed_stages=failed_stages,
+            resumed_stages=list(ledger.resumed),
         )
 
-    def _run_transcription(self, audio_path: Path) -> Optional[TranscriptionOutput]:
-        options = self._transcription_options()
-        try:
-            return transcribe_audio(
+    def _segment_features(
+        self, features: Mapping[str, Any], *, duration_s: float, profiler: StageProfiler
+    ) -> tuple[List[SegmentPlan], Optional[TranscriptionOutput]]:
+        """Change points and refinement over the outputs of :meth:`_feature_graph`."""
+
+        vad_segments: List[VadSegment] = features["vad"]
+        vad_timeline = VadTimeline.from_segments(vad_segments)
+        audio_embeddings: Sequence[AudioEmbedding] = features["audio_embeddings"]
+        transcription: Optional[TranscriptionOutput] = features.get("transcription")
+        text_embeddings: Sequence[ChunkEmbedding] = features.get("text_embeddings", [])
+        llm_candidates: List[BoundaryCandidate] = features.get("llm_candidates", [])
+        transcript_words = transcription.words if transcription else None
+
+        with profiler.stage("change_points") as record:
+            change_kwargs = self._change_point_kwargs()
+            change_points = compute_change_points(
+                audio_embeddings=audio_embeddings,
+                text_embeddings=text_embeddings or None,
+                vad_segments=vad_timeline,
+                diarization_segments=None,
+                transcript_words=transcript_words,
+                **change_kwargs,
+            )
+            record.items = len(change_points)
+
+        with profiler.stage("refinement") as record:
+            boundary_candidates = from_vad(
+                vad_segments,
+                min_silence_s=self.config.min_silence_s,
+            )
+            chunk_plans = build_segments(
+                boundary_candidates,
+                duration_s=duration_s,
+                min_segment_s=self.config.min_segment_s,
+            )
+            segment_plans = self._refine_chunks(
+                chunk_plans=chunk_plans,
+                change_points=change_points,
+                vad_segments=vad_timeline,
+                transcript_words=transcript_words,
+                extra_candidates=llm_candidates,
+            )
+            record.items = len(segment_plans)
+        return segment_plans, transcription
+
+    def _segment_windowed(
+        self,
+        audio: AudioBuffer,
+        metadata: AudioMetadata,
+        work_dir: Path,
+        cache: ArtifactCache | None,
+        keys: Mapping[str, str],
+        *,
+        profiler: StageProfiler,
+        ledger: StageLedger | None = None,
+    ) -> tuple[
+        List[SegmentPlan], Optional[TranscriptionOutput], List[StageTiming], List[WindowSummary]
+    ]:
+        """Segment ``audio`` block by block so features never cover more than ``window_s``.
+
+        Each window starts at the last committed boundary and runs the whole
+        feature graph, change points and refinement on its slice of the
+        memory-mapped WAV. Stories ending before the last ``window_overlap_s``
+        seconds are committed; the overlap is left to the next window, which
+        sees both sides of it, and its features are dropped. A story longer
+        than ``window_s - window_overlap_s`` is cut at the seam. Only committed
+        segments, transcript words and timings outlive a window.
+        """
+
+        window_s = float(self.config.window_s or 0.0)
+        overlap_s = self.config.window_overlap_s
+        if not 0.0 <= overlap_s < window_s:
+            raise ValueError("window_overlap_s must be at least 0 and shorter than window_s")
+
+        total_s = audio.duration_s
+        plans: List[SegmentPlan] = []
+        words: List[TranscriptWord] = []
+        transcript_info: Optional[TranscriptionOutput] = None
+        timings: List[StageTiming] = []
+        windows: List[WindowSummary] = []
+        cursor = 0.0
+        while True:
+            index = len(windows)
+            end = min(total_s, cursor + window_s)
+            final = end >= total_s
+            window = audio.slice(cursor, end)
+            # Gives an on-demand transcription WAV its own name instead of the
+            # normalized WAV's, which ``audio`` still maps.
+            window_meta = replace(
+                metadata,
+                source_path=work_dir / f"{metadata.source_path.stem}_window_{index:03d}",
+                duration_s=window.duration_s,
+            )
+            window_keys = {
+                name: cache_key(key, round(cursor, 3), round(end, 3))
+                for name, key in keys.items()
+            }
+            graph = self._feature_graph(
+                window,
+                window_meta,
+                work_dir,
+                cache,
+                window_keys,
+                profiler=profiler,
+                ledger=ledger.scoped(f"window_{index:03d}") if ledger else None,
+            )
+            features = graph.run(max_workers=self.config.max_stage_workers, profiler=profiler)
+            window_plans, transcription = self._segment_features(
+                features, duration_s=window.duration_s, profiler=profiler
+            )
+            timings.extend(features.timings)
+
+            if final:
+                committed = window_plans
+            else:
+                seam = window.duration_s - overlap_s
+                committed = [plan for plan in window_plans if plan.end_s <= seam]
+                if not committed:
+                    committed = [SegmentPlan(0.0, seam, WINDOW_SEAM_LABEL)]
+            committed_end = window.duration_s if final else committed[-1].end_s
+            plans.extend(
+                SegmentPlan(cursor + plan.start_s, cursor + plan.end_s, plan.label)
+                for plan in committed
+            )
+            if transcription:
+                transcript_info = transcript_info or transcription
+                words.extend(
+                    replace(word, start_s=cursor + word.start_s, end_s=cursor + word.end_s)
+                    for word in transcription.words
+                    if final or word.start_s < committed_end
+                )
+            if window.path is not None:
+                window.path.unlink(missing_ok=True)
+
+            windows.append(
+                WindowSummary(
+                    index=index,
+                    start_s=cursor,
+                    end_s=end,
+                    committed_end_s=total_s if final else cursor + committed_end,
+                    segments=len(committed),
+                )
+            )
+            logger.info("Window segmented", extra=windows[-1].to_payload())
+            if final:
+                break
+            cursor += committed_end
+
+        if plans:
+            plans[-1] = SegmentPlan(plans[-1].start_s, total_s, plans[-1].label)
+        transcription_out = (
+            TranscriptionOutput(
+                words=words, model=transcript_info.model, language=transcript_info.language
+            )
+            if transcript_info
+            else None
+        )
+        return plans, transcription_out, timings, windows
+
+    def rolling_segmenter(
+        self,
+        *,
+        clip_dir: Optional[Path] = None,
+        clip_stem: str = "stream",
+        update_s: float = DEFAULT_UPDATE_S,
+    ) -> RollingSegmenter:
+        """A :class:`RollingSegmenter` using this station's heuristics, for live streams.
+
+        Only audio features are used; transcription and LLM candidates need the
+        whole recording and are not part of the rolling mode.
+        """
+
+        window_s, hop_ratio = self._audio_embedding_options()
+        return RollingSegmenter(
+            sample_rate=self.config.sample_rate,
+            params=self._refinement_params,
+            change_kwargs=self._change_point_kwargs(),
+            window_s=window_s,
+            hop_ratio=hop_ratio,
+            vad_aggressiveness=self.config.vad_aggressiveness,
+            vad_frame_duration_ms=self.config.vad_frame_duration_ms,
+            update_s=update_s,
+            clip_dir=clip_dir,
+            clip_stem=clip_stem,
+        )
+
+    def _feature_graph(
+        self,
+        audio: AudioBuffer,
+        metadata: AudioMetadata,
+        work_dir: Path,
+        cache: ArtifactCache | None,
+        keys: Mapping[str, str],
+        *,
+        profiler: StageProfiler | None = None,
+        ledger: StageLedger | None = None,
+    ) -> StageGraph:
+        """Audio features and the transcription chain, as independent tracks.
+
+        VAD and audio embeddings are CPU-bound; transcription, text embeddings and
+        LLM segmentation mostly wait on Azure. Running the tracks side by side
+        brings wall-clock down to roughly the slower of the two. Outputs are
+        checkpointed in ``ledger``; the Azure-backed stages degrade to empty
+        results when they fail, and the ledger marks them for ``--resume``.
+        """
+
+        profiler = profiler or StageProfiler()
+        graph = StageGraph()
+        graph.add(
+            "vad",
+            lambda: self._checkpointed(
+                ledger,
+                cache,
+                "vad",
+                keys.get("vad"),
+                VAD_SEGMENTS,
+                lambda: run_vad(
+                    audio,
+                    aggressiveness=self.config.vad_aggressiveness,
+                    frame_duration_ms=self.config.vad_frame_duration_ms,
+                ),
+            ),
+        )
+        graph.add(
+            "audio_embeddings",
+            lambda: self._checkpointed(
+                ledger,
+                cache,
+                "audio_embeddings",
+                keys.get("audio_embeddings"),
+                AUDIO_EMBEDDINGS,
+                lambda: self._compute_audio_embeddings(
+                    audio, cache=cache, frames_key=keys.get("frame_features")
+                ),
+            ),
+        )
+        if not self.config.transcription_enabled:
+            return graph
+
+        if self.config.transcription_chunk_s:
+            # Chunked sessions are cut at VAD silences, so wait for the VAD stage.
+            graph.add(
+                "transcription",
+                lambda vad_segments: self._checkpointed(
+                    ledger,
+                    cache,
+                    "transcription",
+                    keys.get("transcription"),
+                    TRANSCRIPTION,
+                    lambda: self._run_chunked_transcription(audio, vad_segments, work_dir),
+                    retryable=True,
+                ),
+                deps=("vad",),
+            )
+        else:
+            graph.add(
+                "transcription",
+                lambda: self._checkpointed(
+                    ledger,
+                    cache,
+                    "transcription",
+                    keys.get("transcription"),
+                    TRANSCRIPTION,
+                    lambda: self._transcribe_buffer(audio, metadata, work_dir),
+                    retryable=True,
+                ),
+            )
+
+        def text_embeddings(transcription: Optional[TranscriptionOutput]) -> Any:
+            with profiler.stage("text_chunks") as record:
+                chunks = self._build_text_chunks(transcription.words) if transcription else []
+                record.items = len(chunks)
+            return self._checkpointed(
+                ledger,
+                cache,
+                "text_embeddings",
+                keys.get("text_embeddings") if chunks else None,
+                TEXT_EMBEDDINGS,
+                lambda: self._build_text_embeddings(chunks),
+                retryable=True,
+            )
+
+        def llm_candidates(transcription: Optional[TranscriptionOutput]) -> List[BoundaryCandidate]:
+            if not transcription or not transcription.words:
+                return []
+            return self._generate_llm_candidates(
+                transcription.words,
+                audio=audio,
+                cache=cache,
+                cache_key=keys.get("llm"),
+                profiler=profiler,
+                ledger=ledger,
+            )
+
+        graph.add("text_embeddings", text_embeddings, deps=("transcription",))
+        graph.add("llm_candidates", llm_candidates, deps=("transcription",))
+        return graph
+
+    def _load_audio(
+        self,
+        audio_path: Path,
+        work_dir: Path,
+        *,
+        cache: ArtifactCache | None = None,
+        cache_key: str | None = None,
+        ledger: StageLedger | None = None,
+    ) -> tuple[AudioMetadata, AudioBuffer]:
+        source_path = audio_path.expanduser().resolve()
+        if ledger is not None and cache_key is not None:
+            checkpoint = ledger.load("ingest", cache_key, JSON)
+            normalized = Path(checkpoint.pop("normalized_audio")) if checkpoint else None
+            if normalized is not None and normalized.exists():
+                metadata = AudioMetadata(source_path=source_path, **checkpoint)
+                return metadata, AudioBuffer.from_wav(normalized)
+
+        if cache is not None and cache_key is not None:
+            cached_wav = cache.lookup(cache_key, ".wav")
+            cached_meta = cache.get(cache_key, _AUDIO_METADATA)
+            if cached_wav is not None and cached_meta is not None:
+                metadata = AudioMetadata(source_path=source_path, **cached_meta)
+                return metadata, AudioBuffer.from_wav(cached_wav)
+
+        if self._ingest_mode() == "ffmpeg_stream":
+            metadata, audio = stream_audio_buffer(
+                audio_path, work_dir=work_dir, target_sample_rate=self.config.sample_rate
+            )
+        else:
+            metadata, audio = load_audio_buffer(
                 audio_path,
+                work_dir=work_dir,
+                target_sample_rate=self.config.sample_rate,
+                write_wav=self.config.write_normalized_wav,
+            )
+
+        if cache is not None and cache_key is not None:
+            if audio.path is None:
+                audio.write_wav(cache.path_for(cache_key, ".wav"))
+                cache.evict(keep=audio.path)
+            else:
+                cache.store_file(cache_key, ".wav", audio.path)
+            meta_payload = asdict(metadata)
+            meta_payload.pop("source_path")
+            cache.put(cache_key, meta_payload, _AUDIO_METADATA)
+        if ledger is not None and cache_key is not None and audio.path is not None:
+            # The normalized WAV is the checkpoint; the ledger keeps its location.
+            checkpoint = asdict(metadata)
+            checkpoint.pop("source_path")
+            checkpoint["normalized_audio"] = str(audio.path)
+            ledger.complete("ingest", cache_key, checkpoint, JSON)
+        return metadata, audio
+
+    @staticmethod
+    def _pin_normalized_wav(audio: AudioBuffer, target: Path) -> AudioBuffer:
+        """Keep the WAV that virtual clips point into out of the cache's reach.
+
+        A buffer served from ``--cache`` (or written there on a miss) lives in
+        ``work/cache``; it is copied, not hard-linked, because ingest rewrites
+        the working WAV in place.
+        """
+
+        if audio.path is None:
+            audio.write_wav(target)
+            return audio
+        if audio.path == target.expanduser().resolve():
+            return audio
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".tmp-{target.name}")
+        shutil.copyfile(audio.path, tmp_path)
+        os.replace(tmp_path, target)
+        return AudioBuffer.from_wav(target)
+
+    def _open_cache(self, work_dir: Path) -> ArtifactCache | None:
+        if not self.config.cache_enabled:
+            return None
+        return ArtifactCache(work_dir / "cache", max_bytes=self.config.cache_max_bytes)
+
+    def _open_ledger(self, work_dir: Path, audio_path: Path) -> StageLedger:
+        """Checkpoints for ``--checkpoint``/``--resume`` runs, else an in-memory ledger.
+
+        The checkpoint directory is named by the stem and the resolved source
+        path, so same-named recordings sharing a working_dir keep apart.
+        """
+
+        if not (self.config.checkpoints_enabled or self.config.resume):
+            return StageLedger()
+        source = str(audio_path.expanduser().resolve())
+        root = work_dir / CHECKPOINT_DIRNAME / f"{audio_path.stem}-{cache_key(source)[:12]}"
+        return StageLedger(root, resume=self.config.resume)
+
+    def _artifact_keys(self, audio_path: Path) -> Dict[str, str]:
+        """Cache keys per stage, each chained from the keys of its inputs.
+
+        Only the settings a stage reads go into its key, so tuning a refinement
+        heuristic reuses every cached feature and re-runs just segmentation.
+        """
+
+        source_digest = file_digest(audio_path.expanduser().resolve())
+        audio_key = cache_key(
+            "normalized_audio", source_digest, self.config.sample_rate, self._ingest_mode()
+        )
+        window_s, hop_ratio = self._audio_embedding_options()
+        chunk_size, overlap = self._text_chunk_options()
+        text_cfg = self.station_config.text or {}
+        transcript_key = cache_key(
+            "transcription",
+            audio_key,
+            self.config.transcription_language,
+            self._transcription_options(),
+            self.config.transcription_chunk_s,
+        )
+        return {
+            "audio": audio_key,
+            "vad": cache_key(
+                "vad",
+                audio_key,
+                self.config.vad_aggressiveness,
+                self.config.vad_frame_duration_ms,
+            ),
+            # Window and hop only re-slice the frames, so sweeping them reuses this.
+            "frame_features": cache_key("frame_features", audio_key, DEFAULT_FRAME_S),
+            "audio_embeddings": cache_key(
+                "audio_embeddings",
+                audio_key,
+                window_s,
+                hop_ratio,
+                self._audio_embedding_mode(),
+            ),
+            "transcription": transcript_key,
+            "text_embeddings": cache_key(
+                "text_embeddings",
+                transcript_key,
+                chunk_size,
+                overlap,
+                text_cfg.get("embedding_model") or DEFAULT_EMBED_MODEL,
+            ),
+            "llm": cache_key("llm", transcript_key, self._llm_model, self._llm_prompt),
+        }
+
+    def _checkpointed(
+        self,
+        ledger: StageLedger | None,
+        cache: ArtifactCache | None,
+        stage: str,
+        key: str | None,
+        codec: ArtifactCodec[T],
+        compute: Callable[[], T],
+        *,
+        retryable: bool = False,
+    ) -> Optional[T]:
+        """:meth:`_cached` behind the run's checkpoints, recording how the stage ended.
+
+        A ``retryable`` stage calls a remote service: when it raises, the run
+        goes on without its output (``None``) and the ledger marks it failed.
+        """
+
+        if ledger is not None and key is not None:
+            stored = ledger.load(stage, key, codec)
+            if stored is not None:
+                return stored
+        try:
+            value = self._cached(cache, key, codec, compute)
+        except Exception as exc:
+            if ledger is not None:
+                ledger.fail(stage, key, exc)
+            if not retryable:
+                raise
+            logger.warning("Stage failed", extra={"stage": stage, "error": str(exc)})
+            return None
+        if ledger is not None and key is not None and value:
+            ledger.complete(stage, key, value, codec)
+        return value
+
+    @staticmethod
+    def _cached(
+        cache: ArtifactCache | None,
+        key: str | None,
+        codec: ArtifactCodec[T],
+        compute: Callable[[], T],
+    ) -> T:
+        if cache is None or key is None:
+            return compute()
+        cached = cache.get(key, codec)
+        if cached is not None:
+            return cached
+        value = compute()
+        if value:
+            # Failed stages degrade to empty results; those must not be cached.
+            cache.put(key, value, codec)
+        return value
+
+    def _transcribe_buffer(
+        self, audio: AudioBuffer, metadata: AudioMetadata, work_dir: Path
+    ) -> TranscriptionOutput:
+        if audio.path is None:
+            # Azure STT reads from a file, so materialize the WAV only on demand.
+            audio.write_wav(normalized_wav_path(metadata.source_path, work_dir))
+        return self._run_transcription(audio)
+
+    def _run_chunked_transcription(
+        self, audio: AudioBuffer, vad_segments: Sequence[VadSegment], work_dir: Path
+    ) -> TranscriptionOutput:
+        work_dir.mkdir(parents=True, exist_ok=True)
+        return self._stored_transcription(
+            audio,
+            lambda: transcribe_chunked(
+                audio,
+                vad_segments,
+                target_chunk_s=float(self.config.transcription_chunk_s or 0.0),
+                max_workers=self.config.transcription_workers,
+                work_dir=work_dir,
+                key=self.config.transcription_key,
+                region=self.config.transcription_region,
+                language=self.config.transcription_language,
+                clients=self._clients,
+                **self._transcription_options(),
+            ),
+        )
+
+    def _run_transcription(self, audio: AudioBuffer) -> TranscriptionOutput:
+        options = self._transcription_options()
+        return self._stored_transcription(
+            audio,
+            lambda: transcribe_audio(
+                audio,
                 key=self.config.transcription_key,
                 region=self.config.transcription_region,
                 language=self.config.transcription_language,
+                clients=self._clients,
                 **options,
-            )
-        except Exception as exc:  # pragma: no cover - logging path
-            logger.warning("Transcription failed", extra={"error": str(exc)})
-        return None
+            ),
+        )
 
-    def _compute_audio_embeddings(self, audio_path: Path) -> List[AudioEmbedding]:
+    def _stored_transcription(
+        self, audio: AudioBuffer, transcribe: Callable[[], TranscriptionOutput]
+    ) -> TranscriptionOutput:
+        """Serve a transcript from the persistent store, transcribing only on a miss."""
+
+        if self._transcript_store is None:
+            return transcribe()
+        key = transcript_key(
+            audio_digest(audio),
+            language=self.config.transcription_language,
+            **self._transcription_options(),
+        )
+        stored = self._transcript_store.get(key)
+        if stored is not None:
+            logger.info("Transcript store hit", extra={"key": key[:12]})
+            return stored
+        transcription = transcribe()
+        if transcription.words:
+            self._transcript_store.put(key, transcription)
+        return transcription
+
+    def _compute_audio_embeddings(
+        self,
+        audio: AudioBuffer,
+        *,
+        cache: ArtifactCache | None = None,
+        frames_key: str | None = None,
+    ) -> Sequence[AudioEmbedding]:
         window_s, hop_ratio = self._audio_embedding_options()
+        mode = self._audio_embedding_mode()
         try:
-            return get_audio_embeddings(audio_path, window_s=window_s, hop_ratio=hop_ratio)
+            frames = None
+            if mode == "spectrogram":
+                frames = self._cached(
+                    cache, frames_key, FRAME_FEATURES, lambda: get_frame_features(audio)
+                )
+            return get_audio_embeddings(
+                audio, window_s=window_s, hop_ratio=hop_ratio, mode=mode, frames=frames
+            )
         except Exception as exc:  # pragma: no cover - logging path
             logger.warning("Audio embeddings failed", extra={"error": str(exc)})
             return []
@@ -242,7 +898,7 @@ class StorySegmentationPipeline:
             logger.warning("Failed to build text chunks", extra={"error": str(exc)})
             return []
 
-    def _build_text_embeddings(self, chunks: Sequence[TextChunk]) -> List[ChunkEmbedding]:
+    def _build_text_embeddings(self, chunks: Sequence[TextChunk]) -> Sequence[ChunkEmbedding]:
         if not chunks:
             return []
         text_cfg = self.station_config.text or {}
@@ -250,70 +906,111 @@ class StorySegmentationPipeline:
         api_version = text_cfg.get("embedding_api_version")
         key = text_cfg.get("embedding_key")
         endpoint = text_cfg.get("embedding_endpoint")
-        try:
-            return embed_chunks(
-                chunks,
-                model=model,
-                api_version=api_version,
-                key=key,
-                endpoint=endpoint,
-            )
-        except Exception as exc:  # pragma: no cover - logging path
-            logger.warning("Text embeddings failed", extra={"error": str(exc)})
-            return []
+        return embed_chunks(
+            chunks,
+            model=model,
+            api_version=api_version,
+            key=key,
+            endpoint=endpoint,
+            clients=self._clients,
+        )
 
     def _generate_llm_candidates(
         self,
         words: Sequence[TranscriptWord],
-        audio_path: Path | None = None,
+        audio: AudioBuffer | Path | None = None,
+        *,
+        cache: ArtifactCache | None = None,
+        cache_key: str | None = None,
+        profiler: StageProfiler | None = None,
+        ledger: StageLedger | None = None,
     ) -> List[BoundaryCandidate]:
         if not self._llm_segmentation_enabled or not words:
             return []
-        try:
-            candidates = detect_topic_boundaries(
-                words,
-                model=self._llm_model,
-                system_prompt=self._llm_prompt,
+        profiler = profiler or StageProfiler()
+        with profiler.stage("llm_windows") as record:
+            candidates = self._checkpointed(
+                ledger,
+                cache,
+                "llm",
+                cache_key,
+                BOUNDARY_CANDIDATES,
+                lambda: self._detect_llm_boundaries(words),
+                retryable=True,
             )
-        except Exception as exc:  # pragma: no cover - logging path
-            logger.warning("LLM segmentation failed", extra={"error": str(exc)})
-            return []
-        return self._align_llm_candidates(
-            candidates=candidates,
-            words=words,
-            audio_path=audio_path,
-        )
+            record.items = len(candidates or [])
+        with profiler.stage("quote_alignment") as record:
+            aligned = self._align_llm_candidates(
+                candidates=candidates or [],
+                words=words,
+                audio=audio,
+            )
+            record.items = len(aligned)
+        return aligned
+
 
+    def _detect_llm_boundaries(self, words: Sequence[TranscriptWord]) -> List[BoundaryCandidate]:
+        text_cfg = self.station_config.text or {}
+        return detect_topic_boundaries(
+            words,
+            model=self._llm_model,
+            system_prompt=self._llm_prompt,
+            max_concurrency=max(
+                1, int(_first_float(text_cfg, ["llm_concurrency"], DEFAULT_LLM_CONCURRENCY))
+            ),
+            requests_per_minute=_first_optional_float(text_cfg, ["llm_requests_per_minute"]),
+            clients=self._clients,
+        )
 
     def _align_llm_candidates(
         self,
         *,
         candidates: Sequence[BoundaryCandidate],
         words: Sequence[TranscriptWord],
-        audio_path: Path | None,
+        audio: AudioBuffer | Path | None,
     ) -> List[BoundaryCandidate]:
         if not candidates:
             return []
+        index = QuoteIndex(words)
+        silence_map = self._silence_map(audio) if isinstance(audio, AudioBuffer) else None
         aligned: List[BoundaryCandidate] = []
         for candidate in candidates:
             aligned.append(
-                self._match_llm_candidate(candidate=candidate, words=words, audio_path=audio_path)
+                self._match_llm_candidate(
+                    candidate=candidate,
+                    words=words,
+                    audio=audio,
+                    index=index,
+                    silence_map=silence_map,
+                )
             )
         return aligned
 
+    @staticmethod
+    def _silence_map(audio: AudioBuffer) -> SilenceMap | None:
+        try:
+            return SilenceMap.from_buffer(audio)
+        except Exception as exc:  # pragma: no cover - falls back to per-range detection
+            logger.debug("Silence map unavailable", extra={"error": str(exc)})
+            return None
+
 
     def _match_llm_candidate(
         self,
         *,
         candidate: BoundaryCandidate,
         words: Sequence[TranscriptWord],
-        audio_path: Path | None,
+        audio: AudioBuffer | Path | None,
+        index: QuoteIndex | None = None,
+        silence_map: SilenceMap | None = None,
     ) -> BoundaryCandidate:
         quote = getattr(candidate, "quote", None)
         if not quote:
             return candidate
         try:
-            match_range = match_quote_to_timestamps(quote, words)
+            match_range = match_quote_to_timestamps(
+                quote, words, index=index, time_hint_s=candidate.time_s
+            )
         except RuntimeError as exc:  # pragma: no cover - optional dependency missing
             logger.debug("LLM quote matching unavailable", extra={"error": str(exc)})
             return candidate
@@ -321,10 +1018,10 @@ class StorySegmentationPipeline:
             return candidate
         start_ms, end_ms = match_range
         refined_start, refined_end = start_ms, end_ms
-        if audio_path:
+        if audio is not None:
             try:
                 refined_start, refined_end = refine_range_with_silence(
-                    audio_path, (start_ms, end_ms)
+                    audio, (start_ms, end_ms), silence_map=silence_map
                 )
             except Exception as exc:  # pragma: no cover - optional dependency missing
                 logger.debug("LLM quote refinement skipped", extra={"error": str(exc)})
@@ -340,6 +1037,27 @@ class StorySegmentationPipeline:
 
 
 
+    def _write_clips(
+        self,
+        audio: AudioBuffer,
+        segment_ranges: Sequence[tuple[float, float]],
+        clip_dir: Path,
+        *,
+        stem: str,
+    ) -> List[Path]:
+        """Clips named after the source recording, not the normalized or cached WAV."""
+
+        backend = self.config.clip_backend
+        if backend == "ffmpeg":
+            return clip_segments(audio, segment_ranges, clip_dir, stem=stem)
+        if backend == "ffmpeg_single":
+            return clip_segments_single_pass(audio, segment_ranges, clip_dir, stem=stem)
+        if backend == "native":
+            return clip_segments_native(audio, segment_ranges, clip_dir, stem=stem)
+        if backend == "virtual":
+            return []
+        raise ValueError(f"Unknown clip backend {backend!r}; expected one of {CLIP_BACKENDS}")
+
     def _transcription_options(self) -> dict[str, Any]:
         cfg = getattr(self.station_config, 'transcription', None) or {}
         diarization_cfg = cfg or getattr(self.station_config, 'diarization', None) or {}
@@ -368,6 +1086,22 @@ class StorySegmentationPipeline:
             hop_ratio = DEFAULT_AUDIO_HOP_RATIO
         return window_s, hop_ratio
 
+    def _ingest_mode(self) -> str:
+        """Decoder of the normalized audio; pydub and the ffmpeg pipe differ in PCM."""
+
+        if self.config.streaming_ingest or self.config.window_s:
+            # Windowed runs read slices of a memory map instead of a loaded array.
+            return "ffmpeg_stream"
+        return "pydub"
+
+    def _audio_embedding_mode(self) -> str:
+        heuristics = self.station_config.heuristics or {}
+        mode = str(heuristics.get("audio_embedding_mode") or "stft").lower()
+        if mode not in AUDIO_EMBEDDING_MODES:
+            logger.warning("Unknown audio embedding mode; using stft", extra={"mode": mode})
+            return "stft"
+        return mode
+
     def _text_chunk_options(self) -> tuple[float, float]:
         text_cfg = self.station_config.text or {}
         chunk_size = _first_float(text_cfg, ["chunk_s", "chunk_size_s"], DEFAULT_TEXT_CHUNK_S)
@@ -387,15 +1121,26 @@ class StorySegmentationPipeline:
         transcript_words: Sequence[TranscriptWord] | None,
         extra_candidates: Sequence[BoundaryCandidate] | None = None,
     ) -> List[SegmentPlan]:
+        if self._refinement_params.selection_mode == "global":
+            refined = refine_global_segments(
+                chunk_plans,
+                change_points=change_points,
+                params=self._refinement_params,
+                vad_segments=vad_segments,
+                transcript_words=transcript_words,
+                extra_candidates=extra_candidates,
+            )
+            return refined or list(chunk_plans)
+
+        extras = sorted(extra_candidates or [], key=lambda candidate: candidate.time_s)
+        extra_times = [candidate.time_s for candidate in extras]
         refined: List[SegmentPlan] = []
         for chunk in chunk_plans:
             chunk_extras = None
-            if extra_candidates:
-                chunk_extras = [
-                    candidate
-                    for candidate in extra_candidates
-                    if chunk.start_s < candidate.time_s < chunk.end_s
-                ]
+            if extras:
+                first = bisect_right(extra_times, chunk.start_s)
+                last = bisect_left(extra_times, chunk.end_s)
+                chunk_extras = extras[first:last]
             chunk_segments = refine_chunk_segments(
                 chunk.start_s,
                 chunk.end_s,
@@ -490,6 +1235,12 @@ class StorySegmentationPipeline:
                 continue
 
         constraints = SegmentConstraint(min_len=max(1.0, min_story), max_len=max_story)
+        selection_mode = str(heuristics.get("selection_mode") or "chunk").lower()
+        if selection_mode not in SELECTION_MODES:
+            logger.warning(
+                "Unknown selection mode; using chunk", extra={"mode": selection_mode}
+            )
+            selection_mode = "chunk"
         return RefinementParams(
             constraints=constraints,
             weights=weights,
@@ -497,6 +1248,7 @@ class StorySegmentationPipeline:
             hard_min_cut_score=max(0.0, hard_min),
             smoothing_window=smoothing,
             snap_window_s=max(0.0, snap_window),
+            selection_mode=selection_mode,
         )
 
     def _change_point_kwargs(self) -> Dict[str, object]:
@@ -535,6 +1287,11 @@ class StorySegmentationPipeline:
         }
 
 
+_AUDIO_METADATA: ArtifactCodec[Dict[str, Any]] = ArtifactCodec(
+    ".meta.json", JSON.dump, JSON.load
+)
+
+
 def _first_float(mapping: Mapping[str, Any], keys: Sequence[str], default: float) -> float:
     for key in keys:
         if key in mapping and mapping[key] is not None:
@@ -1,9 +1,21 @@
 ﻿"""Segmentation utilities."""
 
 from .candidates import build_boundary_candidates, from_vad
-from .change_scores import ChangePoint, compute_change_points, find_peak_candidates, smooth_scores
+from .change_scores import (
+    ChangePoint,
+    ChangePointFrame,
+    compute_change_points,
+    find_peak_candidates,
+    smooth_scores,
+)
 from .planner import SegmentPlan, build_segments
-from .refinement import DEFAULT_CHANGE_WEIGHTS, RefinementParams, refine_chunk_segments
+from .refinement import (
+    DEFAULT_CHANGE_WEIGHTS,
+    SELECTION_MODES,
+    RefinementParams,
+    refine_chunk_segments,
+    refine_global_segments,
+)
 from .selection import SegmentConstraint, select_boundaries
 
 __all__ = [
@@ -12,6 +24,7 @@ __all__ = [
     "SegmentPlan",
     "build_segments",
     "ChangePoint",
+    "ChangePointFrame",
     "compute_change_points",
     "find_peak_candidates",
     "smooth_scores",
@@ -20,5 +33,7 @@ __all__ = [
     "RefinementParams",
     "DEFAULT_CHANGE_WEIGHTS",
     "refine_chunk_segments",
+    "refine_global_segments",
+    "SELECTION_MODES",
 ]
 
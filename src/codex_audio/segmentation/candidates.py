@@ -3,9 +3,15 @@ from __future__ import annotations
 
 from typing import Iterable, List, Sequence
 
+import numpy as np
+
 from codex_audio.boundary.candidates import BoundaryCandidate
 from codex_audio.features.diarization import DiarizationSegment
-from codex_audio.features.embeddings import AudioEmbedding
+from codex_audio.features.embeddings import (
+    AudioEmbedding,
+    adjacent_cosine_similarity,
+    embedding_bounds,
+)
 from codex_audio.features.patterns import find_anchor_return_candidates
 from codex_audio.features.vad import SILENCE_LABEL, VadSegment
 from codex_audio.text_features.change_points import find_text_change_candidates
@@ -89,18 +95,19 @@ def _from_audio_embeddings(
     if threshold <= -1.0 or threshold > 1.0:
         raise ValueError("threshold must be within (-1, 1]")
 
+    similarities = adjacent_cosine_similarity(embeddings)
+    starts, ends = embedding_bounds(embeddings)
     candidates: List[BoundaryCandidate] = []
-    for left, right in zip(embeddings, embeddings[1:]):
-        similarity = _cosine_similarity(left.vector, right.vector)
-        if similarity < threshold:
-            midpoint = (left.end_s + right.start_s) / 2
-            candidates.append(
-                BoundaryCandidate(
-                    time_s=midpoint,
-                    score=AUDIO_SHIFT_SCORE,
-                    reason=f"{AUDIO_SHIFT_REASON}_{similarity:.2f}",
-                )
+    for idx in np.flatnonzero(similarities < threshold):
+        similarity = float(similarities[idx])
+        midpoint = float(ends[idx] + starts[idx + 1]) / 2
+        candidates.append(
+            BoundaryCandidate(
+                time_s=midpoint,
+                score=AUDIO_SHIFT_SCORE,
+                reason=f"{AUDIO_SHIFT_REASON}_{similarity:.2f}",
             )
+        )
     return candidates
 
 
@@ -120,13 +127,3 @@ def _merge_close_candidates(
             result.append(candidate)
     return result
 
-
-def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
-    if len(a) != len(b):
-        raise ValueError("Embedding vectors must have the same length")
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = sum(x * x for x in a) ** 0.5
-    norm_b = sum(y * y for y in b) ** 0.5
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
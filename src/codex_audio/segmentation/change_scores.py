@@ -3,13 +3,19 @@ from __future__ import annotations
 from dataclasses import dataclass
 from bisect import bisect_left
 import re
-from typing import Iterable, List, Mapping, Sequence, Pattern
+from typing import Iterable, Iterator, List, Mapping, Sequence, Pattern, overload
+
+import numpy as np
 
 from codex_audio.boundary.candidates import BoundaryCandidate
 from codex_audio.features.diarization import DiarizationSegment
-from codex_audio.features.embeddings import AudioEmbedding
+from codex_audio.features.embeddings import (
+    AudioEmbedding,
+    adjacent_cosine_similarity,
+    embedding_bounds,
+)
 from codex_audio.features.patterns import find_anchor_return_candidates
-from codex_audio.features.vad import SILENCE_LABEL, VadSegment
+from codex_audio.features.vad import VadSegment, VadTimeline
 from codex_audio.text_features.embeddings import ChunkEmbedding
 from codex_audio.transcription import TranscriptWord
 
@@ -39,6 +45,123 @@ class ChangePoint:
         )
 
 
+# ChangePoint attribute -> weight key, in the order ``combined`` sums them.
+_COMPONENT_WEIGHTS = (
+    ("audio_change", "audio"),
+    ("text_change", "text"),
+    ("silence_change", "silence"),
+    ("anchor_flag", "anchor"),
+    ("keyword_boost", "keyword"),
+)
+
+
+class ChangePointFrame(Sequence[ChangePoint]):
+    """Change points as a time array plus one float64 array per signal.
+
+    Reads like the ``List[ChangePoint]`` it replaces (indexing yields
+    ``ChangePoint`` rows), while weighting, smoothing and peak picking run on
+    whole columns at once.
+    """
+
+    audio_change: np.ndarray
+    text_change: np.ndarray
+    silence_change: np.ndarray
+    anchor_flag: np.ndarray
+    keyword_boost: np.ndarray
+
+    def __init__(self, time_s: Sequence[float] | np.ndarray, **components: np.ndarray) -> None:
+        self.time_s = np.asarray(time_s, dtype=np.float64)
+        self._is_sorted: bool | None = None
+        for attribute, _ in _COMPONENT_WEIGHTS:
+            values = components.pop(attribute, None)
+            column = (
+                np.zeros(len(self.time_s), dtype=np.float64)
+                if values is None
+                else np.asarray(values, dtype=np.float64)
+            )
+            if len(column) != len(self.time_s):
+                raise ValueError(f"{attribute} must have one value per change point")
+            setattr(self, attribute, column)
+        if components:
+            raise TypeError(f"Unknown change point components: {', '.join(components)}")
+
+    @classmethod
+    def from_points(cls, points: Sequence[ChangePoint]) -> "ChangePointFrame":
+        if isinstance(points, ChangePointFrame):
+            return points
+        return cls(
+            [point.time_s for point in points],
+            **{
+                attribute: np.array([getattr(point, attribute) for point in points])
+                for attribute, _ in _COMPONENT_WEIGHTS
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.time_s)
+
+    @overload
+    def __getitem__(self, index: int) -> ChangePoint: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ChangePointFrame": ...
+
+    def __getitem__(self, index: int | slice) -> ChangePoint | "ChangePointFrame":
+        if isinstance(index, slice):
+            return self._take(index)
+        row = range(len(self))[index]
+        values = {
+            attribute: float(getattr(self, attribute)[row]) for attribute, _ in _COMPONENT_WEIGHTS
+        }
+        return ChangePoint(time_s=float(self.time_s[row]), **values)
+
+    def __iter__(self) -> Iterator[ChangePoint]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(points={len(self)})"
+
+    def to_points(self) -> List[ChangePoint]:
+        return list(self)
+
+    def combined(self, weights: Mapping[str, float]) -> np.ndarray:
+        """Weighted sum of every signal; matches ``ChangePoint.combined`` row by row."""
+
+        total = np.zeros(len(self), dtype=np.float64)
+        for attribute, key in _COMPONENT_WEIGHTS:
+            total = total + getattr(self, attribute) * weights.get(key, 1.0)
+        return total
+
+    def between(self, start_s: float, end_s: float) -> "ChangePointFrame":
+        """Points strictly inside ``(start_s, end_s)``, in their original order."""
+
+        if self._is_sorted is None:
+            self._is_sorted = bool(np.all(self.time_s[1:] >= self.time_s[:-1]))
+        if self._is_sorted:
+            first = int(np.searchsorted(self.time_s, start_s, side="right"))
+            last = int(np.searchsorted(self.time_s, end_s, side="left"))
+            return self._take(slice(first, max(first, last)))
+        return self._take((self.time_s > start_s) & (self.time_s < end_s))
+
+    def peak_candidates(
+        self,
+        weights: Mapping[str, float],
+        *,
+        min_score: float,
+        smoothing_window: int = 1,
+        reason: str = "change_peak",
+    ) -> List[BoundaryCandidate]:
+        smoothed = _box_smooth(self.combined(weights), smoothing_window)
+        return find_peak_candidates(self.time_s, smoothed, min_score=min_score, reason=reason)
+
+    def _take(self, index: slice | np.ndarray) -> "ChangePointFrame":
+        return ChangePointFrame(
+            self.time_s[index],
+            **{attribute: getattr(self, attribute)[index] for attribute, _ in _COMPONENT_WEIGHTS},
+        )
+
+
 def compute_change_points(
     *,
     audio_embeddings: Sequence[AudioEmbedding] | None = None,
@@ -53,46 +176,51 @@ def compute_change_points(
     anchor_tolerance_s: float = DEFAULT_ANCHOR_TOLERANCE_S,
     audio_threshold: float = DEFAULT_AUDIO_THRESHOLD,
     text_threshold: float = DEFAULT_TEXT_THRESHOLD,
-) -> List[ChangePoint]:
+) -> ChangePointFrame:
     boundary_times = _derive_boundary_times(audio_embeddings, text_embeddings)
-    points = [ChangePoint(time_s=time) for time in boundary_times]
-    if not points:
+    points = ChangePointFrame(boundary_times)
+    if not len(points):
         return points
 
     if audio_embeddings and len(audio_embeddings) > 1:
         audio_changes = _boundary_changes_from_embeddings(audio_embeddings, audio_threshold)
-        _apply_component(points, audio_changes, "audio_change")
+        _apply_component(points, *audio_changes, "audio_change")
 
     if text_embeddings and len(text_embeddings) > 1:
         text_changes = _boundary_changes_from_embeddings(text_embeddings, text_threshold)
-        _apply_component(points, text_changes, "text_change")
+        _apply_component(points, *text_changes, "text_change")
 
     if vad_segments:
         silence_changes = _silence_changes(boundary_times, vad_segments, silence_window_s, silence_norm_s)
-        _apply_component(points, silence_changes, "silence_change")
+        _apply_component(points, *silence_changes, "silence_change")
 
     if diarization_segments:
         anchor_flags = _anchor_flags(boundary_times, diarization_segments, anchor_tolerance_s)
-        _apply_component(points, anchor_flags, "anchor_flag")
+        _apply_component(points, *_columns(anchor_flags), "anchor_flag")
 
     if transcript_words and keyword_patterns:
         keyword_changes = _keyword_boosts(
             boundary_times, transcript_words, keyword_patterns, keyword_score
         )
-        _apply_component(points, keyword_changes, "keyword_boost")
+        _apply_component(points, *_columns(keyword_changes), "keyword_boost")
 
     return points
 
 
 def smooth_scores(scores: Sequence[float], window_size: int = 1) -> List[float]:
-    if window_size <= 0:
-        return list(scores)
-    smoothed: List[float] = []
-    for idx in range(len(scores)):
-        start = max(0, idx - window_size)
-        end = min(len(scores), idx + window_size + 1)
-        smoothed.append(sum(scores[start:end]) / (end - start))
-    return smoothed
+    return _box_smooth(np.asarray(scores, dtype=np.float64), window_size).tolist()
+
+
+def _box_smooth(scores: np.ndarray, window_size: int) -> np.ndarray:
+    """Mean over ``idx +/- window_size``, truncated at the edges, via a cumulative sum."""
+
+    if window_size <= 0 or not len(scores):
+        return scores
+    prefix = np.concatenate([[0.0], np.cumsum(scores)])
+    idx = np.arange(len(scores))
+    start = np.maximum(0, idx - window_size)
+    end = np.minimum(len(scores), idx + window_size + 1)
+    return (prefix[end] - prefix[start]) / (end - start)
 
 
 def find_peak_candidates(
@@ -102,19 +230,18 @@ def find_peak_candidates(
     min_score: float,
     reason: str = "change_peak",
 ) -> List[BoundaryCandidate]:
-    candidates: List[BoundaryCandidate] = []
+    times = np.asarray(times, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
     if len(scores) < 3:
-        for time, score in zip(times, scores):
-            if score >= min_score:
-                candidates.append(BoundaryCandidate(time_s=time, score=score, reason=reason))
-        return candidates
-    for idx in range(1, len(scores) - 1):
-        prev_score = scores[idx - 1]
-        cur_score = scores[idx]
-        next_score = scores[idx + 1]
-        if cur_score >= prev_score and cur_score >= next_score and cur_score >= min_score:
-            candidates.append(BoundaryCandidate(time_s=times[idx], score=cur_score, reason=reason))
-    return candidates
+        peaks = np.flatnonzero(scores >= min_score)
+    else:
+        inner = scores[1:-1]
+        is_peak = (inner >= scores[:-2]) & (inner >= scores[2:]) & (inner >= min_score)
+        peaks = np.flatnonzero(is_peak) + 1
+    return [
+        BoundaryCandidate(time_s=float(times[idx]), score=float(scores[idx]), reason=reason)
+        for idx in peaks
+    ]
 
 
 def _derive_boundary_times(
@@ -122,32 +249,21 @@ def _derive_boundary_times(
     text_embeddings: Sequence[ChunkEmbedding] | None,
 ) -> List[float]:
     if audio_embeddings and len(audio_embeddings) > 1:
-        return [emb.start_s for emb in audio_embeddings[1:]]
+        return embedding_bounds(audio_embeddings)[0][1:].tolist()
     if text_embeddings and len(text_embeddings) > 1:
-        return [chunk.text.start_s for chunk in text_embeddings[1:]]
+        return embedding_bounds(text_embeddings)[0][1:].tolist()
     return []
 
 
 def _boundary_changes_from_embeddings(
     embeddings: Sequence[AudioEmbedding] | Sequence[ChunkEmbedding],
     threshold: float,
-) -> List[tuple[float, float]]:
+) -> tuple[np.ndarray, np.ndarray]:
     if threshold <= -1.0 or threshold > 1.0:
         raise ValueError("threshold must be within (-1, 1]")
-    changes: List[tuple[float, float]] = []
-    for left, right in zip(embeddings, embeddings[1:]):
-        left_vec = getattr(left, "vector", None)
-        right_vec = getattr(right, "vector", None)
-        if left_vec is None or right_vec is None:
-            continue
-        similarity = _cosine_similarity(left_vec, right_vec)
-        change = max(0.0, 1.0 - similarity)
-        if hasattr(right, "start_s"):
-            time_s = getattr(right, "start_s")  # AudioEmbedding
-        else:
-            time_s = getattr(right.text, "start_s")  # ChunkEmbedding
-        changes.append((time_s, change))
-    return changes
+    similarities = adjacent_cosine_similarity(embeddings)
+    times = embedding_bounds(embeddings)[0][1:]
+    return times, np.maximum(0.0, 1.0 - similarities)
 
 
 def _silence_changes(
@@ -155,20 +271,11 @@ def _silence_changes(
     vad_segments: Sequence[VadSegment],
     window_s: float,
     norm_s: float,
-) -> List[tuple[float, float]]:
-    silence_spans = [seg for seg in vad_segments if seg.label == SILENCE_LABEL]
-    changes: List[tuple[float, float]] = []
-    for time in times:
-        window_start = time - window_s
-        window_end = time + window_s
-        longest = 0.0
-        for seg in silence_spans:
-            overlap = min(seg.end_s, window_end) - max(seg.start_s, window_start)
-            if overlap > longest:
-                longest = max(0.0, overlap)
-        normalized = max(0.0, min(1.0, longest / norm_s if norm_s else longest))
-        changes.append((time, normalized))
-    return changes
+) -> tuple[np.ndarray, np.ndarray]:
+    timeline = VadTimeline.from_segments(vad_segments)
+    centers = np.asarray(times, dtype=np.float64)
+    longest = timeline.silence_overlap(centers - window_s, centers + window_s)
+    return centers, np.clip(longest / norm_s if norm_s else longest, 0.0, 1.0)
 
 
 def _anchor_flags(
@@ -232,25 +339,26 @@ def _nearest_boundary_time(times: Sequence[float], target: float) -> float:
     return left if abs(target - left) <= abs(right - target) else right
 
 
+def _columns(pairs: Iterable[tuple[float, float]]) -> tuple[np.ndarray, np.ndarray]:
+    values = np.asarray(list(pairs), dtype=np.float64).reshape(-1, 2)
+    return values[:, 0], values[:, 1]
+
+
 def _apply_component(
-    points: List[ChangePoint],
-    values: Iterable[tuple[float, float]],
+    points: ChangePointFrame,
+    times: np.ndarray,
+    values: np.ndarray,
     attribute: str,
 ) -> None:
-    point_map = {point.time_s: point for point in points}
-    for time, value in values:
-        point = point_map.get(time)
-        if point is None:
-            continue
-        setattr(point, attribute, value)
-
-
-def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
-    if len(a) != len(b):
-        raise ValueError("Embedding vectors must have the same length")
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = sum(x * x for x in a) ** 0.5
-    norm_b = sum(y * y for y in b) ** 0.5
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+    column = getattr(points, attribute)
+    if np.array_equal(times, points.time_s):
+        column[:] = values
+        return
+    # Match on exact time; among duplicate point times the last one wins, and
+    # among duplicate values the last one is kept, as with a dict lookup.
+    order = np.argsort(points.time_s, kind="stable")
+    ordered = points.time_s[order]
+    pos = np.searchsorted(ordered, times, side="right") - 1
+    hit = (pos >= 0) & (ordered[np.maximum(pos, 0)] == times)
+    column[order[pos[hit]]] = values[hit]
+
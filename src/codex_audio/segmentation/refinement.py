@@ -1,15 +1,12 @@
 ﻿from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from typing import List, Mapping, Sequence
 
 from codex_audio.boundary.candidates import BoundaryCandidate
-from codex_audio.features.vad import SILENCE_LABEL, VadSegment
-from codex_audio.segmentation.change_scores import (
-    ChangePoint,
-    find_peak_candidates,
-    smooth_scores,
-)
+from codex_audio.features.vad import VadSegment, VadTimeline
+from codex_audio.segmentation.change_scores import ChangePoint, ChangePointFrame
 from codex_audio.segmentation.planner import SegmentPlan
 from codex_audio.segmentation.selection import SegmentConstraint, select_boundaries
 from codex_audio.transcription import TranscriptWord
@@ -21,6 +18,7 @@ DEFAULT_CHANGE_WEIGHTS: Mapping[str, float] = {
     "anchor": 1.5,
     "keyword": 3.0,
 }
+SELECTION_MODES = ("chunk", "global")
 
 
 @dataclass
@@ -33,10 +31,12 @@ class RefinementParams:
     hard_min_cut_score: float = 1.2
     smoothing_window: int = 1
     snap_window_s: float = 1.0
+    selection_mode: str = "chunk"
 
 
 _FULL_LABEL = "chunk_full"
 _TAIL_LABEL = "chunk_tail"
+_LABEL_TOLERANCE_S = 1e-3
 
 
 def refine_chunk_segments(
@@ -55,39 +55,16 @@ def refine_chunk_segments(
     if chunk_end <= chunk_start:
         raise ValueError("chunk_end must be greater than chunk_start")
 
-    window_points = [
-        point for point in change_points if chunk_start < point.time_s < chunk_end
-    ]
-    if window_points:
-        scores = [point.combined(params.weights) for point in window_points]
-        smoothed = smooth_scores(scores, window_size=params.smoothing_window)
-        times = [point.time_s for point in window_points]
-        candidates = find_peak_candidates(
-            times,
-            smoothed,
-            min_score=params.candidate_min_score,
-            reason=peak_reason,
-        )
-    else:
-        candidates = []
-
-    if extra_candidates:
-        candidates.extend(extra_candidates)
-        candidates.sort(key=lambda c: c.time_s)
-
-    safe_candidates: list[BoundaryCandidate] = []
-    if vad_segments:
-        for candidate in candidates:
-            is_safe = False
-            for segment in vad_segments:
-                if segment.start_s <= candidate.time_s <= segment.end_s:
-                    if segment.label == SILENCE_LABEL and segment.duration() >= 0.4:
-                        is_safe = True
-                    break
-            if is_safe or candidate.score > 2.5:
-                safe_candidates.append(candidate)
-    else:
-        safe_candidates = list(candidates)
+    timeline = VadTimeline.from_segments(vad_segments) if vad_segments else None
+    safe_candidates = _safe_candidates(
+        chunk_start,
+        chunk_end,
+        change_points=change_points,
+        params=params,
+        timeline=timeline,
+        extra_candidates=extra_candidates,
+        peak_reason=peak_reason,
+    )
 
     selected = select_boundaries(
         safe_candidates,
@@ -104,7 +81,7 @@ def refine_chunk_segments(
 
     snapped = _snap_candidates(
         selected,
-        vad_segments=vad_segments,
+        vad_segments=timeline,
         transcript_words=transcript_words,
         window_s=params.snap_window_s,
     )
@@ -117,6 +94,122 @@ def refine_chunk_segments(
     )
 
 
+def refine_global_segments(
+    chunk_plans: Sequence[SegmentPlan],
+    *,
+    change_points: Sequence[ChangePoint],
+    params: RefinementParams | None = None,
+    vad_segments: Sequence[VadSegment] | None = None,
+    transcript_words: Sequence[TranscriptWord] | None = None,
+    extra_candidates: Sequence[BoundaryCandidate] | None = None,
+    peak_reason: str = "change_peak",
+) -> List[SegmentPlan]:
+    """Select boundaries once over the whole timeline instead of chunk by chunk.
+
+    Chunk seams become fallback cuts, used only where no scored cut keeps
+    segments within ``max_len``, so stories can run across a seam. A stretch
+    with no cut at all stays one over-long segment rather than dropping the
+    score floor for the whole timeline. Labels are
+    then given per chunk: each segment is prefixed with the label of the chunk
+    it starts in, and a segment that matches a chunk exactly keeps its label.
+    """
+
+    if params is None:
+        params = RefinementParams()
+    if not chunk_plans:
+        return []
+    timeline_start = chunk_plans[0].start_s
+    timeline_end = chunk_plans[-1].end_s
+    if timeline_end <= timeline_start:
+        raise ValueError("chunk plans must cover a positive duration")
+
+    timeline = VadTimeline.from_segments(vad_segments) if vad_segments else None
+    safe_candidates = _safe_candidates(
+        timeline_start,
+        timeline_end,
+        change_points=change_points,
+        params=params,
+        timeline=timeline,
+        extra_candidates=extra_candidates,
+        peak_reason=peak_reason,
+    )
+    seams = [
+        BoundaryCandidate(time_s=chunk.end_s, score=0.0, reason=_TAIL_LABEL)
+        for chunk in chunk_plans[:-1]
+    ]
+    selected = select_boundaries(
+        safe_candidates,
+        chunk_start=timeline_start,
+        chunk_end=timeline_end,
+        constraints=params.constraints,
+        hard_min_score=params.hard_min_cut_score,
+        fallback_cuts=seams,
+        soft_max_len=True,
+    )
+    snapped = _snap_candidates(
+        selected,
+        vad_segments=timeline,
+        transcript_words=transcript_words,
+        window_s=params.snap_window_s,
+    )
+    segments = _segments_from_boundaries(
+        chunk_start=timeline_start,
+        chunk_end=timeline_end,
+        boundaries=snapped,
+        min_len=params.constraints.min_len,
+    )
+
+    chunk_starts = [chunk.start_s for chunk in chunk_plans]
+    labeled: List[SegmentPlan] = []
+    for segment in segments:
+        index = max(0, bisect_right(chunk_starts, segment.start_s + _LABEL_TOLERANCE_S) - 1)
+        chunk = chunk_plans[index]
+        if (
+            abs(segment.start_s - chunk.start_s) <= _LABEL_TOLERANCE_S
+            and abs(segment.end_s - chunk.end_s) <= _LABEL_TOLERANCE_S
+        ):
+            label = chunk.label
+        else:
+            label = f"{chunk.label or 'chunk'}|{segment.label}"
+        labeled.append(SegmentPlan(segment.start_s, segment.end_s, label))
+    return labeled
+
+
+def _safe_candidates(
+    window_start: float,
+    window_end: float,
+    *,
+    change_points: Sequence[ChangePoint],
+    params: RefinementParams,
+    timeline: VadTimeline | None,
+    extra_candidates: Sequence[BoundaryCandidate] | None,
+    peak_reason: str,
+) -> List[BoundaryCandidate]:
+    window_points = ChangePointFrame.from_points(change_points).between(window_start, window_end)
+    if len(window_points):
+        candidates = window_points.peak_candidates(
+            params.weights,
+            min_score=params.candidate_min_score,
+            smoothing_window=params.smoothing_window,
+            reason=peak_reason,
+        )
+    else:
+        candidates = []
+
+    if extra_candidates:
+        candidates.extend(extra_candidates)
+        candidates.sort(key=lambda c: c.time_s)
+
+    if not timeline:
+        return list(candidates)
+    safe_candidates: List[BoundaryCandidate] = []
+    for candidate in candidates:
+        row = timeline.index_at(candidate.time_s)
+        is_safe = row is not None and timeline.is_silence[row] and timeline.duration(row) >= 0.4
+        if is_safe or candidate.score > 2.5:
+            safe_candidates.append(candidate)
+    return safe_candidates
+
 
 def _snap_candidates(
     candidates: Sequence[BoundaryCandidate],
@@ -162,24 +255,11 @@ def _snap_time(
     if window_s <= 0 or not vad_segments:
         return time_s
 
-    best_time = time_s
-    max_duration = 0.0
-    search_start = time_s - window_s
-    search_end = time_s + window_s
-
-    for segment in vad_segments:
-        if segment.label != SILENCE_LABEL:
-            continue
-        start_overlap = max(search_start, segment.start_s)
-        end_overlap = min(search_end, segment.end_s)
-        if end_overlap <= start_overlap:
-            continue
-        duration = segment.duration()
-        if duration > max_duration:
-            max_duration = duration
-            best_time = (segment.start_s + segment.end_s) / 2
-
-    return best_time
+    timeline = VadTimeline.from_segments(vad_segments)
+    row = timeline.longest_silence_in(time_s - window_s, time_s + window_s)
+    if row is None:
+        return time_s
+    return float(timeline.start_s[row] + timeline.end_s[row]) / 2
 
 
 def _segments_from_boundaries(
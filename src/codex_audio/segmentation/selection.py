@@ -1,10 +1,15 @@
 ﻿from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Sequence, Tuple
+from typing import Deque, List, Sequence, Tuple
 
 from codex_audio.boundary.candidates import BoundaryCandidate
 
+FALLBACK_CUT_PENALTY = 1e-6
+OVERLONG_SEGMENT_PENALTY = 1e6
+_UNREACHABLE = float("-inf")
+
 
 @dataclass
 class SegmentConstraint:
@@ -19,16 +24,35 @@ def select_boundaries(
     chunk_end: float,
     constraints: SegmentConstraint,
     hard_min_score: float = 0.0,
+    fallback_cuts: Sequence[BoundaryCandidate] = (),
+    soft_max_len: bool = False,
 ) -> List[BoundaryCandidate]:
-    """Selects the optimal set of cuts via dynamic programming."""
+    """Selects the optimal set of cuts via dynamic programming.
+
+    Each cut's best predecessor is the highest-scoring cut between ``max_len``
+    and ``min_len`` seconds earlier. Both window edges only move forward, so a
+    monotonic queue tracks that maximum and the whole pass is linear in the
+    number of candidates. ``fallback_cuts`` are always eligible regardless of
+    ``hard_min_score`` but cost a little, so they are only chosen when no
+    scored cut keeps every segment within ``max_len``.
+
+    With ``soft_max_len``, a stretch that no cut can keep within ``max_len``
+    becomes one over-long segment starting at the latest reachable cut, at a
+    cost that outweighs any score, instead of the whole range falling back to
+    the greedy pass.
+    """
 
     valid_candidates = [c for c in candidates if c.score >= hard_min_score]
+    scored: List[Tuple[float, float, BoundaryCandidate | None]] = [
+        (candidate.time_s, candidate.score, candidate) for candidate in valid_candidates
+    ]
+    scored.extend((cut.time_s, -FALLBACK_CUT_PENALTY, cut) for cut in fallback_cuts)
 
     points: List[Tuple[float, float, BoundaryCandidate | None]] = []
     points.append((chunk_start, 0.0, None))
-    for candidate in sorted(valid_candidates, key=lambda c: c.time_s):
-        if chunk_start < candidate.time_s < chunk_end:
-            points.append((candidate.time_s, candidate.score, candidate))
+    for point in sorted(scored, key=lambda item: item[0]):
+        if chunk_start < point[0] < chunk_end:
+            points.append(point)
     points.append((chunk_end, 0.0, None))
 
     n = len(points)
@@ -38,28 +62,54 @@ def select_boundaries(
     min_len = constraints.min_len
     max_len = constraints.max_len if constraints.max_len is not None else float("inf")
 
-    dp = [-1.0] * n
+    dp = [_UNREACHABLE] * n
     parent = [-1] * n
     dp[0] = 0.0
 
-    for i in range(1, n):
+    # Indices whose cut is at least min_len back, best dp first; ties keep the
+    # latest index, which is the predecessor a backwards scan would settle on.
+    window: Deque[int] = deque()
+    next_ready = 0
+    latest_ready = -1
+    for i in range(1, n - 1):
         current_time = points[i][0]
-        current_score = points[i][1]
-        for j in range(i - 1, -1, -1):
-            prev_time = points[j][0]
-            segment_len = current_time - prev_time
-            if segment_len > max_len:
-                break
-            if segment_len < min_len and i != n - 1:
-                continue
-            if dp[j] == -1.0:
-                continue
-            score = dp[j] + current_score
-            if score > dp[i]:
-                dp[i] = score
-                parent[i] = j
-
-    if dp[-1] == -1.0:
+        while next_ready < i and current_time - points[next_ready][0] >= min_len:
+            if dp[next_ready] != _UNREACHABLE:
+                while window and dp[window[-1]] <= dp[next_ready]:
+                    window.pop()
+                window.append(next_ready)
+                latest_ready = next_ready
+            next_ready += 1
+        while window and current_time - points[window[0]][0] > max_len:
+            window.popleft()
+        if window:
+            best = window[0]
+            score = dp[best] + points[i][1]
+        elif soft_max_len and latest_ready != -1:
+            best = latest_ready
+            score = dp[best] + points[i][1] - OVERLONG_SEGMENT_PENALTY
+        else:
+            continue
+        if score > dp[i]:
+            dp[i] = score
+            parent[i] = best
+
+    # The closing segment is exempt from min_len.
+    end_time = points[-1][0]
+    for j in range(n - 2, -1, -1):
+        if end_time - points[j][0] > max_len:
+            break
+        if dp[j] == _UNREACHABLE:
+            continue
+        if dp[j] > dp[-1]:
+            dp[-1] = dp[j]
+            parent[-1] = j
+    if dp[-1] == _UNREACHABLE and soft_max_len:
+        last = max(j for j in range(n - 1) if dp[j] != _UNREACHABLE)
+        dp[-1] = dp[last] - OVERLONG_SEGMENT_PENALTY
+        parent[-1] = last
+
+    if dp[-1] == _UNREACHABLE:
         return _fallback_greedy(candidates, chunk_start, chunk_end, constraints)
 
     selected: List[BoundaryCandidate] = []
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import json
+import queue
+import socketserver
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field, replace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+
+from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SERVER_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_PORT = 8765
+# Longest ``GET /jobs/<id>?wait=<s>`` a client can hold a handler thread for.
+MAX_JOB_WAIT_S = 60.0
+_LATENCY_WINDOW = 256
+_FINISHED_JOBS_KEPT = 1024
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass
+class SegmentationJob:
+    audio_path: Path
+    station: str
+    out_dir: Path
+    config_path: Optional[Path] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    manifest_path: Optional[Path] = None
+    segments: int = 0
+    error: Optional[str] = None
+    finished: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], *, default_station: str) -> "SegmentationJob":
+        if not isinstance(payload, dict):
+            raise ValueError("Job must be a JSON object")
+        missing = [key for key in ("audio_path", "out_dir") if not payload.get(key)]
+        if missing:
+            raise ValueError(f"Job is missing {', '.join(missing)}")
+        config = payload.get("config")
+        return cls(
+            audio_path=Path(payload["audio_path"]).expanduser(),
+            station=str(payload.get("station") or default_station),
+            out_dir=Path(payload["out_dir"]).expanduser(),
+            config_path=Path(config).expanduser() if config else None,
+        )
+
+    @property
+    def queue_wait_s(self) -> Optional[float]:
+        return self.started_at - self.submitted_at if self.started_at else None
+
+    @property
+    def latency_s(self) -> Optional[float]:
+        return self.finished_at - self.submitted_at if self.finished_at else None
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "audio_path": str(self.audio_path),
+            "station": self.station,
+            "out_dir": str(self.out_dir),
+            "manifest": str(self.manifest_path) if self.manifest_path else None,
+            "segments": self.segments,
+            "error": self.error,
+            "queue_wait_s": _rounded(self.queue_wait_s),
+            "latency_s": _rounded(self.latency_s),
+        }
+
+
+class SegmentationService:
+    """A bounded job queue drained by worker threads sharing warm pipelines.
+
+    Jobs that name no station use ``base_config.station``. One
+    :class:`StorySegmentationPipeline` is built per station (and config
+    override) on first use and reused by every later job, so station YAML,
+    imported SDKs, the transcript store and the pipeline's API clients stay
+    loaded and connected. ``run`` keeps no per-run state on the pipeline, so
+    workers share it. ``submit`` raises :class:`QueueFullError` instead of
+    blocking when ``queue_size`` jobs wait.
+    """
+
+    def __init__(
+        self,
+        base_config: PipelineConfig,
+        *,
+        workers: int = DEFAULT_SERVER_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        config_dir: Optional[Path] = None,
+    ) -> None:
+        self.base_config = base_config
+        self.config_dir = config_dir
+        self._queue: "queue.Queue[Optional[SegmentationJob]]" = queue.Queue(maxsize=queue_size)
+        self._jobs: Dict[str, SegmentationJob] = {}
+        self._finished: Deque[str] = deque()
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._pipelines: Dict[tuple[str, Optional[Path]], StorySegmentationPipeline] = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._threads = [
+            threading.Thread(target=self._work, name=f"segment-{idx}", daemon=True)
+            for idx in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, job: SegmentationJob) -> SegmentationJob:
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+            raise QueueFullError(f"Queue is full ({self._queue.maxsize} jobs waiting)") from None
+        logger.info(
+            "Job queued",
+            extra={"job": job.id, "audio": str(job.audio_path), "depth": self._queue.qsize()},
+        )
+        return job
+
+    def job(self, job_id: str) -> Optional[SegmentationJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[SegmentationJob]:
+        """Block until ``job_id`` finishes or ``timeout`` passes; returns the job."""
+
+        job = self.job(job_id)
+        if job is not None:
+            job.finished.wait(timeout)
+        return job
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = np.array(self._latencies, dtype=np.float64)
+            payload: dict[str, Any] = {
+                "queue_depth": self._queue.qsize(),
+                "queue_size": self._queue.maxsize,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "workers": len(self._threads),
+                "pipelines": sorted(station for station, _ in self._pipelines),
+            }
+        if len(latencies):
+            payload["latency_p50_s"] = round(float(np.percentile(latencies, 50)), 3)
+            payload["latency_p95_s"] = round(float(np.percentile(latencies, 95)), 3)
+            payload["latency_max_s"] = round(float(latencies.max()), 3)
+        return payload
+
+    def close(self, *, timeout: Optional[float] = None) -> None:
+        """Stop accepting work, let queued jobs finish and join the workers."""
+
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def pipeline_for(
+        self, station: str, config_path: Optional[Path] = None
+    ) -> StorySegmentationPipeline:
+        if config_path is None and self.config_dir is not None:
+            candidate = self.config_dir / f"{station}.yaml"
+            config_path = candidate if candidate.exists() else None
+        key = (station, config_path)
+        with self._lock:
+            pipeline = self._pipelines.get(key)
+            if pipeline is None:
+                config = replace(self.base_config, station=station, config_path=config_path)
+                pipeline = StorySegmentationPipeline(config=config)
+                self._pipelines[key] = pipeline
+        return pipeline
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                self._running += 1
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                pipeline = self.pipeline_for(job.station, job.config_path)
+                result = pipeline.run(audio_path=job.audio_path, output_dir=job.out_dir)
+            except Exception as exc:
+                job.error = f"{type(exc).__name__}: {exc}"
+                job.status = "failed"
+            else:
+                job.manifest_path = result.manifest_path
+                job.segments = len(result.segments)
+                job.status = "done"
+            job.finished_at = time.time()
+            self._record(job)
+
+    def _record(self, job: SegmentationJob) -> None:
+        with self._lock:
+            self._running -= 1
+            if job.status == "done":
+                self._completed += 1
+            else:
+                self._failed += 1
+            if job.latency_s is not None:
+                self._latencies.append(job.latency_s)
+            self._finished.append(job.id)
+            while len(self._finished) > _FINISHED_JOBS_KEPT:
+                self._jobs.pop(self._finished.popleft(), None)
+        job.finished.set()
+        log = logger.info if job.status == "done" else logger.warning
+        log(
+            "Job finished",
+            extra={
+                "job": job.id,
+                "status": job.status,
+                "latency_s": _rounded(job.latency_s),
+                "queue_wait_s": _rounded(job.queue_wait_s),
+                "error": job.error,
+            },
+        )
+
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """``POST /jobs``, ``GET /jobs/<id>`` and ``GET /stats``.
+
+    ``?wait=<s>`` blocks a job lookup until the job finishes, for at most
+    :data:`MAX_JOB_WAIT_S` seconds.
+    """
+
+    server_version = "codex-audio"
+    service: SegmentationService
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.rstrip("/") != "/jobs":
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"No route for {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            job = SegmentationJob.from_payload(
+                json.loads(self.rfile.read(length) or b"{}"),
+                default_station=self.service.base_config.station,
+            )
+        except (ValueError, TypeError) as exc:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            return
+        try:
+            self.service.submit(job)
+        except QueueFullError as exc:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)})
+            return
+        self._send(HTTPStatus.ACCEPTED, job.to_payload())
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        route, _, query = self.path.partition("?")
+        route = route.rstrip("/")
+        if route == "/stats":
+            self._send(HTTPStatus.OK, self.service.stats())
+            return
+        if route.startswith("/jobs/"):
+            job_id = route[len("/jobs/") :]
+            wait_s = _query_float(query, "wait")
+            job = (
+                self.service.wait(job_id, timeout=min(wait_s, MAX_JOB_WAIT_S))
+                if wait_s is not None
+                else self.service.job(job_id)
+            )
+            if job is None:
+                self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown job {job_id}"})
+            else:
+                self._send(HTTPStatus.OK, job.to_payload())
+            return
+        self._send(HTTPStatus.NOT_FOUND, {"error": f"No route for {self.path}"})
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address.
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug("HTTP %s", format % args)
+
+    def _send(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    service: SegmentationService,
+    *,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[Path] = None,
+) -> socketserver.BaseServer:
+    """An HTTP server for ``service`` on ``host:port``, or on a Unix socket if given."""
+
+    handler = type("JobRequestHandler", (_JobRequestHandler,), {"service": service})
+    if socket_path is not None:
+        if socket_path.exists():
+            socket_path.unlink()
+        return _UnixHTTPServer(str(socket_path), handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def _query_float(query: str, name: str) -> Optional[float]:
+    for part in query.split("&"):
+        key, _, value = part.partition("=")
+        if key == name:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return None
+    return None
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
+
+
+__all__: List[str] = [
+    "QueueFullError",
+    "SegmentationJob",
+    "SegmentationService",
+    "make_server",
+]
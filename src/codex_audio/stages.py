@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from codex_audio.utils import StageProfiler, get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[..., Any]
+    deps: tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    name: str
+    start_s: float
+    end_s: float
+    thread: str
+
+    @property
+    def duration_s(self) -> float:
+        return max(0.0, self.end_s - self.start_s)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "stage": self.name,
+            "start_s": round(self.start_s, 6),
+            "duration_s": round(self.duration_s, 6),
+            "thread": self.thread,
+        }
+
+
+@dataclass
+class StageGraphResult:
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: List[StageTiming] = field(default_factory=list)
+    wall_s: float = 0.0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+
+class StageGraph:
+    """Runs named stages on a thread pool as soon as their dependencies finish.
+
+    Each stage function receives its dependencies' results as positional
+    arguments, in the order the dependencies were declared. Threads rather than
+    processes: the audio buffer is shared without copying, the network-bound
+    stages only wait on sockets, and the numpy/FFT work releases the GIL.
+    """
+
+    def __init__(self) -> None:
+        self._stages: Dict[str, Stage] = {}
+
+    def add(self, name: str, func: Callable[..., Any], *, deps: Sequence[str] = ()) -> None:
+        if name in self._stages:
+            raise ValueError(f"Stage already registered: {name}")
+        missing = [dep for dep in deps if dep not in self._stages]
+        if missing:
+            # Requiring dependencies first also rules out cycles.
+            raise ValueError(f"Stage {name} depends on unknown stages: {', '.join(missing)}")
+        self._stages[name] = Stage(name=name, func=func, deps=tuple(deps))
+
+    @property
+    def stage_names(self) -> List[str]:
+        return list(self._stages)
+
+    def run(
+        self,
+        *,
+        max_workers: Optional[int] = DEFAULT_MAX_WORKERS,
+        profiler: Optional[StageProfiler] = None,
+    ) -> StageGraphResult:
+        result = StageGraphResult()
+        if not self._stages:
+            return result
+
+        origin = time.perf_counter()
+        lock = threading.Lock()
+
+        def execute(stage: Stage) -> Any:
+            args = [result.results[dep] for dep in stage.deps]
+            started = time.perf_counter() - origin
+            try:
+                if profiler is not None:
+                    return profiler.call(stage.name, stage.func, *args)
+                return stage.func(*args)
+            finally:
+                timing = StageTiming(
+                    name=stage.name,
+                    start_s=started,
+                    end_s=time.perf_counter() - origin,
+                    thread=threading.current_thread().name,
+                )
+                with lock:
+                    result.timings.append(timing)
+
+        pending = dict(self._stages)
+        running: Dict[Future[Any], Stage] = {}
+        workers = max(1, max_workers or len(self._stages))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage") as pool:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if all(dep in result.results for dep in stage.deps):
+                        running[pool.submit(execute, stage)] = stage
+                        del pending[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        for other in running:
+                            other.cancel()
+                        logger.error(
+                            "Stage failed", extra={"stage": stage.name, "error": str(error)}
+                        )
+                        raise error
+                    result.results[stage.name] = future.result()
+
+        result.wall_s = time.perf_counter() - origin
+        result.timings.sort(key=lambda timing: timing.start_s)
+        logger.debug(
+            "Stage graph executed",
+            extra={
+                "wall_s": round(result.wall_s, 3),
+                "stages": {
+                    timing.name: round(timing.duration_s, 3) for timing in result.timings
+                },
+            },
+        )
+        return result
@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from codex_audio.features.embeddings import (
+    DEFAULT_HOP_RATIO,
+    DEFAULT_WINDOW_S,
+    EmbeddingMatrix,
+    compute_embedding_matrix,
+)
+from codex_audio.features.vad import SPEECH_LABEL, VadTimeline, run_vad
+from codex_audio.ingest import AudioBuffer
+from codex_audio.segmentation import (
+    RefinementParams,
+    SegmentPlan,
+    compute_change_points,
+    refine_chunk_segments,
+)
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_UPDATE_S = 10.0
+DEFAULT_HORIZON_S = 120.0
+FORCED_LABEL = "forced_max_len"
+
+
+@dataclass
+class StoryEvent:
+    """A story committed by :class:`RollingSegmenter`.
+
+    ``emitted_at_s`` is how much audio had been received when the story was
+    emitted, so ``latency_s`` is the delay in audio time between the end of the
+    story and its emission. ``wall_latency_s`` is the same delay on the wall
+    clock, measured from when the block holding the story's end was pushed.
+    """
+
+    index: int
+    start_s: float
+    end_s: float
+    label: str
+    emitted_at_s: float
+    latency_s: float
+    wall_latency_s: float
+    clip_path: Optional[Path] = None
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "start": self.start_s,
+            "end": self.end_s,
+            "label": self.label,
+            "emitted_at_s": round(self.emitted_at_s, 3),
+            "latency_s": round(self.latency_s, 3),
+            "wall_latency_s": round(self.wall_latency_s, 3),
+            "clip_path": str(self.clip_path) if self.clip_path else None,
+        }
+
+
+class RollingSegmenter:
+    """Segments an unbounded stream of mono 16-bit PCM blocks.
+
+    VAD frames and embedding windows are computed once, as soon as the audio
+    they cover has arrived. Every ``update_s`` of new audio the open region
+    (from the last committed boundary to now, plus ``context_s`` of look-back
+    for change scoring) is re-refined with :func:`refine_chunk_segments`. A
+    boundary is committed once it is ``horizon_s`` old, which defaults to the
+    maximum story length; if nothing qualifies after ``max_len + horizon_s``
+    the story is cut at its longest silence before ``max_len``. Only the open
+    region is kept in memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 16_000,
+        params: RefinementParams | None = None,
+        change_kwargs: Mapping[str, Any] | None = None,
+        window_s: float = DEFAULT_WINDOW_S,
+        hop_ratio: float = DEFAULT_HOP_RATIO,
+        vad_aggressiveness: int = 2,
+        vad_frame_duration_ms: int = 30,
+        update_s: float = DEFAULT_UPDATE_S,
+        horizon_s: Optional[float] = None,
+        context_s: Optional[float] = None,
+        clip_dir: Optional[Path] = None,
+        clip_stem: str = "stream",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if sample_rate <= 0:
+            raise ValueError("sample_rate must be positive")
+        if update_s <= 0:
+            raise ValueError("update_s must be positive")
+        self.sample_rate = sample_rate
+        self.params = params or RefinementParams()
+        self.change_kwargs = dict(change_kwargs or {})
+        self.vad_aggressiveness = vad_aggressiveness
+        self.vad_frame_duration_ms = vad_frame_duration_ms
+        self.update_s = update_s
+        self.max_len_s = self.params.constraints.max_len or DEFAULT_HORIZON_S
+        self.horizon_s = horizon_s if horizon_s is not None else self.max_len_s
+        self.context_s = context_s if context_s is not None else 2 * window_s
+        self.clip_dir = clip_dir
+        self.clip_stem = clip_stem
+        self.events: List[StoryEvent] = []
+        self._clock = clock
+
+        self._window_s = window_s
+        self._hop_ratio = hop_ratio
+        self._window_samples = max(1, int(window_s * sample_rate))
+        self._hop_samples = max(1, int(self._window_samples * hop_ratio))
+        self._frame_samples = int(sample_rate * vad_frame_duration_ms / 1000)
+
+        # Samples from absolute index ``_base`` up to everything received so far.
+        self._samples = np.zeros(0, dtype=np.int16)
+        self._base = 0
+        self._pending: List[np.ndarray] = []
+        self._received = 0
+        self._last_update = 0
+        self._arrivals: List[Tuple[int, float]] = []
+
+        self._open_start_s = 0.0
+        self._vad_next = 0
+        self._vad_start: List[float] = []
+        self._vad_end: List[float] = []
+        self._vad_silence: List[bool] = []
+        self._next_window = 0
+        self._vectors: List[np.ndarray] = []
+        self._window_starts: List[np.ndarray] = []
+
+    @property
+    def received_s(self) -> float:
+        return self._received / self.sample_rate
+
+    @property
+    def buffered_s(self) -> float:
+        """Seconds of audio held in memory: the open region, its look-back and new blocks."""
+
+        pending = sum(len(block) for block in self._pending)
+        return (len(self._samples) + pending) / self.sample_rate
+
+    def push(self, block: np.ndarray) -> List[StoryEvent]:
+        """Add a block of samples; returns the stories it allowed to be committed."""
+
+        block = np.asarray(block, dtype=np.int16)
+        if not len(block):
+            return []
+        self._pending.append(block)
+        self._received += len(block)
+        self._arrivals.append((self._received, self._clock()))
+        if (self._received - self._last_update) / self.sample_rate < self.update_s:
+            return []
+        return self._update(final=False)
+
+    def flush(self) -> List[StoryEvent]:
+        """Commit everything still open, e.g. when the stream ends."""
+
+        return self._update(final=True)
+
+    def latency_summary(self) -> Dict[str, float]:
+        latencies = np.array([event.latency_s for event in self.events], dtype=np.float64)
+        wall = np.array([event.wall_latency_s for event in self.events], dtype=np.float64)
+        if not len(latencies):
+            return {"stories": 0}
+        return {
+            "stories": len(latencies),
+            "latency_mean_s": round(float(latencies.mean()), 3),
+            "latency_p95_s": round(float(np.percentile(latencies, 95)), 3),
+            "latency_max_s": round(float(latencies.max()), 3),
+            "wall_latency_max_s": round(float(wall.max()), 3),
+        }
+
+    def _update(self, *, final: bool) -> List[StoryEvent]:
+        self._last_update = self._received
+        if self._pending:
+            self._samples = np.concatenate([self._samples, *self._pending])
+            self._pending = []
+        self._advance_vad(final=final)
+        self._advance_embeddings()
+
+        now_s = self.received_s
+        if now_s - self._open_start_s <= 0:
+            return []
+        segments = self._refine_open_region(now_s)
+        if final:
+            committed = segments
+        else:
+            cutoff = now_s - self.horizon_s
+            committed = []
+            for segment in segments[:-1]:
+                if segment.end_s > cutoff:
+                    break
+                committed.append(segment)
+            if not committed and now_s - self._open_start_s >= self.max_len_s + self.horizon_s:
+                committed = [self._forced_cut()]
+
+        events = [self._emit(segment, now_s) for segment in committed if segment.duration() > 0]
+        self._trim()
+        return events
+
+    def _refine_open_region(self, now_s: float) -> List[SegmentPlan]:
+        lookback_s = max(0.0, self._open_start_s - self.context_s)
+        timeline = self._vad_timeline(lookback_s)
+        embeddings = self._embeddings(lookback_s)
+        change_points = compute_change_points(
+            audio_embeddings=embeddings,
+            vad_segments=timeline,
+            **self.change_kwargs,
+        )
+        return refine_chunk_segments(
+            self._open_start_s,
+            now_s,
+            change_points=change_points,
+            params=self.params,
+            vad_segments=timeline,
+        )
+
+    def _forced_cut(self) -> SegmentPlan:
+        start = self._open_start_s
+        end = start + self.max_len_s
+        timeline = self._vad_timeline(start)
+        row = timeline.longest_silence_in(start + self.params.constraints.min_len, end)
+        if row is not None:
+            end = float(timeline.start_s[row] + timeline.end_s[row]) / 2
+        return SegmentPlan(start, end, FORCED_LABEL)
+
+    def _emit(self, segment: SegmentPlan, now_s: float) -> StoryEvent:
+        end_sample = int(round(segment.end_s * self.sample_rate))
+        arrived = next(
+            (wall for received, wall in self._arrivals if received >= end_sample),
+            self._clock(),
+        )
+        event = StoryEvent(
+            index=len(self.events) + 1,
+            start_s=segment.start_s,
+            end_s=segment.end_s,
+            label=segment.label,
+            emitted_at_s=now_s,
+            latency_s=max(0.0, now_s - segment.end_s),
+            wall_latency_s=max(0.0, self._clock() - arrived),
+        )
+        if self.clip_dir is not None:
+            event.clip_path = self._write_clip(event)
+        self.events.append(event)
+        self._open_start_s = segment.end_s
+        logger.info(
+            "Story committed",
+            extra={
+                "index": event.index,
+                "start": round(event.start_s, 2),
+                "end": round(event.end_s, 2),
+                "latency_s": round(event.latency_s, 2),
+            },
+        )
+        return event
+
+    def _write_clip(self, event: StoryEvent) -> Path:
+        assert self.clip_dir is not None
+        start = max(0, int(round(event.start_s * self.sample_rate)) - self._base)
+        end = max(start, int(round(event.end_s * self.sample_rate)) - self._base)
+        clip = AudioBuffer(samples=self._samples[start:end], sample_rate=self.sample_rate)
+        return clip.write_wav(self.clip_dir / f"{self.clip_stem}_segment_{event.index:03}.wav")
+
+    def _advance_vad(self, *, final: bool) -> None:
+        available = self._received - self._vad_next
+        usable = available if final else available - available % max(1, self._frame_samples)
+        if usable < max(1, self._frame_samples):
+            return
+        offset = self._vad_next - self._base
+        chunk = AudioBuffer(
+            samples=self._samples[offset : offset + usable], sample_rate=self.sample_rate
+        )
+        start_s = self._vad_next / self.sample_rate
+        for segment in run_vad(
+            chunk,
+            aggressiveness=self.vad_aggressiveness,
+            frame_duration_ms=self.vad_frame_duration_ms,
+        ):
+            is_silence = segment.label != SPEECH_LABEL
+            if self._vad_silence and self._vad_silence[-1] == is_silence:
+                self._vad_end[-1] = start_s + segment.end_s
+                continue
+            self._vad_start.append(start_s + segment.start_s)
+            self._vad_end.append(start_s + segment.end_s)
+            self._vad_silence.append(is_silence)
+        self._vad_next += usable
+
+    def _advance_embeddings(self) -> None:
+        first = self._next_window * self._hop_samples
+        available = self._received - first
+        if available < self._window_samples:
+            return
+        count = (available - self._window_samples) // self._hop_samples + 1
+        last_end = first + (count - 1) * self._hop_samples + self._window_samples
+        chunk = AudioBuffer(
+            samples=self._samples[first - self._base : last_end - self._base],
+            sample_rate=self.sample_rate,
+        )
+        vectors, starts, _ = compute_embedding_matrix(
+            chunk.as_float32(),
+            self.sample_rate,
+            window_s=self._window_s,
+            hop_ratio=self._hop_ratio,
+        )
+        self._vectors.append(vectors[:count])
+        self._window_starts.append(starts[:count] + first / self.sample_rate)
+        self._next_window += count
+
+    def _vad_timeline(self, from_s: float) -> VadTimeline:
+        end_s = np.asarray(self._vad_end, dtype=np.float64)
+        keep = slice(int(np.searchsorted(end_s, from_s, side="right")), len(end_s))
+        return VadTimeline(
+            np.asarray(self._vad_start, dtype=np.float64)[keep],
+            end_s[keep],
+            np.asarray(self._vad_silence, dtype=bool)[keep],
+        )
+
+    def _embeddings(self, from_s: float) -> EmbeddingMatrix:
+        if not self._vectors:
+            empty = np.zeros(0, dtype=np.float64)
+            return EmbeddingMatrix(np.zeros((0, 0), dtype=np.float32), empty, empty)
+        vectors = np.concatenate(self._vectors)
+        starts = np.concatenate(self._window_starts)
+        self._vectors, self._window_starts = [vectors], [starts]
+        keep = starts >= from_s
+        return EmbeddingMatrix(vectors[keep], starts[keep], starts[keep] + self._window_s)
+
+    def _trim(self) -> None:
+        """Drop audio, VAD segments and embeddings that can no longer be revisited."""
+
+        lookback_s = max(0.0, self._open_start_s - self.context_s)
+        keep_from = min(
+            int(lookback_s * self.sample_rate),
+            self._vad_next,
+            self._next_window * self._hop_samples,
+        )
+        if keep_from > self._base:
+            self._samples = self._samples[keep_from - self._base :].copy()
+            self._base = keep_from
+        drop = int(np.searchsorted(np.asarray(self._vad_end), lookback_s, side="right"))
+        if drop:
+            del self._vad_start[:drop], self._vad_end[:drop], self._vad_silence[:drop]
+        if self._window_starts:
+            starts = np.concatenate(self._window_starts)
+            keep = starts >= lookback_s
+            self._vectors = [np.concatenate(self._vectors)[keep]]
+            self._window_starts = [starts[keep]]
+        self._arrivals = [
+            arrival for arrival in self._arrivals if arrival[0] > lookback_s * self.sample_rate
+        ]
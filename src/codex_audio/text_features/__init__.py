@@ -1,5 +1,5 @@
 ﻿from .segments import TextChunk, build_text_chunks
-from .embeddings import ChunkEmbedding, embed_chunks
+from .embeddings import ChunkEmbedding, ChunkEmbeddingMatrix, embed_chunks
 from .change_points import find_text_change_candidates
 from .topic_segments import detect_topic_boundaries
 
@@ -7,6 +7,7 @@ __all__ = [
     "TextChunk",
     "build_text_chunks",
     "ChunkEmbedding",
+    "ChunkEmbeddingMatrix",
     "embed_chunks",
     "find_text_change_candidates",
     "detect_topic_boundaries",
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import math
 from typing import List, Sequence
 
+import numpy as np
+
 from codex_audio.boundary.candidates import BoundaryCandidate
+from codex_audio.features.embeddings import adjacent_cosine_similarity, embedding_bounds
 from codex_audio.text_features.embeddings import ChunkEmbedding
 
 DEFAULT_SIMILARITY_THRESHOLD = 0.7
@@ -17,27 +19,18 @@ def find_text_change_candidates(
     if threshold <= -1.0 or threshold > 1.0:
         raise ValueError("threshold must be within (-1, 1]")
 
+    similarities = adjacent_cosine_similarity(chunks)
+    starts, ends = embedding_bounds(chunks)
     candidates: List[BoundaryCandidate] = []
-    for left, right in zip(chunks, chunks[1:]):
-        similarity = _cosine_similarity(left.vector, right.vector)
-        if similarity < threshold:
-            boundary_time = (left.text.end_s + right.text.start_s) / 2
-            candidates.append(
-                BoundaryCandidate(
-                    time_s=boundary_time,
-                    score=SEMANTIC_SHIFT_SCORE,
-                    reason=f"{SEMANTIC_SHIFT_REASON}_{similarity:.2f}",
-                )
+    for idx in np.flatnonzero(similarities < threshold):
+        similarity = float(similarities[idx])
+        boundary_time = float(ends[idx] + starts[idx + 1]) / 2
+        candidates.append(
+            BoundaryCandidate(
+                time_s=boundary_time,
+                score=SEMANTIC_SHIFT_SCORE,
+                reason=f"{SEMANTIC_SHIFT_REASON}_{similarity:.2f}",
             )
+        )
     return candidates
 
-
-def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
-    if len(a) != len(b):
-        raise ValueError("Embedding vectors must have the same length")
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(y * y for y in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
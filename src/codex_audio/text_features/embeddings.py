@@ -2,11 +2,17 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from typing import Any, List, Optional, Sequence, Tuple
 
-from openai import AzureOpenAI
+import numpy as np
 
+from codex_audio.features.embeddings import EmbeddingMatrix
 from codex_audio.text_features import TextChunk
+from codex_audio.utils.clients import ClientCache
+from codex_audio.utils.lazy import LazyImports
+
+_lazy = LazyImports(globals(), AzureOpenAI="openai:AzureOpenAI")
+__getattr__ = _lazy.module_getattr
 
 DEFAULT_EMBED_MODEL = "text-embedding-3-small"
 DEFAULT_API_VERSION = "2024-02-01"
@@ -18,6 +24,30 @@ class ChunkEmbedding:
     vector: List[float]
 
 
+class ChunkEmbeddingMatrix(EmbeddingMatrix):
+    """Text chunk embeddings stored as one float32 matrix; rows are ``ChunkEmbedding``."""
+
+    def __init__(self, chunks: Sequence[TextChunk], vectors: np.ndarray) -> None:
+        self.chunks = list(chunks)
+        super().__init__(
+            vectors,
+            [chunk.start_s for chunk in self.chunks],
+            [chunk.end_s for chunk in self.chunks],
+        )
+
+    @classmethod
+    def from_embeddings(cls, embeddings: Sequence[ChunkEmbedding]) -> "ChunkEmbeddingMatrix":
+        if isinstance(embeddings, ChunkEmbeddingMatrix):
+            return embeddings
+        return cls([emb.text for emb in embeddings], [emb.vector for emb in embeddings])
+
+    def _row(self, row: int) -> ChunkEmbedding:
+        return ChunkEmbedding(text=self.chunks[row], vector=self.vectors[row].tolist())
+
+    def _take(self, index: slice) -> "ChunkEmbeddingMatrix":
+        return ChunkEmbeddingMatrix(self.chunks[index], self.vectors[index])
+
+
 def embed_chunks(
     chunks: Sequence[TextChunk],
     *,
@@ -25,24 +55,51 @@ def embed_chunks(
     api_version: Optional[str] = None,
     key: Optional[str] = None,
     endpoint: Optional[str] = None,
-) -> List[ChunkEmbedding]:
+    clients: Optional[ClientCache] = None,
+) -> ChunkEmbeddingMatrix:
     if not chunks:
-        return []
+        return ChunkEmbeddingMatrix([], np.zeros((0, 0), dtype=np.float32))
 
-    api_key = key or os.getenv("AZURE_OPENAI_KEY") or os.getenv("OPENAI_API_KEY")
-    azure_endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
-    if not api_key or not azure_endpoint:
-        raise ValueError("Azure OpenAI key/endpoint must be provided via args or environment")
-
-    client = AzureOpenAI(
-        api_key=api_key,
-        api_version=api_version or os.getenv("AZURE_OPENAI_API_VERSION", DEFAULT_API_VERSION),
-        azure_endpoint=azure_endpoint,
+    client = azure_openai_client(
+        key=key, endpoint=endpoint, api_version=api_version, clients=clients
     )
-
     inputs = [chunk.text for chunk in chunks]
     response = client.embeddings.create(model=model, input=inputs)
     vectors = [data.embedding for data in response.data]
     if len(vectors) != len(chunks):
         raise RuntimeError("Embedding count does not match chunk count")
-    return [ChunkEmbedding(text=chunk, vector=vector) for chunk, vector in zip(chunks, vectors)]
+    return ChunkEmbeddingMatrix(chunks, vectors)
+
+
+def resolve_azure_openai(
+    key: Optional[str] = None, endpoint: Optional[str] = None, api_version: Optional[str] = None
+) -> Tuple[str, str, str]:
+    """``(key, endpoint, api_version)`` from the arguments, falling back to the environment."""
+
+    api_key = key or os.getenv("AZURE_OPENAI_KEY") or os.getenv("OPENAI_API_KEY")
+    azure_endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
+    if not api_key or not azure_endpoint:
+        raise ValueError("Azure OpenAI key/endpoint must be provided via args or environment")
+    version = api_version or os.getenv("AZURE_OPENAI_API_VERSION", DEFAULT_API_VERSION)
+    return api_key, azure_endpoint, version
+
+
+def azure_openai_client(
+    *,
+    key: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    api_version: Optional[str] = None,
+    clients: Optional[ClientCache] = None,
+) -> Any:
+    """An ``AzureOpenAI`` client, reused from ``clients`` when one is given."""
+
+    api_key, azure_endpoint, version = resolve_azure_openai(key, endpoint, api_version)
+
+    def build() -> Any:
+        return _lazy("AzureOpenAI")(
+            api_key=api_key, api_version=version, azure_endpoint=azure_endpoint
+        )
+
+    if clients is None:
+        return build()
+    return clients.get(("azure_openai", api_key, azure_endpoint, version), build)
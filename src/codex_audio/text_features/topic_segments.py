@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import random
 import re
 from bisect import bisect_left
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, Iterator, List, Sequence
+from functools import partial
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Sequence
 
-from openai import AzureOpenAI
 
 from codex_audio.boundary.candidates import BoundaryCandidate
 from codex_audio.transcription import TranscriptWord
+from codex_audio.text_features.embeddings import azure_openai_client
+from codex_audio.utils import get_logger
+from codex_audio.utils.clients import ClientCache
+from codex_audio.utils.rate_limit import TokenBucket
+
+logger = get_logger(__name__)
 
 DEFAULT_LLM_MODEL = os.getenv("AZURE_OPENAI_LLM_MODEL", "gpt-4o-mini")
 DEFAULT_SYSTEM_PROMPT = (
@@ -25,6 +34,10 @@ DEFAULT_SYSTEM_PROMPT = (
 WINDOW_DURATION_S = 10 * 60  # 10-minute content windows keep context tight
 WINDOW_OVERLAP_S = 2 * 60    # 2-minute overlap lets adjacent windows vote
 MERGE_TOLERANCE_S = 5.0      # boundaries agreeing within 5s collapse into one
+DEFAULT_LLM_CONCURRENCY = 4  # windows in flight at once
+DEFAULT_LLM_MAX_RETRIES = 5  # retries of a window rejected with HTTP 429
+RETRY_BASE_DELAY_S = 1.0     # backoff doubles from here when no Retry-After is sent
+RETRY_MAX_DELAY_S = 60.0
 BASE_SCORE = 3.0
 VOTE_BONUS = 0.5
 BOUNDARY_TYPES = {
@@ -38,6 +51,9 @@ BOUNDARY_TYPES = {
 }
 
 ResponseProvider = Callable[[str, str, str | None, str | None, str | None, str], str]
+AsyncResponseProvider = Callable[
+    [str, str, str | None, str | None, str | None, str], Awaitable[str]
+]
 
 
 @dataclass(frozen=True)
@@ -57,26 +73,118 @@ def detect_topic_boundaries(
     endpoint: str | None = None,
     api_version: str | None = None,
     response_provider: ResponseProvider | None = None,
+    async_response_provider: AsyncResponseProvider | None = None,
+    max_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    requests_per_minute: float | None = None,
+    max_retries: int = DEFAULT_LLM_MAX_RETRIES,
+    clients: ClientCache | None = None,
 ) -> List[BoundaryCandidate]:
+    """Blocking wrapper around :func:`detect_topic_boundaries_async`.
+
+    Runs on a fresh event loop, so call the async version from async code.
+    """
+
+    return asyncio.run(
+        detect_topic_boundaries_async(
+            words,
+            model=model,
+            system_prompt=system_prompt,
+            key=key,
+            endpoint=endpoint,
+            api_version=api_version,
+            response_provider=response_provider,
+            async_response_provider=async_response_provider,
+            max_concurrency=max_concurrency,
+            requests_per_minute=requests_per_minute,
+            max_retries=max_retries,
+            clients=clients,
+        )
+    )
+
+
+async def detect_topic_boundaries_async(
+    words: Sequence[TranscriptWord],
+    *,
+    model: str | None = None,
+    system_prompt: str | None = None,
+    key: str | None = None,
+    endpoint: str | None = None,
+    api_version: str | None = None,
+    response_provider: ResponseProvider | None = None,
+    async_response_provider: AsyncResponseProvider | None = None,
+    max_concurrency: int = DEFAULT_LLM_CONCURRENCY,
+    requests_per_minute: float | None = None,
+    max_retries: int = DEFAULT_LLM_MAX_RETRIES,
+    clients: ClientCache | None = None,
+) -> List[BoundaryCandidate]:
+    """Ask the LLM for story boundaries in overlapping windows and merge their votes.
+
+    Up to ``max_concurrency`` windows are in flight at once. With
+    ``requests_per_minute`` set, a token bucket also spaces out the calls. A
+    call rejected with HTTP 429 is retried after its ``Retry-After`` delay, or
+    after an exponential backoff, up to ``max_retries`` times. A sync
+    ``response_provider`` runs on a thread pool; ``async_response_provider``
+    is awaited on the loop. Without either, every window shares one Azure
+    OpenAI client, taken from ``clients`` when given, with the SDK's own
+    retries turned off so the limits above are the only ones. Responses are merged in
+    window order, so the result does not depend on which window finished first.
+    """
+
     word_list = list(words)
     if not word_list:
         return []
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    args = (
+        model or DEFAULT_LLM_MODEL,
+        key or os.getenv("AZURE_OPENAI_KEY"),
+        endpoint or os.getenv("AZURE_OPENAI_ENDPOINT"),
+        api_version or os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+        system_prompt or DEFAULT_SYSTEM_PROMPT,
+    )
+    prompts = [_build_prompt(window_words) for window_words in _iter_windows(word_list)]
+    bucket = TokenBucket(requests_per_minute / 60.0) if requests_per_minute else None
+    semaphore = asyncio.Semaphore(max_concurrency)
+    pool: Optional[ThreadPoolExecutor] = None
+    if async_response_provider is None:
+        provider = response_provider
+        if provider is None:
+            client = azure_openai_client(
+                key=args[1], endpoint=args[2], api_version=args[3], clients=clients
+            )
+            # The SDK retries 429s on its own, unseen by the bucket; leave
+            # retrying to _call_with_retries. The copy shares the connection pool.
+            provider = partial(_call_chat_completion, client.with_options(max_retries=0))
+        pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        loop = asyncio.get_running_loop()
 
-    provider = response_provider or _call_chat_completion
-    aggregate_entries: List[ParsedBoundary] = []
+        def call(prompt: str) -> Awaitable[str]:
+            return loop.run_in_executor(pool, provider, prompt, *args)
+
+    else:
+        async_provider = async_response_provider
 
-    for window_words in _iter_windows(word_list):
-        prompt = _build_prompt(window_words)
-        response_text = provider(
-            prompt,
-            model or DEFAULT_LLM_MODEL,
-            key or os.getenv("AZURE_OPENAI_KEY"),
-            endpoint or os.getenv("AZURE_OPENAI_ENDPOINT"),
-            api_version or os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
-            system_prompt or DEFAULT_SYSTEM_PROMPT,
+        def call(prompt: str) -> Awaitable[str]:
+            return async_provider(prompt, *args)
+
+    async def dispatch(index: int, prompt: str) -> str:
+        async with semaphore:
+            return await _call_with_retries(
+                call, prompt, index=index, bucket=bucket, max_retries=max_retries
+            )
+
+    try:
+        responses = await asyncio.gather(
+            *(dispatch(index, prompt) for index, prompt in enumerate(prompts))
         )
-        aggregate_entries.extend(_parse_boundaries(response_text))
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
 
+    aggregate_entries: List[ParsedBoundary] = []
+    for response_text in responses:
+        aggregate_entries.extend(_parse_boundaries(response_text))
     merged_entries = _merge_boundary_votes(aggregate_entries)
     return [
         BoundaryCandidate(
@@ -91,6 +199,50 @@ def detect_topic_boundaries(
     ]
 
 
+async def _call_with_retries(
+    call: Callable[[str], Awaitable[str]],
+    prompt: str,
+    *,
+    index: int,
+    bucket: TokenBucket | None,
+    max_retries: int,
+) -> str:
+    attempt = 0
+    while True:
+        if bucket is not None:
+            await bucket.acquire()
+        try:
+            return await call(prompt)
+        except Exception as exc:
+            if attempt >= max_retries or not _is_rate_limited(exc):
+                raise
+            delay = _retry_delay(exc, attempt)
+            logger.info(
+                "LLM window rate limited; retrying",
+                extra={"window": index, "attempt": attempt + 1, "delay_s": round(delay, 2)},
+            )
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429
+
+
+def _retry_delay(exc: BaseException, attempt: int) -> float:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        # Jitter keeps windows throttled together from retrying in lockstep.
+        backoff = RETRY_BASE_DELAY_S * (2**attempt) * random.uniform(0.5, 1.0)
+        return min(RETRY_MAX_DELAY_S, backoff)
+    return min(RETRY_MAX_DELAY_S, max(0.0, retry_after))
+
+
 def _build_prompt(words: Sequence[TranscriptWord]) -> str:
     if not words:
         return "Analyze the transcript and return JSON boundaries."
@@ -114,6 +266,7 @@ def _build_prompt(words: Sequence[TranscriptWord]) -> str:
 
 
 def _call_chat_completion(
+    client: Any,
     prompt: str,
     model: str,
     key: str | None,
@@ -121,9 +274,6 @@ def _call_chat_completion(
     api_version: str,
     system_prompt: str,
 ) -> str:
-    if not key or not endpoint:
-        raise ValueError("Azure OpenAI key/endpoint must be configured")
-    client = AzureOpenAI(api_key=key, api_version=api_version, azure_endpoint=endpoint)
     response = client.chat.completions.create(
         model=model,
         temperature=0.2,
@@ -300,4 +450,4 @@ def _coerce_confidence(value: object) -> float | None:
     return confidence
 
 
-__all__ = ["detect_topic_boundaries"]
+__all__ = ["detect_topic_boundaries", "detect_topic_boundaries_async"]
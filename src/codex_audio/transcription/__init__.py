@@ -1,15 +1,20 @@
 ﻿from .azure_speech import (
+    QuoteIndex,
     TranscriptWord,
     TranscriptionOutput,
     match_quote_to_timestamps,
     refine_range_with_silence,
     transcribe_audio,
 )
+from .chunked import plan_transcription_chunks, transcribe_chunked
 
 __all__ = [
+    "QuoteIndex",
     "TranscriptWord",
     "TranscriptionOutput",
     "transcribe_audio",
     "match_quote_to_timestamps",
     "refine_range_with_silence",
+    "plan_transcription_chunks",
+    "transcribe_chunked",
 ]
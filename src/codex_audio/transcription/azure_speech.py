@@ -8,25 +8,27 @@ import threading
 from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 import warnings
 
-try:
-    import azure.cognitiveservices.speech as speechsdk
-except ImportError:  # pragma: no cover - dependency handled via optional install
-    speechsdk = None  # type: ignore[assignment]
+from codex_audio.features.silence import SilenceMap
+from codex_audio.ingest import AudioBuffer
+from codex_audio.utils.clients import ClientCache
+from codex_audio.utils.lazy import LazyImports
 
-try:
+if TYPE_CHECKING:  # pragma: no cover
     from pydub import AudioSegment
-    from pydub.silence import detect_silence
-except ImportError:  # pragma: no cover - dependency handled via optional install
-    AudioSegment = None  # type: ignore[assignment]
-    detect_silence = None  # type: ignore[assignment]
 
-try:
-    from thefuzz import fuzz
-except ImportError:  # pragma: no cover - dependency handled via optional install
-    fuzz = None  # type: ignore[assignment]
+# Optional SDKs load on first use and are ``None`` when not installed.
+_lazy = LazyImports(
+    globals(),
+    optional=True,
+    speechsdk="azure.cognitiveservices.speech",
+    AudioSegment="pydub:AudioSegment",
+    detect_silence="pydub.silence:detect_silence",
+    fuzz="thefuzz.fuzz",
+)
+__getattr__ = _lazy.module_getattr
 
 _WORD_TIMING_SCALE = 10_000_000  # Azure offset/duration unit is 100-ns
 
@@ -62,6 +64,24 @@ class TranscriptionOutput:
             "raw": self.raw,
         }
 
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "TranscriptionOutput":
+        words = [
+            TranscriptWord(
+                text=str(item.get("text", "")),
+                start_s=float(item.get("start", 0.0)),
+                end_s=float(item.get("end", 0.0)),
+                speaker_id=item.get("speaker"),
+            )
+            for item in payload.get("words") or []
+        ]
+        return cls(
+            words=words,
+            model=str(payload.get("model", "azure-stt")),
+            language=str(payload.get("language", "en-US")),
+            raw=dict(payload.get("raw") or {}),
+        )
+
 
 class TranscriptionError(RuntimeError):
     """Raised when Azure STT fails to return a valid transcript."""
@@ -69,20 +89,26 @@ class TranscriptionError(RuntimeError):
 
 
 def transcribe_audio(
-    audio_path: Path,
+    audio: Path | AudioBuffer,
     *,
     key: Optional[str] = None,
     region: Optional[str] = None,
     language: str = "en-US",
     diarization_enabled: bool = False,
     max_speakers: Optional[int] = None,
+    clients: Optional[ClientCache] = None,
 ) -> TranscriptionOutput:
+    speechsdk = _lazy("speechsdk")
     if speechsdk is None:
         raise RuntimeError(
             "azure-cognitiveservices-speech is not installed. Install it to enable transcription."
         )
 
-    audio_path = audio_path.expanduser().resolve()
+    if isinstance(audio, AudioBuffer):
+        if audio.path is None:
+            raise ValueError("AudioBuffer must be written to a WAV before transcription")
+        audio = audio.path
+    audio_path = audio.expanduser().resolve()
     if not audio_path.exists():
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
@@ -91,11 +117,18 @@ def transcribe_audio(
     if not subscription_key or not service_region:
         raise ValueError("Azure Speech key/region must be provided via args or environment")
 
-    speech_config = speechsdk.SpeechConfig(subscription=subscription_key, region=service_region)
-    speech_config.speech_recognition_language = language
-    speech_config.request_word_level_timestamps()
-    speech_config.output_format = speechsdk.OutputFormat.Detailed
-
+    def build_config() -> Any:
+        config = speechsdk.SpeechConfig(subscription=subscription_key, region=service_region)
+        config.speech_recognition_language = language
+        config.request_word_level_timestamps()
+        config.output_format = speechsdk.OutputFormat.Detailed
+        return config
+
+    speech_config = (
+        clients.get(("azure_speech", subscription_key, service_region, language), build_config)
+        if clients is not None
+        else build_config()
+    )
     audio_config = speechsdk.audio.AudioConfig(filename=str(audio_path))
     if diarization_enabled:
         try:
@@ -130,6 +163,7 @@ def transcribe_audio(
 
 
 def _transcribe_with_recognizer(recognizer: Any) -> Tuple[List[TranscriptWord], Dict[str, Any]]:
+    speechsdk = _lazy("speechsdk")
     result = recognizer.recognize_once_async().get()
     if result.reason == speechsdk.ResultReason.Canceled:
         details = speechsdk.CancellationDetails(result)
@@ -149,7 +183,7 @@ def _transcribe_with_conversation(
     language: str,
     max_speakers: Optional[int],
 ) -> Tuple[List[TranscriptWord], Dict[str, Any]]:
-    transcription_module = getattr(speechsdk, 'transcription', None)
+    transcription_module = getattr(_lazy("speechsdk"), 'transcription', None)
     if transcription_module is None:
         raise TranscriptionError('Azure Speech transcription module unavailable')
     transcriber_cls = getattr(transcription_module, 'ConversationTranscriber', None)
@@ -226,14 +260,69 @@ def _extract_words(payload: Dict[str, Any]) -> List[TranscriptWord]:
     return words
 
 
+DEFAULT_QUOTE_HINT_WINDOW_S = 90.0
+
+_Match = Tuple[int, int, int]  # start_ms, end_ms, ratio
+
+
+class QuoteIndex:
+    """Normalized transcript words, indexed by first token, for quote alignment.
+
+    Build it once per transcript and pass it to :func:`match_quote_to_timestamps`
+    for every quote. A verbatim quote is found by looking up where its first
+    token occurs, without fuzzy-scoring a single window. Fuzzy matches still
+    score every window: ``token_set_ratio`` also rewards partial string overlap,
+    so a window sharing no token with the quote can still reach ``min_ratio``.
+    """
+
+    def __init__(self, transcript_words: Sequence[TranscriptWord]) -> None:
+        self.words = list(transcript_words)
+        self.normalized = [_normalize_text(word.text) for word in self.words]
+        self.first_token: Dict[str, List[int]] = {}
+        # Earliest start whose window text is identical to the one starting here
+        # (leading words that normalize to nothing are dropped from the text).
+        self.empty_run_start: List[int] = []
+
+        run_start = 0
+        for idx, text in enumerate(self.normalized):
+            self.empty_run_start.append(run_start)
+            if not text:
+                continue
+            run_start = idx + 1
+            self.first_token.setdefault(text.split()[0], []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def starts_near(self, time_s: float, radius_s: float) -> List[int]:
+        """Start indices of the words beginning within ``radius_s`` of ``time_s``."""
+
+        return [
+            idx for idx, word in enumerate(self.words) if abs(word.start_s - time_s) <= radius_s
+        ]
+
+
 def match_quote_to_timestamps(
     quote: str,
     transcript_words: Sequence[TranscriptWord],
     *,
     min_ratio: int = 80,
     window_expansion: int = 5,
+    index: Optional[QuoteIndex] = None,
+    time_hint_s: Optional[float] = None,
+    hint_window_s: float = DEFAULT_QUOTE_HINT_WINDOW_S,
+    exhaustive: bool = False,
 ) -> Optional[Tuple[int, int]]:
-    """Return the best (start_ms, end_ms) that matches the quote via fuzzy matching."""
+    """Return the best (start_ms, end_ms) that matches the quote via fuzzy matching.
+
+    Verbatim quotes are located through ``index`` (built from ``transcript_words``
+    when omitted) and resolve to the first exact occurrence, as a full scan would.
+    Otherwise every window is scored, each distinct window text once. With
+    ``time_hint_s`` the windows starting within ``hint_window_s`` of the hint
+    are tried first, and the whole transcript only when none of them reaches
+    ``min_ratio``. ``exhaustive=True`` ignores the hint, the reference the
+    default search is tested against.
+    """
 
     if not quote.strip() or not transcript_words:
         return None
@@ -242,71 +331,142 @@ def match_quote_to_timestamps(
     if not normalized_quote:
         return None
 
+    index = index if index is not None else QuoteIndex(transcript_words)
     quote_tokens = normalized_quote.split()
-    target_window = max(1, len(quote_tokens))
-    normalized_words = [_normalize_text(word.text) for word in transcript_words]
-
-    best: Tuple[int, int, int] | None = None
-    total_words = len(transcript_words)
-    for start_idx in range(total_words):
-        builder: list[str] = []
-        for offset in range(target_window + window_expansion):
-            idx = start_idx + offset
-            if idx >= total_words:
-                break
-            builder.append(normalized_words[idx])
-            candidate = " ".join(filter(None, builder)).strip()
-            if not candidate:
-                continue
+    window = max(1, len(quote_tokens)) + window_expansion
+    if exhaustive:
+        time_hint_s = None
+
+    exact_starts = [
+        start_idx
+        for word_idx in index.first_token.get(quote_tokens[0], ())
+        for start_idx in range(index.empty_run_start[word_idx], word_idx + 1)
+    ]
+    near_hint = index.starts_near(time_hint_s, hint_window_s) if time_hint_s is not None else []
+    hinted: List[List[int]] = [exact_starts]
+    if time_hint_s is not None:
+        hinted.insert(0, sorted(set(exact_starts).intersection(near_hint)))
+    for starts in hinted:
+        for start_idx in starts:
+            exact = _scan_quote_window(index, start_idx, window, normalized_quote, None)
+            if exact is not None:
+                return exact[0], exact[1]
+
+    searches: List[Sequence[int]] = [range(len(index))]
+    if near_hint:
+        searches.insert(0, near_hint)
+    ratios: Dict[str, int] = {}
+    for starts in searches:
+        best: Optional[_Match] = None
+        for start_idx in starts:
+            best = _scan_quote_window(
+                index, start_idx, window, normalized_quote, min_ratio, best, ratios
+            )
+        if best is not None:
+            return best[0], best[1]
+    return None
+
+
+def _scan_quote_window(
+    index: QuoteIndex,
+    start_idx: int,
+    window: int,
+    normalized_quote: str,
+    min_ratio: Optional[int],
+    best: Optional[_Match] = None,
+    ratios: Optional[Dict[str, int]] = None,
+) -> Optional[_Match]:
+    """Score every window starting at ``start_idx``.
+
+    With ``min_ratio=None`` only an exact match is looked for (returned with ratio
+    100, or ``None``); otherwise returns the better of ``best`` and the windows here.
+    ``ratios`` memoizes scores by window text, which repeats across starts.
+    """
+
+    words = index.words
+    builder: list[str] = []
+    for offset in range(window):
+        idx = start_idx + offset
+        if idx >= len(words):
+            break
+        builder.append(index.normalized[idx])
+        candidate = " ".join(filter(None, builder)).strip()
+        if not candidate:
+            continue
+        start_ms = int(words[start_idx].start_s * 1000)
+        end_ms = int(words[idx].end_s * 1000)
+        if min_ratio is None:
             if candidate == normalized_quote:
-                start_ms = int(transcript_words[start_idx].start_s * 1000)
-                end_ms = int(transcript_words[idx].end_s * 1000)
-                return start_ms, end_ms
+                return start_ms, end_ms, 100
+            continue
+        ratio = ratios.get(candidate) if ratios is not None else None
+        if ratio is None:
             ratio = _fuzzy_ratio(candidate, normalized_quote)
-            if ratio < min_ratio:
-                continue
-            start_ms = int(transcript_words[start_idx].start_s * 1000)
-            end_ms = int(transcript_words[idx].end_s * 1000)
-            if best is None:
-                best = (start_ms, end_ms, ratio)
-                continue
-            best_duration = best[1] - best[0]
-            duration = end_ms - start_ms
-            if ratio > best[2] or (
-                ratio == best[2]
-                and (
-                    duration > best_duration
-                    or (duration == best_duration and start_ms < best[0])
-                )
-            ):
-                best = (start_ms, end_ms, ratio)
-
-    if best is None:
-        return None
-    return best[0], best[1]
+            if ratios is not None:
+                ratios[candidate] = ratio
+        if ratio < min_ratio:
+            continue
+        if best is None:
+            best = (start_ms, end_ms, ratio)
+            continue
+        best_duration = best[1] - best[0]
+        duration = end_ms - start_ms
+        if ratio > best[2] or (
+            ratio == best[2]
+            and (
+                duration > best_duration
+                or (duration == best_duration and start_ms < best[0])
+            )
+        ):
+            best = (start_ms, end_ms, ratio)
+    return best
 
 
 def refine_range_with_silence(
-    audio_path: Path,
+    audio: Path | AudioBuffer,
     match_range_ms: Tuple[int, int],
     *,
     lookaround_ms: int = 500,
     min_gap_ms: int = 120,
     silence_margin_db: float = 16.0,
+    silence_map: Optional[SilenceMap] = None,
 ) -> Tuple[int, int]:
-    """Snap the provided range to the nearest silence gap using +/- lookaround_ms."""
-
-    if AudioSegment is None or detect_silence is None:
+    """Snap the provided range to the nearest silence gap using +/- lookaround_ms.
+
+    Pass a ``silence_map`` built with the same ``min_gap_ms``/``silence_margin_db``
+    when refining many ranges of one recording; the gaps are then looked up
+    instead of re-detected around every boundary.
+    """
+
+    if silence_map is not None:
+        if (silence_map.min_gap_ms, silence_map.silence_margin_db) != (
+            min_gap_ms,
+            silence_margin_db,
+        ):
+            raise ValueError("silence_map was built with different gap settings")
+        duration_ms = silence_map.duration_ms
+        start_ms = max(0, min(match_range_ms[0], duration_ms))
+        end_ms = max(start_ms + 1, min(match_range_ms[1], duration_ms))
+        start_ms = silence_map.snap(start_ms, lookaround_ms=lookaround_ms, prefer="end")
+        end_ms = silence_map.snap(end_ms, lookaround_ms=lookaround_ms, prefer="start")
+        if end_ms <= start_ms:
+            end_ms = min(duration_ms, start_ms + max(lookaround_ms, 50))
+        return start_ms, end_ms
+
+    if _lazy("AudioSegment") is None or _lazy("detect_silence") is None:
         raise RuntimeError("pydub is not installed; install it to refine timestamps")
 
-    audio = AudioSegment.from_file(audio_path)
-    duration_ms = len(audio)
+    if isinstance(audio, AudioBuffer):
+        segment = audio.as_audio_segment()
+    else:
+        segment = _lazy("AudioSegment").from_file(audio)
+    duration_ms = len(segment)
     start_ms = max(0, min(match_range_ms[0], duration_ms))
     end_ms = max(start_ms + 1, min(match_range_ms[1], duration_ms))
-    silence_thresh = audio.dBFS - silence_margin_db
+    silence_thresh = segment.dBFS - silence_margin_db
 
     start_ms = _snap_to_silence(
-        audio,
+        segment,
         target_ms=start_ms,
         lookaround_ms=lookaround_ms,
         min_gap_ms=min_gap_ms,
@@ -314,7 +474,7 @@ def refine_range_with_silence(
         prefer="end",
     )
     end_ms = _snap_to_silence(
-        audio,
+        segment,
         target_ms=end_ms,
         lookaround_ms=lookaround_ms,
         min_gap_ms=min_gap_ms,
@@ -341,7 +501,9 @@ def _snap_to_silence(
         return target_ms
 
     segment = audio[window_start:window_end]
-    gaps = detect_silence(segment, min_silence_len=min_gap_ms, silence_thresh=silence_thresh)
+    gaps = _lazy("detect_silence")(
+        segment, min_silence_len=min_gap_ms, silence_thresh=silence_thresh
+    )
     if not gaps:
         return target_ms
 
@@ -361,6 +523,7 @@ def _snap_to_silence(
 
 
 def _fuzzy_ratio(candidate: str, quote: str) -> int:
+    fuzz = _lazy("fuzz")
     if fuzz is not None:
         return int(fuzz.token_set_ratio(candidate, quote))
     return int(SequenceMatcher(None, candidate, quote).ratio() * 100)
@@ -371,6 +534,7 @@ def _normalize_text(text: str) -> str:
 
 
 def _enable_diarization(target: Any, enabled: bool, max_speakers: Optional[int]) -> None:
+    speechsdk = _lazy("speechsdk")
     if not enabled or speechsdk is None:
         return
     diarization_cls = getattr(speechsdk, "SpeakerDiarizationConfig", None)
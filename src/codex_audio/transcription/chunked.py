@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from codex_audio.features.vad import SILENCE_LABEL, VadSegment
+from codex_audio.ingest import AudioBuffer
+from codex_audio.transcription.azure_speech import (
+    TranscriptionOutput,
+    TranscriptWord,
+    transcribe_audio,
+)
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TARGET_CHUNK_S = 600.0
+DEFAULT_MIN_SPLIT_SILENCE_S = 0.5
+DEFAULT_SEAM_OVERLAP_S = 4.0
+DEFAULT_TRANSCRIPTION_WORKERS = 4
+SPEAKER_MATCH_TOLERANCE_S = 0.3
+
+Transcriber = Callable[..., TranscriptionOutput]
+
+
+@dataclass
+class TranscriptionChunk:
+    """One recognizer session: ``[start_s, end_s)`` plus a little overlap on each side.
+
+    ``seam_start_s``/``seam_end_s`` are the silence midpoints the chunk owns words
+    between; the overlap around them is transcribed twice and only used to match
+    speakers across the seam.
+    """
+
+    index: int
+    start_s: float
+    end_s: float
+    seam_start_s: float
+    seam_end_s: float
+
+
+def plan_transcription_chunks(
+    duration_s: float,
+    vad_segments: Sequence[VadSegment],
+    *,
+    target_chunk_s: float = DEFAULT_TARGET_CHUNK_S,
+    min_silence_s: float = DEFAULT_MIN_SPLIT_SILENCE_S,
+    overlap_s: float = DEFAULT_SEAM_OVERLAP_S,
+) -> List[TranscriptionChunk]:
+    """Split ``[0, duration_s)`` into roughly ``target_chunk_s`` pieces at long silences.
+
+    Each cut goes at the midpoint of the silence closest to the ideal cut point
+    within half a chunk of it, so words are not split mid-utterance. If there is
+    no such silence the cut falls on the ideal point.
+    """
+
+    if target_chunk_s <= 0:
+        raise ValueError("target_chunk_s must be positive")
+    if duration_s <= 0:
+        return []
+
+    silence_midpoints = sorted(
+        (seg.start_s + seg.end_s) / 2
+        for seg in vad_segments
+        if seg.label == SILENCE_LABEL and seg.duration() >= min_silence_s
+    )
+    seams = [0.0]
+    cursor = 0.0
+    while duration_s - cursor > target_chunk_s * 1.5:
+        ideal = cursor + target_chunk_s
+        low, high = cursor + target_chunk_s / 2, cursor + target_chunk_s * 1.5
+        options = [mid for mid in silence_midpoints if low <= mid <= high]
+        if options:
+            cut = min(options, key=lambda mid: abs(mid - ideal))
+        else:
+            logger.debug("No silence near transcription cut", extra={"cut_s": ideal})
+            cut = ideal
+        seams.append(cut)
+        cursor = cut
+    seams.append(duration_s)
+
+    half_overlap = max(0.0, overlap_s) / 2
+    return [
+        TranscriptionChunk(
+            index=idx,
+            start_s=max(0.0, seam_start - half_overlap),
+            end_s=min(duration_s, seam_end + half_overlap),
+            seam_start_s=seam_start,
+            seam_end_s=seam_end,
+        )
+        for idx, (seam_start, seam_end) in enumerate(zip(seams, seams[1:]))
+    ]
+
+
+def transcribe_chunked(
+    audio: AudioBuffer,
+    vad_segments: Sequence[VadSegment],
+    *,
+    transcriber: Optional[Transcriber] = None,
+    target_chunk_s: float = DEFAULT_TARGET_CHUNK_S,
+    overlap_s: float = DEFAULT_SEAM_OVERLAP_S,
+    max_workers: int = DEFAULT_TRANSCRIPTION_WORKERS,
+    work_dir: Optional[Path] = None,
+    **transcribe_kwargs: Any,
+) -> TranscriptionOutput:
+    """Transcribe ``audio`` as concurrent recognizer sessions and stitch the results.
+
+    Word offsets are re-based onto the full file, each word is kept from the
+    chunk that owns its seam interval, and per-session speaker labels are mapped
+    onto the first chunk's labels using the words both sessions heard in the
+    overlap. ``transcriber`` defaults to :func:`transcribe_audio`; it receives an
+    ``AudioBuffer`` already written to a WAV plus ``transcribe_kwargs``.
+    """
+
+    transcribe = transcriber or transcribe_audio
+    chunks = plan_transcription_chunks(
+        audio.duration_s, vad_segments, target_chunk_s=target_chunk_s, overlap_s=overlap_s
+    )
+    if len(chunks) <= 1:
+        if audio.path is None:
+            raise ValueError("AudioBuffer must be written to a WAV before transcription")
+        return transcribe(audio, **transcribe_kwargs)
+
+    with tempfile.TemporaryDirectory(dir=work_dir, prefix="stt-chunks-") as tmp:
+        chunk_dir = Path(tmp)
+
+        def run_chunk(chunk: TranscriptionChunk) -> TranscriptionOutput:
+            piece = audio.slice(chunk.start_s, chunk.end_s)
+            piece.write_wav(chunk_dir / f"chunk_{chunk.index:03d}.wav")
+            output = transcribe(piece, **transcribe_kwargs)
+            return _rebase(output, chunk.start_s)
+
+        workers = max(1, min(max_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt") as pool:
+            outputs = list(pool.map(run_chunk, chunks))
+
+    logger.info(
+        "Chunked transcription finished",
+        extra={
+            "chunks": len(chunks),
+            "workers": workers,
+            "words": sum(len(output.words) for output in outputs),
+        },
+    )
+    return stitch_transcriptions(chunks, outputs)
+
+
+def stitch_transcriptions(
+    chunks: Sequence[TranscriptionChunk], outputs: Sequence[TranscriptionOutput]
+) -> TranscriptionOutput:
+    """Merge re-based chunk transcripts into one, reconciling speakers at each seam."""
+
+    words: List[TranscriptWord] = []
+    previous: List[TranscriptWord] = []
+    previous_end_s = 0.0
+    known_speakers: set[str] = set()
+    for chunk, output in zip(chunks, outputs):
+        mapping = _speaker_mapping(previous, output.words, chunk.start_s, previous_end_s)
+        for speaker in {word.speaker_id for word in output.words if word.speaker_id}:
+            if speaker not in mapping:
+                # Unmatched speakers get a label no earlier chunk has used.
+                label = speaker if chunk.index == 0 else f"{speaker}@{chunk.index}"
+                mapping[speaker] = label
+        relabeled = [
+            TranscriptWord(
+                text=word.text,
+                start_s=word.start_s,
+                end_s=word.end_s,
+                speaker_id=mapping.get(word.speaker_id) if word.speaker_id else None,
+            )
+            for word in output.words
+        ]
+        known_speakers.update(mapping.values())
+        words.extend(
+            word
+            for word in relabeled
+            if chunk.seam_start_s <= word.start_s < chunk.seam_end_s
+            or (chunk is chunks[-1] and word.start_s >= chunk.seam_end_s)
+        )
+        previous = relabeled
+        previous_end_s = chunk.end_s
+
+    first = outputs[0] if outputs else TranscriptionOutput()
+    raw: Dict[str, Any] = {
+        "chunks": [
+            {"index": chunk.index, "start_s": chunk.start_s, "end_s": chunk.end_s, "raw": out.raw}
+            for chunk, out in zip(chunks, outputs)
+        ],
+        "speakers": sorted(known_speakers),
+    }
+    return TranscriptionOutput(words=words, model=first.model, language=first.language, raw=raw)
+
+
+def _rebase(output: TranscriptionOutput, offset_s: float) -> TranscriptionOutput:
+    words = [
+        TranscriptWord(
+            text=word.text,
+            start_s=word.start_s + offset_s,
+            end_s=word.end_s + offset_s,
+            speaker_id=word.speaker_id,
+        )
+        for word in output.words
+    ]
+    return TranscriptionOutput(
+        words=words, model=output.model, language=output.language, raw=output.raw
+    )
+
+
+def _speaker_mapping(
+    previous: Sequence[TranscriptWord],
+    current: Sequence[TranscriptWord],
+    overlap_start_s: float,
+    overlap_end_s: float,
+) -> Dict[str, str]:
+    """Map ``current`` session speakers onto ``previous`` labels by majority vote.
+
+    Votes come from words both sessions recognized in the overlap: same text
+    (case-insensitive) starting within ``SPEAKER_MATCH_TOLERANCE_S`` of each other.
+    """
+
+    def in_overlap(word: TranscriptWord) -> bool:
+        return bool(word.speaker_id) and overlap_start_s <= word.start_s < overlap_end_s
+
+    earlier = [word for word in previous if in_overlap(word)]
+    votes: Dict[str, Counter[str]] = {}
+    for word in current:
+        if not in_overlap(word):
+            continue
+        for match in earlier:
+            if match.text.lower() == word.text.lower() and (
+                abs(match.start_s - word.start_s) <= SPEAKER_MATCH_TOLERANCE_S
+            ):
+                votes.setdefault(word.speaker_id, Counter())[str(match.speaker_id)] += 1
+                break
+
+    mapping: Dict[str, str] = {}
+    taken: set[str] = set()
+    ranked = sorted(votes.items(), key=lambda item: -item[1].most_common(1)[0][1])
+    for speaker, counter in ranked:
+        for label, _ in counter.most_common():
+            if label not in taken:
+                mapping[speaker] = label
+                taken.add(label)
+                break
+    return mapping
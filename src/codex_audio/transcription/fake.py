@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from codex_audio.ingest import AudioBuffer
+from codex_audio.transcription.azure_speech import TranscriptionOutput, TranscriptWord
+
+DEFAULT_FRAME_S = 0.01
+DEFAULT_THRESHOLD = 0.05
+
+
+class FakeSpeechService:
+    """Offline stand-in for Azure STT that "recognizes" tone bursts as words.
+
+    Every contiguous run of frames above ``threshold`` RMS becomes one word named
+    after its dominant frequency (``tone440``). Speakers are keyed by frequency
+    and labelled ``Guest-1``, ``Guest-2`` ... in order of first appearance within
+    each call, which mirrors how Azure numbers speakers per session. Setting
+    ``realtime_factor`` sleeps that fraction of the audio duration per call to
+    model a recognizer session, so throughput can be measured without a network.
+    """
+
+    def __init__(
+        self,
+        *,
+        realtime_factor: float = 0.0,
+        threshold: float = DEFAULT_THRESHOLD,
+        frame_s: float = DEFAULT_FRAME_S,
+        speaker_split_hz: Optional[float] = None,
+    ) -> None:
+        self.realtime_factor = realtime_factor
+        self.threshold = threshold
+        self.frame_s = frame_s
+        self.speaker_split_hz = speaker_split_hz
+        self.calls = 0
+        self.max_concurrency = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, audio: Path | AudioBuffer, **kwargs: Any) -> TranscriptionOutput:
+        return self.transcribe(audio, **kwargs)
+
+    def transcribe(
+        self,
+        audio: Path | AudioBuffer,
+        *,
+        language: str = "en-US",
+        diarization_enabled: bool = True,
+        **_: Any,
+    ) -> TranscriptionOutput:
+        with self._lock:
+            self.calls += 1
+            self._active += 1
+            self.max_concurrency = max(self.max_concurrency, self._active)
+        try:
+            buffer = audio if isinstance(audio, AudioBuffer) else AudioBuffer.from_wav(audio)
+            if self.realtime_factor > 0:
+                time.sleep(buffer.duration_s * self.realtime_factor)
+            words = self._recognize(buffer, diarization_enabled)
+        finally:
+            with self._lock:
+                self._active -= 1
+        return TranscriptionOutput(
+            words=words,
+            model="fake-stt",
+            language=language,
+            raw={"duration_s": buffer.duration_s},
+        )
+
+    def _recognize(self, buffer: AudioBuffer, diarization: bool) -> List[TranscriptWord]:
+        samples = buffer.as_float32()
+        frame = max(1, int(round(self.frame_s * buffer.sample_rate)))
+        usable = len(samples) // frame * frame
+        if not usable:
+            return []
+        frames = samples[:usable].reshape(-1, frame)
+        active = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1)) > self.threshold
+
+        words: List[TranscriptWord] = []
+        speakers: Dict[str, str] = {}
+        edges = np.flatnonzero(np.diff(np.concatenate([[0], active.astype(np.int8), [0]])))
+        for first, last in zip(edges[::2], edges[1::2]):
+            burst = samples[first * frame : last * frame]
+            freq = _dominant_frequency(burst, buffer.sample_rate)
+            speaker_id = None
+            if diarization:
+                key = self._speaker_key(freq)
+                speaker_id = speakers.setdefault(key, f"Guest-{len(speakers) + 1}")
+            words.append(
+                TranscriptWord(
+                    text=f"tone{freq}",
+                    start_s=first * frame / buffer.sample_rate,
+                    end_s=last * frame / buffer.sample_rate,
+                    speaker_id=speaker_id,
+                )
+            )
+        return words
+
+    def _speaker_key(self, freq: int) -> str:
+        if self.speaker_split_hz is None:
+            return str(freq)
+        return "high" if freq >= self.speaker_split_hz else "low"
+
+
+def _dominant_frequency(burst: np.ndarray, sample_rate: int) -> int:
+    spectrum = np.abs(np.fft.rfft(burst * np.hanning(len(burst))))
+    freqs = np.fft.rfftfreq(len(burst), d=1.0 / sample_rate)
+    # Round to 10 Hz so the same tone reads identically across sessions.
+    return int(round(float(freqs[int(np.argmax(spectrum))]), -1))
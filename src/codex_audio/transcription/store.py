@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from codex_audio.ingest import AudioBuffer
+from codex_audio.transcription.azure_speech import TranscriptionOutput
+from codex_audio.utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TRANSCRIPT_STORE = Path("~/.cache/codex_audio/transcripts.sqlite")
+_HASH_BLOCK_SAMPLES = 1 << 22
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    key TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+)
+"""
+_COUNT_LOOKUP = (
+    "INSERT INTO counters (name, value) VALUES (?, 1) "
+    "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+)
+
+
+def audio_digest(audio: Path | AudioBuffer) -> str:
+    """SHA-256 of the normalized PCM (or of the file bytes for a path)."""
+
+    digest = hashlib.sha256()
+    if isinstance(audio, AudioBuffer):
+        digest.update(f"pcm16:{audio.sample_rate}:".encode("ascii"))
+        samples = audio.samples
+        for start in range(0, len(samples), _HASH_BLOCK_SAMPLES):
+            digest.update(np.ascontiguousarray(samples[start : start + _HASH_BLOCK_SAMPLES]))
+        return digest.hexdigest()
+    with audio.expanduser().resolve().open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def transcript_key(
+    digest: str,
+    *,
+    language: str,
+    diarization_enabled: bool,
+    max_speakers: Optional[int],
+) -> str:
+    settings = json.dumps(
+        [digest, language, bool(diarization_enabled), max_speakers], separators=(",", ":")
+    )
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+
+class TranscriptStore:
+    """SQLite-backed store of transcripts, one zlib-compressed JSON row per key.
+
+    Safe to share between threads; ``hits`` and ``misses`` count lookups over the
+    lifetime of this handle, and :meth:`stats` reports the totals of every
+    handle that has used the file.
+    """
+
+    def __init__(self, path: Path = DEFAULT_TRANSCRIPT_STORE) -> None:
+        self.path = path.expanduser().resolve()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def __enter__(self) -> "TranscriptStore":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> Optional[TranscriptionOutput]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM transcripts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                self._conn.execute(_COUNT_LOOKUP, ("misses",))
+                self._conn.commit()
+                return None
+            self.hits += 1
+            self._conn.execute(_COUNT_LOOKUP, ("hits",))
+            self._conn.execute(
+                "UPDATE transcripts SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        try:
+            payload = json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        except (zlib.error, ValueError) as exc:  # pragma: no cover - corrupt row
+            logger.warning(
+                "Dropping unreadable transcript", extra={"key": key, "error": str(exc)}
+            )
+            self.delete(key)
+            return None
+        return TranscriptionOutput.from_payload(payload)
+
+    def put(self, key: str, transcription: TranscriptionOutput) -> None:
+        encoded = json.dumps(transcription.to_payload(), separators=(",", ":"))
+        blob = zlib.compress(encoded.encode("utf-8"), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (key, created, accessed, size, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, len(blob), sqlite3.Binary(blob)),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Entries and payload bytes stored, with the lookups counted since creation."""
+
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts"
+            ).fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
+
+    def prune(
+        self, *, max_age_s: Optional[float] = None, max_bytes: Optional[int] = None
+    ) -> int:
+        """Drop entries unread for ``max_age_s``, then the least recently read ones.
+
+        Entries are removed until the stored payloads fit in ``max_bytes``.
+        Returns the number of entries removed.
+        """
+
+        removed = 0
+        with self._lock:
+            if max_age_s is not None:
+                cursor = self._conn.execute(
+                    "DELETE FROM transcripts WHERE accessed < ?", (time.time() - max_age_s,)
+                )
+                removed += cursor.rowcount
+            if max_bytes is not None:
+                (total,) = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM transcripts"
+                ).fetchone()
+                rows = self._conn.execute(
+                    "SELECT key, size FROM transcripts ORDER BY accessed ASC"
+                ).fetchall()
+                for key, size in rows:
+                    if total <= max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM transcripts WHERE key = ?", (key,))
+                    total -= size
+                    removed += 1
+            self._conn.commit()
+            if removed:
+                self._conn.execute("VACUUM")
+        return removed
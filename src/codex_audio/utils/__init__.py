@@ -1,3 +1,4 @@
 ﻿from .logging import get_logger
+from .profiling import StageMetrics, StageProfiler
 
-__all__ = ["get_logger"]
+__all__ = ["get_logger", "StageMetrics", "StageProfiler"]
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class ClientCache:
+    """SDK clients kept for the life of a pipeline, one per credential set.
+
+    An ``AzureOpenAI`` client owns an HTTP connection pool, so a long-lived
+    pipeline (the ``serve`` daemon, a batch worker) reuses one per
+    ``(key, endpoint, api_version)`` instead of reconnecting for every
+    embedding request and LLM window. ``build`` runs once per key; callers
+    choose keys that identify everything the client was built with.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], T]) -> T:
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = build()
+            return self._clients[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
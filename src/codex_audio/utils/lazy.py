@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, MutableMapping
+
+
+class LazyImports:
+    """Module globals that are imported the first time they are used.
+
+    A module declares ``_lazy = LazyImports(globals(), speechsdk="azure.cognitiveservices.speech")``
+    and ``__getattr__ = _lazy.module_getattr``, so ``module.speechsdk`` keeps
+    working (and can be monkeypatched), while code inside the module reads it
+    with ``_lazy("speechsdk")``. Targets are ``"package.module"`` or
+    ``"package.module:attribute"``. With ``optional=True`` a missing
+    dependency resolves to ``None`` instead of raising :class:`ImportError`.
+    """
+
+    def __init__(
+        self, namespace: MutableMapping[str, Any], *, optional: bool = False, **targets: str
+    ) -> None:
+        self._namespace = namespace
+        self._targets: Dict[str, str] = targets
+        self.optional = optional
+
+    def __call__(self, name: str) -> Any:
+        if name in self._namespace:
+            return self._namespace[name]
+        module_name, _, attribute = self._targets[name].partition(":")
+        try:
+            value = importlib.import_module(module_name)
+            if attribute:
+                value = getattr(value, attribute)
+        except ImportError:
+            if not self.optional:
+                raise
+            value = None
+        self._namespace[name] = value
+        return value
+
+    def module_getattr(self, name: str) -> Any:
+        if name in self._targets:
+            return self(name)
+        raise AttributeError(f"module {self._namespace['__name__']!r} has no attribute {name!r}")
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sized, TypeVar
+
+from .logging import get_logger
+
+try:  # pragma: no cover - not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class StageMetrics:
+    """What one stage cost: wall and CPU time, peak RSS growth and items produced.
+
+    ``cpu_s`` is the CPU time of the thread that ran the stage, so work that
+    numpy or scipy hands to their own threads is not included. ``rss_delta_bytes``
+    is how far the stage raised the process' peak RSS; stages running at the
+    same time share one peak, so treat it as an upper bound per stage.
+    """
+
+    name: str
+    start_s: float
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rss_delta_bytes: int = 0
+    items: Optional[int] = None
+    thread: str = ""
+    parent: Optional[str] = None
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "stage": self.name,
+            "start_s": round(self.start_s, 6),
+            "wall_s": round(self.wall_s, 6),
+            "cpu_s": round(self.cpu_s, 6),
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "items": self.items,
+            "thread": self.thread,
+            "parent": self.parent,
+        }
+
+
+@dataclass
+class StageProfiler:
+    """Collects :class:`StageMetrics` for the stages of one pipeline run.
+
+    Stages may run on several threads and may nest; a nested stage records the
+    stage it ran inside as ``parent``. With ``profile_dir`` set, each outermost
+    stage also runs under :mod:`cProfile` and is dumped to ``<stage>.prof``; a
+    stage that runs several times, once per window, accumulates in that file.
+    """
+
+    profile_dir: Optional[Path] = None
+    metrics: List[StageMetrics] = field(default_factory=list)
+    _origin: float = field(default_factory=time.perf_counter, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False)
+    _profiles: Dict[str, pstats.Stats] = field(default_factory=dict, init=False, repr=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        """Measure the enclosed block; set ``items`` on the yielded record if known."""
+
+        stack: List[str] = getattr(self._local, "stack", [])
+        self._local.stack = stack
+        record = StageMetrics(
+            name=name,
+            start_s=time.perf_counter() - self._origin,
+            thread=threading.current_thread().name,
+            parent=stack[-1] if stack else None,
+        )
+        profile = self._start_profile(name) if not stack else None
+        stack.append(name)
+        rss_before = peak_rss_bytes()
+        cpu_before = time.thread_time()
+        try:
+            yield record
+        finally:
+            record.cpu_s = time.thread_time() - cpu_before
+            record.wall_s = time.perf_counter() - self._origin - record.start_s
+            record.rss_delta_bytes = max(0, peak_rss_bytes() - rss_before)
+            stack.pop()
+            if profile is not None:
+                self._dump_profile(name, profile)
+            with self._lock:
+                self.metrics.append(record)
+
+    def call(self, name: str, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(*args)`` as stage ``name``, counting the items it returns."""
+
+        with self.stage(name) as record:
+            value = func(*args)
+            record.items = count_items(value)
+        return value
+
+    @property
+    def wall_s(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def to_payload(self) -> dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self.metrics, key=lambda record: record.start_s)
+        return {
+            "wall_s": round(self.wall_s, 6),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": [record.to_payload() for record in ordered],
+        }
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        """Write the stages as complete events viewable in chrome://tracing or Perfetto."""
+
+        with self._lock:
+            ordered = sorted(self.metrics, key=lambda record: record.start_s)
+        pid = os.getpid()
+        thread_ids: Dict[str, int] = {}
+        events: List[dict[str, Any]] = []
+        for record in ordered:
+            tid = thread_ids.setdefault(record.thread, len(thread_ids) + 1)
+            events.append(
+                {
+                    "name": record.name,
+                    "cat": "stage",
+                    "ph": "X",
+                    "ts": round(record.start_s * 1e6, 3),
+                    "dur": round(record.wall_s * 1e6, 3),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {
+                        "cpu_s": round(record.cpu_s, 6),
+                        "rss_delta_bytes": record.rss_delta_bytes,
+                        "items": record.items,
+                    },
+                }
+            )
+        for thread, tid in thread_ids.items():
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}}
+            )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        return path
+
+    def _start_profile(self, name: str) -> Optional[cProfile.Profile]:
+        if self.profile_dir is None:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as exc:
+            # Python 3.12+ allows one active cProfile per process.
+            logger.debug("cProfile unavailable for stage", extra={"stage": name, "error": str(exc)})
+            return None
+        return profile
+
+    def _dump_profile(self, name: str, profile: cProfile.Profile) -> None:
+        profile.disable()
+        assert self.profile_dir is not None
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            stats = self._profiles.get(name)
+            if stats is None:
+                stats = self._profiles[name] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+            stats.dump_stats(str(self.profile_dir / f"{name}.prof"))
+
+
+def count_items(value: Any) -> Optional[int]:
+    """Number of items a stage produced: its length, or its transcript's word count."""
+
+    if value is None:
+        return 0
+    if isinstance(value, Sized) and not isinstance(value, (str, bytes)):
+        return len(value)
+    words = getattr(value, "words", None)
+    if isinstance(words, Sized):
+        return len(words)
+    return None
+
+
+def peak_rss_bytes() -> int:
+    """High-water mark of this process' resident set size, or 0 if unknown."""
+
+    if resource is None:  # pragma: no cover
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
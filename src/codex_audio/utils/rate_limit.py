@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Async token bucket: ``rate_per_s`` tokens refill continuously up to ``capacity``.
+
+    Every :meth:`acquire` takes one token, waiting for the refill when the
+    bucket is empty, so a burst of ``capacity`` calls goes through at once and
+    the sustained rate never exceeds ``rate_per_s``. One bucket belongs to one
+    event loop.
+    """
+
+    def __init__(
+        self,
+        rate_per_s: float,
+        *,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate_per_s <= 0:
+            raise ValueError("rate_per_s must be positive")
+        self.rate_per_s = rate_per_s
+        self.capacity = max(1.0, capacity if capacity is not None else rate_per_s)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Waiters queue on the lock, so tokens go out in arrival order.
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate_per_s
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate_per_s)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pytest
+
+from codex_audio.ingest import AudioMetadata
+from codex_audio.pipeline import PipelineConfig, PipelineResult, StorySegmentationPipeline
+from codex_audio.stages import StageTiming
+
+
+@pytest.fixture
+def stories() -> Callable[..., np.ndarray]:
+    """Builds 16 kHz band-limited noise "stories" of 15-25 s split by 1.5 s of silence.
+
+    Call it as ``stories(count, seed=...)``; neighbouring stories sit in
+    different frequency bands so the change scores find every seam.
+    """
+
+    def build(count: int, *, seed: int, sample_rate: int = 16_000) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        parts = []
+        for idx in range(count):
+            size = int(rng.uniform(15.0, 25.0) * sample_rate)
+            spectrum = np.fft.rfft(rng.normal(0.0, 1.0, size))
+            freqs = np.fft.rfftfreq(size, 1 / sample_rate)
+            spectrum *= np.exp(-(((freqs - (300 + 500 * (idx % 5))) / 200.0) ** 2))
+            story = np.fft.irfft(spectrum, size)
+            parts.append((6_000 * story / np.abs(story).max()).astype(np.int16))
+            parts.append(rng.normal(0.0, 3.0, int(1.5 * sample_rate)).astype(np.int16))
+        return np.concatenate(parts)
+
+    return build
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch) -> list[PipelineConfig]:
+    """Pipelines that record their configs and fake a 30-minute run.
+
+    ``run`` raises ``RuntimeError("decode failed")`` for ``broken.wav`` and
+    otherwise writes a manifest naming the station and worker pid. Returns
+    the configs of every pipeline built so far.
+    """
+
+    built: list[PipelineConfig] = []
+    original_init = StorySegmentationPipeline.__init__
+
+    def counting_init(self, config: PipelineConfig) -> None:  # type: ignore[no-untyped-def]
+        built.append(config)
+        original_init(self, config)
+
+    def fake_run(  # type: ignore[no-untyped-def]
+        self, audio_path: Path, output_dir: Path
+    ) -> PipelineResult:
+        if audio_path.name == "broken.wav":
+            raise RuntimeError("decode failed")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = output_dir / "segments.json"
+        manifest_path.write_text(json.dumps({"station": self.config.station, "pid": os.getpid()}))
+        return PipelineResult(
+            segments=[{"start": 0.0, "end": 1800.0}],
+            output_dir=output_dir,
+            manifest_path=manifest_path,
+            metadata=AudioMetadata(
+                source_path=audio_path,
+                duration_s=1800.0,
+                sample_rate=16000,
+                channels=1,
+                normalized_sample_rate=16000,
+                sample_width=2,
+            ),
+            stage_timings=[
+                StageTiming(name="vad", start_s=0.0, end_s=0.5, thread="stage_0"),
+                StageTiming(name="transcription", start_s=0.0, end_s=2.0, thread="stage_1"),
+            ],
+        )
+
+    monkeypatch.setattr(StorySegmentationPipeline, "__init__", counting_init)
+    monkeypatch.setattr(StorySegmentationPipeline, "run", fake_run)
+    return built
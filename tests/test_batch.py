@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from pathlib import Path
+
+import pytest
+
+from codex_audio import batch
+from codex_audio.batch import BatchItem, collect_batch_items, run_batch
+from codex_audio.pipeline import PipelineConfig
+
+
+def test_collect_batch_items_from_directory_and_csv(tmp_path: Path) -> None:
+    audio_dir = tmp_path / "audio"
+    (audio_dir / "day2").mkdir(parents=True)
+    for name in ["a.wav", "day2/b.mp3", "notes.txt"]:
+        (audio_dir / name).write_bytes(b"")
+    out = tmp_path / "out"
+
+    items = collect_batch_items(audio_dir, out)
+    assert [(item.audio_path.name, item.output_dir) for item in items] == [
+        ("a.wav", out / "a"),
+        ("b.mp3", out / "day2" / "b"),
+    ]
+
+    manifest = tmp_path / "files.csv"
+    manifest.write_text("audio,out\naudio/a.wav,custom\naudio/day2/b.mp3,\n")
+    items = collect_batch_items(manifest, out)
+    assert [(item.audio_path, item.output_dir) for item in items] == [
+        (audio_dir / "a.wav", tmp_path / "custom"),
+        (audio_dir / "day2" / "b.mp3", out / "audio" / "day2" / "b"),
+    ]
+
+    (audio_dir / "day2" / "a.wav").write_bytes(b"")
+    manifest.write_text("audio\naudio/a.wav\naudio/day2/a.wav\n")
+    assert [item.output_dir for item in collect_batch_items(manifest, out)] == [
+        out / "audio" / "a",
+        out / "audio" / "day2" / "a",
+    ]
+    manifest.write_text("audio,out\naudio/a.wav,same\naudio/day2/a.wav,same\n")
+    with pytest.raises(ValueError, match="would both write to"):
+        collect_batch_items(manifest, out)
+
+
+def test_run_batch_reuses_pipeline_and_reports_throughput(
+    monkeypatch, fake_pipeline: list[PipelineConfig], tmp_path: Path
+) -> None:
+    monkeypatch.setattr(batch, "_WORKER_PIPELINE", None)
+
+    items = [
+        BatchItem(audio_path=tmp_path / f"{name}.wav", output_dir=tmp_path / "out" / name)
+        for name in ["one", "broken", "two"]
+    ]
+    report_path = tmp_path / "out" / "batch_report.json"
+    report = run_batch(items, PipelineConfig(station="CKNW"), workers=1, report_path=report_path)
+
+    assert len(fake_pipeline) == 1
+    assert report.failures == 1
+    assert report.audio_s == 3600.0
+    assert report.stage_s == {"vad": 1.0, "transcription": 4.0}
+    assert report.audio_hours_per_wall_hour > 1.0
+    payload = json.loads(report_path.read_text())
+    assert [entry["error"] for entry in payload["results"]] == [
+        None,
+        "RuntimeError: decode failed",
+        None,
+    ]
+    assert (tmp_path / "out" / "two" / "segments.json").exists()
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="worker processes inherit the patched pipeline only when forked",
+)
+def test_run_batch_with_worker_processes_keeps_item_order(
+    fake_pipeline: list[PipelineConfig], tmp_path: Path
+) -> None:
+    names = ["one", "broken", "two", "three", "four"]
+    items = [
+        BatchItem(audio_path=tmp_path / f"{name}.wav", output_dir=tmp_path / "out" / name)
+        for name in names
+    ]
+
+    report = run_batch(items, PipelineConfig(station="CKNW"), workers=2)
+
+    assert report.workers == 2
+    assert [result.audio_path for result in report.files] == [item.audio_path for item in items]
+    assert [result.ok for result in report.files] == [True, False, True, True, True]
+    for result in report.files:
+        assert result.worker != os.getpid()
+        if result.ok:
+            manifest = json.loads(result.manifest_path.read_text())  # type: ignore[union-attr]
+            assert manifest == {"station": "CKNW", "pid": result.worker}
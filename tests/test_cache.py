@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from codex_audio.cache import AUDIO_EMBEDDINGS, VAD_SEGMENTS, ArtifactCache, cache_key
+from codex_audio.clipper.virtual import VirtualClipReader
+from codex_audio.features.embeddings import AudioEmbedding
+from codex_audio.features.vad import VadSegment
+from codex_audio.ingest import AudioBuffer, AudioMetadata
+from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
+
+
+def test_cache_round_trips_stage_artifacts(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache")
+    segments = [VadSegment(0.0, 1.5, "speech"), VadSegment(1.5, 2.0, "silence")]
+    embeddings = [AudioEmbedding(0.0, 1.0, [0.5, 0.25, 0.125])]
+    key = cache_key("stage", 1)
+
+    assert cache.get(key, VAD_SEGMENTS) is None
+    cache.put(key, segments, VAD_SEGMENTS)
+    cache.put(key, embeddings, AUDIO_EMBEDDINGS)
+
+    assert cache.get(key, VAD_SEGMENTS) == segments
+    assert cache.get(key, AUDIO_EMBEDDINGS) == embeddings
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache_key("stage", 1) != cache_key("stage", 2)
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = ArtifactCache(tmp_path / "cache", max_bytes=None)
+    segments = [VadSegment(float(idx), float(idx + 1), "speech") for idx in range(20)]
+    paths = [cache.put(f"key{idx}", segments, VAD_SEGMENTS) for idx in range(3)]
+    for offset, path in enumerate(paths):
+        os.utime(path, (1_000 + offset, 1_000 + offset))
+    cache.get("key0", VAD_SEGMENTS)
+
+    cache.max_bytes = paths[0].stat().st_size * 2
+    cache.evict()
+
+    assert paths[0].exists()
+    assert not paths[1].exists()
+    assert paths[2].exists()
+
+
+def test_pipeline_reuses_cached_stages(monkeypatch, tmp_path: Path) -> None:
+    audio_path = tmp_path / "source.wav"
+    audio_path.write_bytes(b"audio")
+    calls = {"load": 0, "vad": 0, "embeddings": 0}
+
+    def fake_load_audio_buffer(
+        source_path: Path, work_dir: Path, target_sample_rate: int, write_wav: bool
+    ):
+        calls["load"] += 1
+        metadata = AudioMetadata(
+            source_path=source_path,
+            duration_s=2.0,
+            sample_rate=target_sample_rate,
+            channels=1,
+            normalized_sample_rate=target_sample_rate,
+            sample_width=2,
+        )
+        samples = np.arange(2 * target_sample_rate, dtype=np.int16)
+        return metadata, AudioBuffer(samples, target_sample_rate)
+
+    def fake_run_vad(audio, aggressiveness: int, frame_duration_ms: int):
+        calls["vad"] += 1
+        return [VadSegment(0.0, 2.0, "speech")]
+
+    def fake_embeddings(self, audio, **kwargs):  # type: ignore[no-untyped-def]
+        calls["embeddings"] += 1
+        return [AudioEmbedding(0.0, 2.0, [1.0, 0.5])]
+
+    monkeypatch.setattr("codex_audio.pipeline.load_audio_buffer", fake_load_audio_buffer)
+    monkeypatch.setattr("codex_audio.pipeline.run_vad", fake_run_vad)
+    monkeypatch.setattr(
+        "codex_audio.pipeline.StorySegmentationPipeline._compute_audio_embeddings",
+        fake_embeddings,
+    )
+    monkeypatch.setattr("codex_audio.pipeline.clip_segments", lambda source, segments, out_dir, stem: [])
+
+    config = PipelineConfig(
+        station="CKNW",
+        working_dir=tmp_path / "work",
+        transcription_enabled=False,
+        cache_enabled=True,
+    )
+    first = StorySegmentationPipeline(config).run(audio_path, tmp_path / "out1")
+    second = StorySegmentationPipeline(config).run(audio_path, tmp_path / "out2")
+
+    assert calls == {"load": 1, "vad": 1, "embeddings": 1}
+    assert first.segments == second.segments
+    assert second.normalized_audio and second.normalized_audio.parent.name == "cache"
+
+
+def test_virtual_clips_survive_cache_eviction(monkeypatch, tmp_path: Path) -> None:
+    audio_path = tmp_path / "source.wav"
+    audio_path.write_bytes(b"audio")
+    samples = (np.arange(90 * 16_000) % 5_000).astype(np.int16)
+
+    def fake_load_audio_buffer(
+        source_path: Path, work_dir: Path, target_sample_rate: int, write_wav: bool
+    ):
+        metadata = AudioMetadata(source_path, 90.0, target_sample_rate, 1, target_sample_rate, 2)
+        return metadata, AudioBuffer(samples, target_sample_rate)
+
+    monkeypatch.setattr("codex_audio.pipeline.load_audio_buffer", fake_load_audio_buffer)
+    monkeypatch.setattr(
+        "codex_audio.pipeline.run_vad", lambda audio, **kwargs: [VadSegment(0.0, 90.0, "speech")]
+    )
+    config = PipelineConfig(
+        station="CKNW",
+        working_dir=tmp_path / "work",
+        transcription_enabled=False,
+        cache_enabled=True,
+        write_normalized_wav=False,
+        clip_backend="virtual",
+    )
+    for run in ["miss", "hit"]:
+        result = StorySegmentationPipeline(config).run(audio_path, tmp_path / run)
+        assert result.normalized_audio == (tmp_path / "work" / "source_normalized.wav").resolve()
+        manifest = json.loads(result.manifest_path.read_text())  # type: ignore[union-attr]
+        assert manifest["normalized_audio"] == str(result.normalized_audio)
+
+    shutil.rmtree(tmp_path / "work" / "cache")
+    first = VirtualClipReader(result.manifest_path).buffer(0)  # type: ignore[arg-type]
+    np.testing.assert_array_equal(first.samples, samples[: first.num_samples])
+
+
+def test_normalized_audio_key_separates_ingest_modes(tmp_path: Path) -> None:
+    audio_path = tmp_path / "source.wav"
+    audio_path.write_bytes(b"audio")
+
+    def keys(**overrides):  # type: ignore[no-untyped-def]
+        config = PipelineConfig(station="CKNW", **overrides)
+        return StorySegmentationPipeline(config)._artifact_keys(audio_path)
+
+    decoded, streamed, windowed = keys(), keys(streaming_ingest=True), keys(window_s=600.0)
+
+    assert decoded["audio"] != streamed["audio"]
+    assert decoded["vad"] != streamed["vad"]
+    assert streamed == windowed
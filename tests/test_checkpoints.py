@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from codex_audio.cache import VAD_SEGMENTS
+from codex_audio.checkpoints import CHECKPOINT_DIRNAME, StageLedger
+from codex_audio.features.vad import VadSegment
+from codex_audio.ingest import AudioBuffer, AudioMetadata, normalized_wav_path
+from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
+from codex_audio.transcription import TranscriptionOutput, TranscriptWord
+
+
+def test_ledger_resumes_only_stages_done_on_the_same_key(tmp_path: Path) -> None:
+    segments = [VadSegment(0.0, 1.5, "speech")]
+    ledger = StageLedger(tmp_path)
+    ledger.complete("vad", "k1", segments, VAD_SEGMENTS)
+    ledger.scoped("window_000").complete("vad", "k2", segments, VAD_SEGMENTS)
+    ledger.fail("transcription", "k3", TimeoutError("session timed out"))
+    assert ledger.failed() == ["transcription"]
+    assert ledger.load("vad", "k1", VAD_SEGMENTS) is None  # a fresh run never reuses
+
+    resumed = StageLedger(tmp_path, resume=True)
+    assert resumed.load("vad", "k1", VAD_SEGMENTS) == segments
+    assert resumed.scoped("window_000").load("vad", "k2", VAD_SEGMENTS) == segments
+    assert resumed.load("vad", "changed", VAD_SEGMENTS) is None
+    assert resumed.resumed == ["vad", "window_000.vad"]
+    assert resumed.failed() == []
+
+    ledger_payload = json.loads((tmp_path / "ledger.json").read_text())
+    assert ledger_payload["transcription"]["status"] == "failed"
+    assert ledger_payload["transcription"]["error"] == "TimeoutError: session timed out"
+    assert StageLedger(tmp_path).records == {}
+
+
+def test_resume_reruns_only_the_failed_transcription(monkeypatch, tmp_path: Path) -> None:
+    audio_path = tmp_path / "show.mp3"
+    audio_path.write_bytes(b"source audio")
+    loads: list[Path] = []
+    vad_runs: list[int] = []
+    outcomes: list[object] = [TimeoutError("session timed out")]
+
+    def fake_load_audio_buffer(
+        source_path: Path, work_dir: Path, target_sample_rate: int, write_wav: bool
+    ):
+        loads.append(source_path)
+        audio = AudioBuffer(np.zeros(60 * target_sample_rate, dtype=np.int16), target_sample_rate)
+        audio.write_wav(normalized_wav_path(source_path, work_dir))
+        metadata = AudioMetadata(source_path, 60.0, target_sample_rate, 1, target_sample_rate, 2)
+        return metadata, audio
+
+    def fake_run_vad(audio, **kwargs):  # type: ignore[no-untyped-def]
+        vad_runs.append(1)
+        return [VadSegment(0.0, 60.0, "speech")]
+
+    def fake_transcribe(audio, **kwargs):  # type: ignore[no-untyped-def]
+        if outcomes:
+            raise outcomes.pop()  # type: ignore[misc]
+        return TranscriptionOutput(words=[TranscriptWord("news", 1.0, 1.4)])
+
+    monkeypatch.setattr("codex_audio.pipeline.load_audio_buffer", fake_load_audio_buffer)
+    monkeypatch.setattr("codex_audio.pipeline.run_vad", fake_run_vad)
+    monkeypatch.setattr("codex_audio.pipeline.transcribe_audio", fake_transcribe)
+    monkeypatch.setattr("codex_audio.pipeline.embed_chunks", lambda chunks, **kwargs: [])
+
+    def run(resume: bool):  # type: ignore[no-untyped-def]
+        config = PipelineConfig(
+            station="TEST", clip_backend="virtual", checkpoints_enabled=True, resume=resume
+        )
+        return StorySegmentationPipeline(config).run(audio_path, tmp_path / "out")
+
+    checkpoints = tmp_path / "out" / "work" / CHECKPOINT_DIRNAME
+    first = run(resume=False)
+    assert first.failed_stages == ["transcription"]
+    assert json.loads(first.manifest_path.read_text())["failed_stages"] == ["transcription"]
+    assert [path.name.startswith("show-") for path in checkpoints.iterdir()] == [True]
+
+    second = run(resume=True)
+    assert second.failed_stages == []
+    assert sorted(second.resumed_stages) == ["audio_embeddings", "ingest", "vad"]
+    assert len(loads) == 1 and len(vad_runs) == 1
+    transcript = json.loads(second.manifest_path.read_text())["transcript"]
+    assert [word["text"] for word in transcript["words"]] == ["news"]
+    assert list(checkpoints.iterdir()) == []
+
+
+def test_default_run_reports_failures_without_writing_checkpoints(
+    monkeypatch, tmp_path: Path
+) -> None:
+    audio_path = tmp_path / "show.wav"
+    AudioBuffer(np.zeros(16000, dtype=np.int16), 16000).write_wav(audio_path)
+    digests: list[Path] = []
+
+    def fail_transcription(audio, **kwargs):  # type: ignore[no-untyped-def]
+        raise TimeoutError("session timed out")
+
+    monkeypatch.setattr("codex_audio.pipeline.file_digest", digests.append)
+    monkeypatch.setattr(
+        "codex_audio.pipeline.run_vad", lambda audio, **kwargs: [VadSegment(0.0, 1.0, "speech")]
+    )
+    monkeypatch.setattr("codex_audio.pipeline.transcribe_audio", fail_transcription)
+    config = PipelineConfig(station="TEST", clip_backend="virtual")
+
+    result = StorySegmentationPipeline(config).run(audio_path, tmp_path / "out")
+
+    assert result.failed_stages == ["transcription"]
+    assert digests == []  # no checkpoint keys, so the source is never hashed
+    assert not (tmp_path / "out" / "work" / CHECKPOINT_DIRNAME).exists()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+# Loaded only by the stages that need them, never by `codex-audio --help`.
+HEAVY_MODULES = (
+    "openai",
+    "azure.cognitiveservices.speech",
+    "pydub",
+    "webrtcvad",
+    "soundfile",
+    "yaml",
+    "scipy",
+    "dotenv",
+)
+IMPORT_BUDGET_S = 2.0
+
+
+def _import_times(module: str) -> dict[str, float]:
+    """Cumulative import time per module from ``python -X importtime``, in seconds."""
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        if cumulative.isdigit():
+            times[name] = int(cumulative) / 1e6
+    return times
+
+
+def test_cli_import_skips_heavy_sdks_and_stays_in_budget() -> None:
+    times = _import_times("codex_audio.cli.app")
+
+    loaded = sorted(
+        name
+        for name in times
+        if any(name == heavy or name.startswith(f"{heavy}.") for heavy in HEAVY_MODULES)
+    )
+    assert loaded == []
+    assert times["codex_audio.cli.app"] < IMPORT_BUDGET_S
@@ -3,9 +3,11 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
+import numpy as np
 import pytest
 
-from codex_audio.clipper.ffmpeg import clip_segments
+from codex_audio.clipper.ffmpeg import clip_segments, clip_segments_single_pass
+from codex_audio.ingest import AudioBuffer
 
 
 def test_clip_segments_invokes_ffmpeg(tmp_path, monkeypatch):
@@ -41,3 +43,55 @@ def test_clip_segments_rejects_invalid_args(tmp_path):
 
     with pytest.raises(FileNotFoundError):
         clip_segments(tmp_path / "missing.wav", [(0.0, 1.0)], tmp_path / "clips")
+
+
+def test_clip_segments_slices_in_memory_buffer_without_ffmpeg(tmp_path, monkeypatch):
+    def fail_run(cmd, check):  # type: ignore[no-untyped-def]
+        raise AssertionError("ffmpeg should not run for an in-memory buffer")
+
+    monkeypatch.setattr("codex_audio.clipper.ffmpeg.subprocess.run", fail_run)
+    buffer = AudioBuffer(np.arange(32_000, dtype=np.int16), 16_000)
+
+    outputs = clip_segments(buffer, [(0.0, 0.5), (0.5, 2.0)], tmp_path / "clips", stem="show")
+
+    assert [path.name for path in outputs] == ["show_segment_001.wav", "show_segment_002.wav"]
+    first = AudioBuffer.from_wav(outputs[0])
+    second = AudioBuffer.from_wav(outputs[1])
+    assert first.num_samples == 8_000
+    assert second.num_samples == 24_000
+    assert int(second.samples[0]) == 8_000
+
+
+def test_clip_segments_single_pass_runs_one_ffmpeg_per_batch(tmp_path, monkeypatch):
+    source = tmp_path / "source.wav"
+    source.write_bytes(b"fake")
+
+    commands: List[list[str]] = []
+
+    def fake_run(cmd, check):  # type: ignore[no-untyped-def]
+        commands.append(cmd)
+        for idx, arg in enumerate(cmd):
+            if arg == "-map":
+                Path(cmd[idx + 6]).write_bytes(b"clip")
+
+    monkeypatch.setattr("codex_audio.clipper.ffmpeg.subprocess.run", fake_run)
+
+    segments = [(0.0, 5.0), (5.0, 12.25), (12.25, 20.0)]
+    outputs = clip_segments_single_pass(
+        source, segments, tmp_path / "clips", outputs_per_process=2
+    )
+
+    assert [path.name for path in outputs] == [
+        "source_segment_001.wav",
+        "source_segment_002.wav",
+        "source_segment_003.wav",
+    ]
+    assert all(path.exists() for path in outputs)
+    assert len(commands) == 2
+    graph = commands[0][commands[0].index("-filter_complex") + 1]
+    # Adjacent clips share the exact same edge, so nothing falls between them.
+    assert "atrim=start=0.000000:end=5.000000" in graph
+    assert "atrim=start=5.000000:end=12.250000" in graph
+    assert commands[1][commands[1].index("-ss") + 1] == "12.250000"
+    second_graph = commands[1][commands[1].index("-filter_complex") + 1]
+    assert "atrim=start=0.000000:end=7.750000" in second_graph
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from codex_audio.clipper.native import clip_segments_native
+from codex_audio.ingest import AudioBuffer
+
+
+def test_clip_segments_native_slices_normalized_wav_without_ffmpeg(tmp_path, monkeypatch):
+    def fail_run(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise AssertionError("native clipping should not start a subprocess")
+
+    monkeypatch.setattr("subprocess.run", fail_run)
+    samples = (np.arange(48_000) % 20_000).astype(np.int16)
+    source = AudioBuffer(samples, 16_000).write_wav(tmp_path / "norm.wav")
+
+    outputs = clip_segments_native(
+        source, [(0.0, 0.5), (0.5, 1.2345), (1.2345, 3.0)], tmp_path / "clips", max_workers=2
+    )
+
+    assert [path.name for path in outputs] == [
+        "norm_segment_001.wav",
+        "norm_segment_002.wav",
+        "norm_segment_003.wav",
+    ]
+    clips = [AudioBuffer.from_wav(path, mmap=False) for path in outputs]
+    assert all(clip.sample_rate == 16_000 for clip in clips)
+    # The clips tile the source exactly: no sample is lost or repeated at the seams.
+    np.testing.assert_array_equal(np.concatenate([clip.samples for clip in clips]), samples)
+
+
+def test_clip_segments_native_rejects_empty_ranges(tmp_path):
+    buffer = AudioBuffer(np.zeros(16_000, dtype=np.int16), 16_000)
+
+    with pytest.raises(ValueError):
+        clip_segments_native(buffer, [(0.5, 0.5)], tmp_path / "clips")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+
+from codex_audio.clipper.virtual import VirtualClipReader, plan_virtual_clips
+from codex_audio.ingest import AudioBuffer
+
+
+def _manifest(tmp_path, samples: np.ndarray, ranges):  # type: ignore[no-untyped-def]
+    source = AudioBuffer(samples, 16_000)
+    source.write_wav(tmp_path / "norm.wav")
+    clips = plan_virtual_clips(source, ranges)
+    manifest = tmp_path / "segments.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "normalized_audio": str(source.path),
+                "segments": [
+                    {"start": clip.start_s, "end": clip.end_s, **clip.to_payload()}
+                    for clip in clips
+                ],
+            }
+        )
+    )
+    return manifest, clips
+
+
+def test_virtual_clip_offsets_read_back_as_views_and_bytes(tmp_path):
+    samples = (np.arange(32_000) % 7_000).astype(np.int16)
+    manifest, clips = _manifest(tmp_path, samples, [(0.0, 0.75), (0.75, 2.0)])
+
+    assert [(clip.start_sample, clip.end_sample) for clip in clips] == [
+        (0, 12_000),
+        (12_000, 32_000),
+    ]
+    reader = VirtualClipReader(manifest)
+    second = reader.buffer(1)
+    assert isinstance(second.samples, np.memmap)
+    np.testing.assert_array_equal(second.samples, samples[12_000:])
+    streamed = b"".join(reader.stream(0, block_bytes=5_000))
+    np.testing.assert_array_equal(np.frombuffer(streamed, dtype="<i2"), samples[:12_000])
+
+
+def test_virtual_clips_materialize_later(tmp_path):
+    samples = (np.arange(16_000) % 3_000).astype(np.int16)
+    manifest, _ = _manifest(tmp_path, samples, [(0.0, 0.5), (0.5, 1.0)])
+
+    paths = VirtualClipReader(manifest).materialize(tmp_path / "clips")
+
+    payload = json.loads(manifest.read_text())
+    assert [segment["clip_path"] for segment in payload["segments"]] == [str(p) for p in paths]
+    np.testing.assert_array_equal(
+        AudioBuffer.from_wav(paths[1], mmap=False).samples, samples[8_000:]
+    )
@@ -4,7 +4,14 @@ import numpy as np
 import pytest
 import soundfile as sf
 
-from codex_audio.features.embeddings import AudioEmbedding, get_audio_embeddings
+from codex_audio.features.embeddings import (
+    AudioEmbedding,
+    EmbeddingMatrix,
+    _compute_embedding,
+    adjacent_cosine_similarity,
+    compute_embedding_matrix,
+    get_audio_embeddings,
+)
 
 
 def _write_tone(path, duration_s=6.0, sample_rate=16_000, freq=220.0) -> None:
@@ -37,3 +44,43 @@ def test_get_audio_embeddings_validates_inputs(tmp_path) -> None:
         get_audio_embeddings(audio_path, hop_ratio=0.0)
     with pytest.raises(FileNotFoundError):
         get_audio_embeddings(tmp_path / "missing.wav")
+
+
+def test_compute_embedding_matrix_matches_per_window_embedding() -> None:
+    sample_rate = 8_000
+    rng = np.random.default_rng(7)
+    samples = rng.uniform(-1.0, 1.0, size=int(sample_rate * 5.3)).astype(np.float32)
+
+    vectors, starts, ends = compute_embedding_matrix(
+        samples, sample_rate, window_s=1.0, hop_ratio=0.5, batch_samples=3 * sample_rate
+    )
+
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (11, 8)
+    assert starts[-1] == pytest.approx(5.0)
+    assert ends[0] == pytest.approx(1.0)
+    for row, start_s in enumerate(starts):
+        start_idx = int(round(start_s * sample_rate))
+        window = samples[start_idx : start_idx + sample_rate]
+        window = np.pad(window, (0, sample_rate - len(window)))
+        expected = _compute_embedding(window, sample_rate)
+        assert vectors[row] == pytest.approx(expected, rel=1e-5, abs=1e-7)
+
+
+def test_embedding_matrix_behaves_like_embedding_list() -> None:
+    rows = [
+        AudioEmbedding(0.0, 1.0, [1.0, 0.0]),
+        AudioEmbedding(1.0, 2.0, [0.5, 0.5]),
+        AudioEmbedding(2.0, 3.0, [0.0, 0.0]),
+    ]
+    matrix = EmbeddingMatrix.from_embeddings(rows)
+
+    assert len(matrix) == 3
+    assert matrix[1] == rows[1]
+    assert matrix[-1].start_s == 2.0
+    assert list(matrix[1:]) == rows[1:]
+    assert matrix == rows
+    np.testing.assert_allclose(
+        adjacent_cosine_similarity(matrix), adjacent_cosine_similarity(rows)
+    )
+    assert adjacent_cosine_similarity(rows) == pytest.approx([2**-0.5, 0.0])
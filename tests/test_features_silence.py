@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+from pydub.silence import detect_silence
+
+from codex_audio.features.silence import SilenceMap
+from codex_audio.ingest import AudioBuffer
+from codex_audio.transcription.azure_speech import _snap_to_silence, refine_range_with_silence
+
+
+def _bursty_signal(sample_rate: int, seconds: int = 6) -> np.ndarray:
+    rng = np.random.default_rng(7)
+    count = sample_rate * seconds
+    t = np.arange(count) / sample_rate
+    gate = (rng.random(seconds * 10) > 0.5).repeat(count // (seconds * 10) + 1)[:count]
+    # Noise ramps up across the file so some windows sit right at the threshold.
+    noise = rng.normal(0.0, 30.0, count) * np.linspace(0.5, 60.0, count)
+    return (8_000 * np.sin(2 * np.pi * 440.0 * t) * gate + noise).astype(np.int16)
+
+
+@pytest.mark.parametrize("sample_rate", [8_000, 16_000])
+def test_silence_map_matches_pydub_detection(sample_rate: int) -> None:
+    samples = _bursty_signal(sample_rate)
+    segment = AudioSegment(
+        data=samples.tobytes(), sample_width=2, frame_rate=sample_rate, channels=1
+    )
+    silence_map = SilenceMap.from_samples(
+        samples, sample_rate, min_gap_ms=50, silence_margin_db=10.0, block_ms=700
+    )
+    thresh = segment.dBFS - 10.0
+
+    assert silence_map.gaps_in(0, len(segment)) == [
+        tuple(gap) for gap in detect_silence(segment, min_silence_len=50, silence_thresh=thresh)
+    ]
+    for target in range(0, len(segment), 97):
+        for prefer in ("start", "end"):
+            expected = _snap_to_silence(
+                segment,
+                target_ms=target,
+                lookaround_ms=500,
+                min_gap_ms=50,
+                silence_thresh=thresh,
+                prefer=prefer,
+            )
+            assert silence_map.snap(target, lookaround_ms=500, prefer=prefer) == expected
+
+
+def test_refine_range_with_silence_map_matches_detection() -> None:
+    buffer = AudioBuffer(samples=_bursty_signal(16_000), sample_rate=16_000)
+    silence_map = SilenceMap.from_buffer(buffer)
+
+    for match_range in [(320, 780), (1_450, 2_900), (5_100, 5_990)]:
+        assert refine_range_with_silence(
+            buffer, match_range, silence_map=silence_map
+        ) == refine_range_with_silence(buffer, match_range)
+    with pytest.raises(ValueError):
+        refine_range_with_silence(buffer, (0, 100), min_gap_ms=60, silence_map=silence_map)
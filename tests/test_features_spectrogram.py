@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from codex_audio.features.embeddings import compute_embedding_matrix
+from codex_audio.features.spectrogram import compute_frame_features
+from codex_audio.ingest import AudioBuffer
+from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
+
+
+def _two_tone_signal(sample_rate: int) -> np.ndarray:
+    t = np.arange(sample_rate * 6) / sample_rate
+    low = 0.6 * np.sin(2 * np.pi * 150.0 * t[: sample_rate * 3])
+    high = 0.3 * np.sin(2 * np.pi * 2_500.0 * t[sample_rate * 3 :])
+    return np.concatenate([low, high]).astype(np.float32)
+
+
+def test_frame_features_follow_stft_window_grid() -> None:
+    sample_rate = 8_000
+    samples = _two_tone_signal(sample_rate)
+
+    features = compute_frame_features(samples, sample_rate, frame_s=0.025)
+    vectors, starts, ends = features.embed_windows(window_s=1.0, hop_ratio=0.25)
+    expected, expected_starts, expected_ends = compute_embedding_matrix(
+        samples, sample_rate, window_s=1.0, hop_ratio=0.25
+    )
+
+    assert vectors.shape == expected.shape
+    np.testing.assert_allclose(starts, expected_starts)
+    np.testing.assert_allclose(ends, expected_ends)
+    # Band profile is dominated by the low band first, the 1-4 kHz band later.
+    assert np.argmax(vectors[0, 4:]) == 0
+    assert np.argmax(vectors[-8, 4:]) == 2
+    assert np.argmax(expected[-8, 4:]) == 2
+
+
+def test_frame_features_amplitude_stats_are_exact_on_frame_aligned_windows() -> None:
+    sample_rate = 1_000
+    rng = np.random.default_rng(3)
+    samples = rng.uniform(-1.0, 1.0, size=4_000)
+
+    features = compute_frame_features(samples, sample_rate, frame_s=0.1)
+    first = features.embed_windows(window_s=1.0, hop_ratio=0.5)[0][0]
+    window = samples[:1_000]
+    raw = np.array([np.mean(np.abs(window)), np.std(window), np.max(np.abs(window))])
+
+    # Ratios survive the row normalization, so compare them directly.
+    assert first[1] / first[0] == pytest.approx(raw[1] / raw[0], rel=1e-5)
+    assert first[2] / first[0] == pytest.approx(raw[2] / raw[0], rel=1e-5)
+
+
+def test_pipeline_sweeps_window_and_hop_on_cached_frame_features(
+    monkeypatch, tmp_path: Path
+) -> None:
+    sample_rate = 16_000
+    audio_path = tmp_path / "show.wav"
+    samples = (_two_tone_signal(sample_rate) * 20_000).astype(np.int16)
+    AudioBuffer(samples, sample_rate).write_wav(audio_path)
+    ffts: list[int] = []
+
+    def counting_frame_features(samples, sample_rate, **kwargs):  # type: ignore[no-untyped-def]
+        ffts.append(len(samples))
+        return compute_frame_features(samples, sample_rate, **kwargs)
+
+    monkeypatch.setattr(
+        "codex_audio.features.embeddings.compute_frame_features", counting_frame_features
+    )
+
+    def run(window_s: float, hop_ratio: float) -> None:
+        config_path = tmp_path / "station.yaml"
+        config_path.write_text(
+            "name: TEST\nsample_rate: 16000\nheuristics:\n"
+            "  audio_embedding_mode: spectrogram\n"
+            f"  audio_window_s: {window_s}\n  audio_hop_ratio: {hop_ratio}\n"
+        )
+        config = PipelineConfig(
+            station="TEST",
+            config_path=config_path,
+            working_dir=tmp_path / "work",
+            transcription_enabled=False,
+            clip_backend="virtual",
+            cache_enabled=True,
+        )
+        StorySegmentationPipeline(config).run(audio_path, tmp_path / f"out_{window_s}")
+
+    run(1.0, 0.5)
+    run(0.5, 0.25)
+
+    assert len(ffts) == 1
+    cache_dir = tmp_path / "work" / "cache"
+    assert len(list(cache_dir.glob("*.frames.npz"))) == 1
+    assert len(list(cache_dir.glob("*.audio_emb.npz"))) == 2
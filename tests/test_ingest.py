@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import io
+import sys
 from pathlib import Path
 
+import numpy as np
 import pytest
 from pydub import AudioSegment
 from pydub.generators import Sine
 
-from codex_audio.ingest import load_and_normalize_audio
+from codex_audio.ingest import (
+    AudioBuffer,
+    iter_pcm_blocks,
+    load_and_normalize_audio,
+    load_audio_buffer,
+    stream_audio_buffer,
+)
 
 
 def _create_stereo_tone(tmp_path: Path, duration_ms: int = 750) -> tuple[Path, AudioSegment]:
@@ -47,3 +56,83 @@ def test_load_and_normalize_audio_missing_source_path(tmp_path: Path) -> None:
     missing_path = tmp_path / "does_not_exist.wav"
     with pytest.raises(FileNotFoundError):
         load_and_normalize_audio(missing_path)
+
+
+def test_load_audio_buffer_skips_wav_when_not_requested(tmp_path: Path) -> None:
+    source_path, _ = _create_stereo_tone(tmp_path)
+    work_dir = tmp_path / "artifacts"
+
+    metadata, buffer = load_audio_buffer(source_path, work_dir=work_dir, write_wav=False)
+
+    assert buffer.path is None
+    assert not work_dir.exists()
+    assert buffer.sample_rate == 16_000
+    assert buffer.samples.dtype == np.int16
+    assert buffer.duration_s == pytest.approx(metadata.duration_s, rel=0.01)
+    assert int(np.abs(buffer.samples.astype(np.int32)).max()) > 30_000
+
+
+def test_audio_buffer_round_trips_through_memmapped_wav(tmp_path: Path) -> None:
+    source_path, _ = _create_stereo_tone(tmp_path)
+    _, buffer = load_audio_buffer(source_path, work_dir=tmp_path / "artifacts")
+
+    assert buffer.path is not None
+    reloaded = AudioBuffer.from_wav(buffer.path)
+
+    assert isinstance(reloaded.samples, np.memmap)
+    assert reloaded.sample_rate == buffer.sample_rate
+    np.testing.assert_array_equal(reloaded.samples, buffer.samples)
+    clip = reloaded.slice(0.25, 0.5)
+    assert clip.num_samples == 4_000
+
+
+def test_stream_audio_buffer_matches_metadata_and_normalizes(monkeypatch, tmp_path: Path) -> None:
+    source_path, _ = _create_stereo_tone(tmp_path)
+    decoded = (np.sin(np.linspace(0, 200 * np.pi, 12_000)) * 8_000).astype("<i2")
+    commands: list[list[str]] = []
+
+    class FakePopen:
+        def __init__(self, cmd, stdout, stderr):  # type: ignore[no-untyped-def]
+            commands.append(cmd)
+            self.stdout = io.BytesIO(decoded.tobytes())
+            self.stderr = io.BytesIO(b"")
+
+        def wait(self) -> int:
+            return 0
+
+    monkeypatch.setattr("codex_audio.ingest.subprocess.Popen", FakePopen)
+
+    metadata, buffer = stream_audio_buffer(
+        source_path, work_dir=tmp_path / "stream", block_s=0.1
+    )
+    expected, _ = load_audio_buffer(source_path, work_dir=tmp_path / "eager", write_wav=False)
+
+    assert metadata == expected
+    assert commands[0][0] == "ffmpeg"
+    assert isinstance(buffer.samples, np.memmap)
+    assert buffer.num_samples == decoded.size
+    peak = int(np.abs(buffer.samples.astype(np.int32)).max())
+    assert 32_300 <= peak <= 32_767
+
+
+def test_iter_pcm_blocks_survives_ffmpeg_flooding_stderr(monkeypatch, tmp_path: Path) -> None:
+    # Far more than a pipe buffer of decode errors before any PCM reaches stdout.
+    stub = tmp_path / "ffmpeg"
+    stub.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "for idx in range(5000):\n"
+        "    sys.stderr.write(f'[mp3float] Header missing, frame {idx}\\n')\n"
+        "sys.stderr.flush()\n"
+        "sys.stdout.buffer.write(bytes(32000))\n"
+        "sys.exit(int('bad.mp3' in sys.argv))\n"
+    )
+    stub.chmod(0o755)
+    monkeypatch.setattr("codex_audio.ingest.FFMPEG_CMD", str(stub))
+
+    blocks = list(iter_pcm_blocks("station.mp3", block_samples=4_000))
+    assert sum(block.size for block in blocks) == 16_000
+
+    with pytest.raises(RuntimeError, match="frame 4999") as excinfo:
+        list(iter_pcm_blocks("bad.mp3", block_samples=4_000))
+    assert "frame 4979" not in str(excinfo.value)
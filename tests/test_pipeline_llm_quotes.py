@@ -37,7 +37,7 @@ def test_generate_llm_candidates_aligns_with_quote(monkeypatch, tmp_path: Path)
     audio_path = tmp_path / "clip.wav"
     audio_path.write_bytes(b"fake")
 
-    candidates = pipeline._generate_llm_candidates(_words(), audio_path=audio_path)
+    candidates = pipeline._generate_llm_candidates(_words(), audio=audio_path)
     assert len(candidates) == 1
     assert candidates[0].time_s == pytest.approx(2.0)
     assert candidates[0].quote == "hello world"
@@ -3,7 +3,9 @@
 import json
 from pathlib import Path
 
-from codex_audio.ingest import AudioMetadata
+import numpy as np
+
+from codex_audio.ingest import AudioBuffer, AudioMetadata
 from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
 from codex_audio.segmentation.change_scores import ChangePoint
 from codex_audio.segmentation.planner import SegmentPlan
@@ -33,9 +35,12 @@ def test_pipeline_run_creates_manifest_and_clips(monkeypatch, tmp_path: Path) ->
         sample_width=2,
     )
 
-    def fake_load_and_normalize(source_path: Path, work_dir: Path, target_sample_rate: int):
+    def fake_load_audio_buffer(
+        source_path: Path, work_dir: Path, target_sample_rate: int, write_wav: bool
+    ):
         work_dir.mkdir(parents=True, exist_ok=True)
-        return metadata, normalized_path
+        samples = np.zeros(int(120.0 * target_sample_rate), dtype=np.int16)
+        return metadata, AudioBuffer(samples, target_sample_rate, path=normalized_path)
 
     def fake_run_vad(path: Path, aggressiveness: int, frame_duration_ms: int):
         return []
@@ -71,17 +76,17 @@ def test_pipeline_run_creates_manifest_and_clips(monkeypatch, tmp_path: Path) ->
 
     clip_outputs = []
 
-    def fake_clip_segments(source: Path, segments, out_dir: Path):
+    def fake_clip_segments(source: Path, segments, out_dir: Path, stem: str):
         out_dir.mkdir(parents=True, exist_ok=True)
         paths = []
         for idx, _ in enumerate(segments, start=1):
-            clip_path = out_dir / f"clip_{idx}.wav"
+            clip_path = out_dir / f"{stem}_clip_{idx}.wav"
             clip_path.write_bytes(b"clip")
             paths.append(clip_path)
         clip_outputs.extend(paths)
         return paths
 
-    monkeypatch.setattr("codex_audio.pipeline.load_and_normalize_audio", fake_load_and_normalize)
+    monkeypatch.setattr("codex_audio.pipeline.load_audio_buffer", fake_load_audio_buffer)
     monkeypatch.setattr("codex_audio.pipeline.run_vad", fake_run_vad)
     monkeypatch.setattr("codex_audio.pipeline.from_vad", fake_from_vad)
     monkeypatch.setattr("codex_audio.pipeline.build_segments", fake_build_segments)
@@ -94,7 +99,7 @@ def test_pipeline_run_creates_manifest_and_clips(monkeypatch, tmp_path: Path) ->
     )
     monkeypatch.setattr(
         "codex_audio.pipeline.StorySegmentationPipeline._compute_audio_embeddings",
-        lambda self, path: [],
+        lambda self, path, **kwargs: [],
     )
     monkeypatch.setattr(
         "codex_audio.pipeline.StorySegmentationPipeline._build_text_chunks",
@@ -105,8 +110,9 @@ def test_pipeline_run_creates_manifest_and_clips(monkeypatch, tmp_path: Path) ->
         lambda self, chunks: [],
     )
 
+    trace_path = tmp_path / "trace.json"
     pipeline = StorySegmentationPipeline(
-        PipelineConfig(station="CKNW", working_dir=tmp_path / "work")
+        PipelineConfig(station="CKNW", working_dir=tmp_path / "work", trace_path=trace_path)
     )
     output_dir = tmp_path / "out"
     result = pipeline.run(audio_path=audio_path, output_dir=output_dir)
@@ -119,7 +125,30 @@ def test_pipeline_run_creates_manifest_and_clips(monkeypatch, tmp_path: Path) ->
     assert result.transcript_path and result.transcript_path.exists()
     with result.manifest_path.open() as fh:
         payload = json.load(fh)
-    assert payload["segments"][0]["clip_path"].endswith("clip_1.wav")
+    assert payload["segments"][0]["clip_path"].endswith("source_clip_1.wav")
     assert Path(payload["segments"][0]["clip_path"]).exists()
     assert (output_dir / "clips").exists()
     assert payload["transcript"]["model"] == "azure"
+    assert payload["normalized_audio"] == str(normalized_path)
+    stages = {entry["stage"]: entry for entry in payload["metrics"]["stages"]}
+    assert {
+        "ingest",
+        "vad",
+        "audio_embeddings",
+        "transcription",
+        "text_chunks",
+        "text_embeddings",
+        "change_points",
+        "refinement",
+        "clipping",
+        "manifest",
+    } <= set(stages)
+    assert stages["text_chunks"]["parent"] == "text_embeddings"
+    assert stages["refinement"]["items"] == 4
+    assert stages["ingest"]["items"] == 120 * 16000
+    assert "manifest_write" not in stages
+    assert [m.name for m in result.metrics if m.name == "manifest_write"] == ["manifest_write"]
+    trace = json.loads(trace_path.read_text())
+    assert {event["name"] for event in trace["traceEvents"] if event["ph"] == "X"} == set(
+        stages
+    ) | {"manifest_write"}
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from codex_audio.ingest import AudioBuffer, AudioMetadata
+from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
+
+SAMPLE_RATE = 16_000
+
+
+def _run(  # type: ignore[no-untyped-def]
+    tmp_path: Path, name: str, audio_path: Path, **options
+) -> dict:
+    config_path = tmp_path / "station.yaml"
+    config_path.write_text(
+        "name: TEST\nsample_rate: 16000\nheuristics:\n"
+        "  min_story_len: 10\n  max_story_len: 30\n"
+        "  candidate_min_score: 0.5\n  hard_min_cut_score: 0.5\n"
+    )
+    config = PipelineConfig(
+        station="TEST",
+        config_path=config_path,
+        transcription_enabled=False,
+        clip_backend="virtual",
+        streaming_ingest=True,
+        **options,
+    )
+    result = StorySegmentationPipeline(config).run(audio_path, tmp_path / name)
+    assert result.manifest_path is not None
+    return json.loads(result.manifest_path.read_text())
+
+
+@pytest.fixture
+def long_recording(monkeypatch, stories, tmp_path: Path) -> Path:
+    audio_path = tmp_path / "day.wav"
+    AudioBuffer(stories(16, seed=5), SAMPLE_RATE).write_wav(audio_path)
+
+    def fake_stream_audio_buffer(source_path: Path, work_dir: Path, target_sample_rate: int):
+        audio = AudioBuffer.from_wav(source_path)
+        metadata = AudioMetadata(
+            source_path=source_path,
+            duration_s=audio.duration_s,
+            sample_rate=SAMPLE_RATE,
+            channels=1,
+            normalized_sample_rate=SAMPLE_RATE,
+            sample_width=2,
+        )
+        return metadata, audio
+
+    monkeypatch.setattr("codex_audio.pipeline.stream_audio_buffer", fake_stream_audio_buffer)
+    return audio_path
+
+
+def test_windowed_run_covers_recording_and_matches_full_run(
+    long_recording: Path, tmp_path: Path
+) -> None:
+    full = _run(tmp_path, "full", long_recording)
+    windowed = _run(tmp_path, "windowed", long_recording, window_s=120.0, window_overlap_s=40.0)
+
+    windows = windowed["windows"]
+    assert "windows" not in full
+    assert len(windows) >= 3
+    for window in windows:
+        assert window["end"] - window["start"] <= 120.0 + 1e-6
+    for previous, window in zip(windows, windows[1:]):
+        # Each block starts at the last boundary committed before its predecessor's overlap.
+        assert window["start"] == previous["committed_end"] <= previous["end"] - 40.0
+
+    segments = windowed["segments"]
+    duration = windowed["metadata"]["duration_s"]
+    assert segments[0]["start"] == 0.0
+    assert segments[-1]["end"] == pytest.approx(duration)
+    for previous, segment in zip(segments, segments[1:]):
+        assert segment["start"] == pytest.approx(previous["end"])
+
+    full_cuts = [segment["end"] for segment in full["segments"][:-1]]
+    windowed_cuts = [segment["end"] for segment in segments[:-1]]
+    matched = [cut for cut in full_cuts if min(abs(cut - other) for other in windowed_cuts) < 2.0]
+    assert len(matched) >= 0.8 * len(full_cuts)
+
+
+def test_windowed_run_rejects_overlap_longer_than_window(
+    long_recording: Path, tmp_path: Path
+) -> None:
+    with pytest.raises(ValueError, match="window_overlap_s"):
+        _run(tmp_path, "bad", long_recording, window_s=60.0, window_overlap_s=60.0)
@@ -2,12 +2,15 @@
 
 import math
 
+import pytest
+
 from codex_audio.boundary.candidates import BoundaryCandidate
 from codex_audio.features.diarization import DiarizationSegment
 from codex_audio.features.embeddings import AudioEmbedding
 from codex_audio.features.vad import SILENCE_LABEL, VadSegment
 from codex_audio.segmentation.change_scores import (
     ChangePoint,
+    ChangePointFrame,
     compute_change_points,
     find_peak_candidates,
     smooth_scores,
@@ -92,3 +95,32 @@ def test_compute_change_points_applies_keyword_boost() -> None:
 
     assert len(points) == 1
     assert points[0].keyword_boost == 4.0
+
+
+def test_change_point_frame_matches_point_scoring() -> None:
+    points = [
+        ChangePoint(time_s=2.5, audio_change=0.2, silence_change=0.4),
+        ChangePoint(time_s=5.0, audio_change=0.9, keyword_boost=1.0),
+        ChangePoint(time_s=7.5, text_change=0.3),
+        ChangePoint(time_s=10.0, audio_change=0.1, anchor_flag=1.0),
+        ChangePoint(time_s=12.5, audio_change=0.7, text_change=0.6),
+        ChangePoint(time_s=15.0),
+    ]
+    weights = {"audio": 1.0, "text": 1.3, "silence": 0.7, "anchor": 1.5, "keyword": 3.0}
+    frame = ChangePointFrame.from_points(points)
+
+    assert frame.to_points() == points
+    assert frame.combined(weights).tolist() == [point.combined(weights) for point in points]
+
+    assert smooth_scores([1.0, 2.0, 3.0, 4.0], window_size=1) == pytest.approx(
+        [1.5, 2.0, 3.0, 3.5]
+    )
+    window = frame.between(2.5, 15.0)
+    assert [point.time_s for point in window] == [5.0, 7.5, 10.0, 12.5]
+    scores = [point.combined(weights) for point in window]
+    expected = find_peak_candidates(
+        [point.time_s for point in window], smooth_scores(scores, window_size=1), min_score=0.5
+    )
+    peaks = window.peak_candidates(weights, min_score=0.5, smoothing_window=1)
+    assert [peak.time_s for peak in peaks] == [peak.time_s for peak in expected]
+    assert [peak.score for peak in peaks] == pytest.approx([peak.score for peak in expected])
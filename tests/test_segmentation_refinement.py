@@ -4,7 +4,12 @@ import pytest
 
 from codex_audio.features.vad import SILENCE_LABEL, VadSegment
 from codex_audio.segmentation.change_scores import ChangePoint
-from codex_audio.segmentation.refinement import RefinementParams, refine_chunk_segments
+from codex_audio.segmentation.planner import SegmentPlan
+from codex_audio.segmentation.refinement import (
+    RefinementParams,
+    refine_chunk_segments,
+    refine_global_segments,
+)
 from codex_audio.segmentation.selection import SegmentConstraint
 from codex_audio.transcription import TranscriptWord
 
@@ -111,4 +116,48 @@ def test_refine_chunk_segments_forces_cut_when_chunk_long() -> None:
     assert pytest.approx(segments[0].end_s) == 100.0
 
 
+def test_refine_global_segments_cuts_across_chunk_seams() -> None:
+    chunks = [SegmentPlan(0.0, 100.0, "a"), SegmentPlan(100.0, 200.0, "b")]
+    points = [
+        ChangePoint(time_s=30.0, audio_change=0.1),
+        ChangePoint(time_s=70.0, audio_change=1.0),
+        ChangePoint(time_s=100.0, audio_change=0.1),
+        ChangePoint(time_s=140.0, audio_change=1.2),
+        ChangePoint(time_s=170.0, audio_change=0.1),
+    ]
+
+    segments = refine_global_segments(chunks, change_points=points, params=_params())
+
+    assert [(seg.start_s, seg.end_s) for seg in segments] == [
+        (0.0, 70.0),
+        (70.0, 140.0),
+        (140.0, 200.0),
+    ]
+    assert [seg.label for seg in segments] == ["a|change_peak", "a|change_peak", "b|chunk_tail"]
+
+
+def test_refine_global_segments_falls_back_to_seams_for_max_len() -> None:
+    chunks = [SegmentPlan(0.0, 80.0, "a"), SegmentPlan(80.0, 160.0, "b")]
+
+    segments = refine_global_segments(chunks, change_points=[], params=_params())
+
+    assert [(seg.start_s, seg.end_s, seg.label) for seg in segments] == [
+        (0.0, 80.0, "a"),
+        (80.0, 160.0, "b"),
+    ]
+
+
+def test_refine_global_segments_keeps_score_floor_around_uncuttable_stretch() -> None:
+    chunks = [SegmentPlan(0.0, 300.0, "a"), SegmentPlan(300.0, 600.0, "b")]
+    # Strong cuts every 60 s, weak ones between them, then 300 s of music bed.
+    levels = {0: 2.0, 30: 0.9}
+    points = [
+        ChangePoint(time_s=float(t), audio_change=levels.get(t % 60, 0.1))
+        for t in range(10, 300, 10)
+    ]
+    params = _params(hard_min_cut_score=1.0)
+
+    segments = refine_global_segments(chunks, change_points=points, params=params)
 
+    assert [seg.end_s for seg in segments] == [60.0, 120.0, 180.0, 240.0, 300.0, 600.0]
+    assert segments[-1].label == "b"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from codex_audio.pipeline import PipelineConfig, PipelineResult, StorySegmentationPipeline
+from codex_audio.server import QueueFullError, SegmentationJob, SegmentationService, make_server
+
+
+def _request(url: str, payload: dict | None = None) -> tuple[int, dict]:
+    data = json.dumps(payload).encode() if payload is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_serve_runs_jobs_on_warm_station_pipelines(
+    fake_pipeline: list[PipelineConfig], tmp_path: Path
+) -> None:
+    (tmp_path / "CBC.yaml").write_text("name: CBC\nsample_rate: 16000\n")
+
+    service = SegmentationService(PipelineConfig(station="CKNW"), workers=2, config_dir=tmp_path)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    out = tmp_path / "out"
+    try:
+        ids = []
+        for name, station in [("a.wav", "CBC"), ("b.wav", "CBC"), ("broken.wav", None)]:
+            status, body = _request(
+                f"{base}/jobs",
+                {"audio_path": str(tmp_path / name), "station": station, "out_dir": str(out)},
+            )
+            assert status == 202
+            ids.append(body["id"])
+        results = [_request(f"{base}/jobs/{job_id}?wait=5")[1] for job_id in ids]
+        assert [result["status"] for result in results] == ["done", "done", "failed"]
+        assert results[0]["manifest"] == str(out / "segments.json")
+        assert results[2]["error"] == "RuntimeError: decode failed"
+        assert results[0]["latency_s"] >= results[0]["queue_wait_s"] >= 0.0
+
+        status, stats = _request(f"{base}/stats")
+        assert status == 200
+        assert stats["completed"] == 2 and stats["failed"] == 1
+        assert stats["queue_depth"] == 0 and stats["pipelines"] == ["CBC", "CKNW"]
+        assert "latency_p95_s" in stats
+        assert sorted(config.station for config in fake_pipeline) == ["CBC", "CKNW"]
+
+        assert _request(f"{base}/jobs", {"audio_path": "c.wav"})[0] == 400
+        assert _request(f"{base}/jobs/missing")[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_submit_rejects_jobs_when_queue_is_full(monkeypatch, tmp_path: Path) -> None:
+    release = threading.Event()
+
+    def blocking_run(  # type: ignore[no-untyped-def]
+        self, audio_path: Path, output_dir: Path
+    ) -> PipelineResult:
+        release.wait(5)
+        return PipelineResult()
+
+    monkeypatch.setattr(StorySegmentationPipeline, "run", blocking_run)
+    service = SegmentationService(PipelineConfig(station="CKNW"), workers=1, queue_size=1)
+
+    def job() -> SegmentationJob:
+        return SegmentationJob(audio_path=tmp_path / "a.wav", station="CKNW", out_dir=tmp_path)
+
+    running = service.submit(job())
+    assert service.wait(running.id, timeout=0.5).status == "running"  # type: ignore[union-attr]
+    service.submit(job())
+    with pytest.raises(QueueFullError):
+        service.submit(job())
+    assert service.stats()["queue_depth"] == 1
+
+    release.set()
+    service.close(timeout=5)
+    assert service.stats()["completed"] == 2
+
+
+def test_job_wait_is_capped_and_woken_when_the_job_finishes(monkeypatch, tmp_path: Path) -> None:
+    release = threading.Event()
+
+    def blocking_run(  # type: ignore[no-untyped-def]
+        self, audio_path: Path, output_dir: Path
+    ) -> PipelineResult:
+        release.wait(5)
+        return PipelineResult()
+
+    monkeypatch.setattr(StorySegmentationPipeline, "run", blocking_run)
+    monkeypatch.setattr("codex_audio.server.MAX_JOB_WAIT_S", 0.2)
+    service = SegmentationService(PipelineConfig(station="CKNW"), workers=1)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        job = service.submit(
+            SegmentationJob(audio_path=tmp_path / "a.wav", station="CKNW", out_dir=tmp_path)
+        )
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        started = time.monotonic()
+        status, payload = _request(f"{base}/jobs/{job.id}?wait=3600")
+        assert status == 200 and payload["status"] == "running"
+        assert time.monotonic() - started < 2.0
+
+        waited: list[float] = []
+        waiter = threading.Thread(
+            target=lambda: (service.wait(job.id, timeout=30), waited.append(time.monotonic()))
+        )
+        waiter.start()
+        released = time.monotonic()
+        release.set()
+        waiter.join(5)
+        assert service.job(job.id).status == "done"  # type: ignore[union-attr]
+        assert waited and waited[0] - released < 1.0
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
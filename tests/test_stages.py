@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from codex_audio.stages import StageGraph
+
+
+def test_stage_graph_runs_independent_tracks_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=2.0)
+
+    def audio_track() -> str:
+        barrier.wait()
+        return "vad"
+
+    def text_track() -> str:
+        barrier.wait()
+        time.sleep(0.01)
+        return "words"
+
+    graph = StageGraph()
+    graph.add("vad", audio_track)
+    graph.add("transcription", text_track)
+    graph.add("text_embeddings", lambda words: f"{words}-emb", deps=("transcription",))
+
+    result = graph.run(max_workers=2)
+
+    assert result["vad"] == "vad"
+    assert result["text_embeddings"] == "words-emb"
+    timings = {timing.name: timing for timing in result.timings}
+    assert set(timings) == {"vad", "transcription", "text_embeddings"}
+    assert timings["text_embeddings"].start_s >= timings["transcription"].end_s
+    assert result.wall_s >= timings["transcription"].duration_s
+
+
+def test_stage_graph_rejects_unknown_dependencies_and_propagates_errors() -> None:
+    graph = StageGraph()
+    with pytest.raises(ValueError):
+        graph.add("text_embeddings", lambda words: words, deps=("transcription",))
+
+    def fail() -> None:
+        raise RuntimeError("stt down")
+
+    graph.add("transcription", fail)
+    graph.add("text_embeddings", lambda words: words, deps=("transcription",))
+    with pytest.raises(RuntimeError, match="stt down"):
+        graph.run()
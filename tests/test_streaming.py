@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import soundfile as sf
+
+from codex_audio.segmentation import RefinementParams, SegmentConstraint
+from codex_audio.streaming import RollingSegmenter
+
+SAMPLE_RATE = 16_000
+
+
+def test_rolling_segmenter_commits_contiguous_stories_within_horizon(
+    stories, tmp_path: Path
+) -> None:
+    audio = stories(8, seed=3)
+    params = RefinementParams(
+        constraints=SegmentConstraint(min_len=10.0, max_len=30.0),
+        candidate_min_score=0.5,
+        hard_min_cut_score=0.5,
+    )
+    segmenter = RollingSegmenter(params=params, update_s=2.0, clip_dir=tmp_path / "clips")
+
+    events = []
+    live = []
+    for start in range(0, len(audio), SAMPLE_RATE):
+        committed = segmenter.push(audio[start : start + SAMPLE_RATE])
+        live.extend(committed)
+        events.extend(committed)
+        # Only the open story and its look-back stay buffered.
+        assert segmenter.buffered_s <= 30.0 + 30.0 + 2.0 + 10.0 + 2.0
+    events.extend(segmenter.flush())
+
+    assert len(live) >= 3
+    assert events[0].start_s == 0.0
+    assert events[-1].end_s == len(audio) / SAMPLE_RATE
+    for previous, event in zip(events, events[1:]):
+        assert event.start_s == previous.end_s
+    for event in live:
+        assert segmenter.horizon_s <= event.latency_s <= 30.0 + segmenter.horizon_s + 2.0
+    assert segmenter.latency_summary()["stories"] == len(events)
+
+    first = sf.info(str(events[0].clip_path))
+    assert abs(first.duration - (events[0].end_s - events[0].start_s)) < 1e-3
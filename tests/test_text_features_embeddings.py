@@ -4,6 +4,7 @@ import pytest
 
 from codex_audio.text_features import TextChunk
 from codex_audio.text_features.embeddings import ChunkEmbedding, embed_chunks
+from codex_audio.utils.clients import ClientCache
 
 
 def _chunk(start: float, end: float, text: str) -> TextChunk:
@@ -51,7 +52,7 @@ def test_embed_chunks_invokes_openai(monkeypatch) -> None:
 
     assert len(embeddings) == 2
     assert isinstance(embeddings[0], ChunkEmbedding)
-    assert embeddings[0].vector == [0.1, 0.2]
+    assert embeddings[0].vector == pytest.approx([0.1, 0.2])
     assert created_clients["client"].kwargs["azure_endpoint"].startswith("https://")
     assert created_clients["client"].embeddings.calls[0]["input"][0] == "hello world"
 
@@ -61,3 +62,30 @@ def test_embed_chunks_requires_credentials(monkeypatch) -> None:
     monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
     with pytest.raises(ValueError):
         embed_chunks([_chunk(0.0, 1.0, "text")])
+
+
+def test_embed_chunks_reuses_cached_client_per_endpoint(monkeypatch) -> None:
+    built: list[dict] = []
+
+    class FakeClient:
+        def __init__(self, **kwargs) -> None:
+            built.append(kwargs)
+            self.embeddings = self
+
+        def create(self, *, model: str, input: list[str]):  # type: ignore[no-untyped-def]
+            item = type("Item", (), {"embedding": [0.5, 0.5]})
+            return type("Response", (), {"data": [item] * len(input)})
+
+    monkeypatch.setenv("AZURE_OPENAI_KEY", "key")
+    monkeypatch.setattr("codex_audio.text_features.embeddings.AzureOpenAI", FakeClient)
+    clients = ClientCache()
+    chunks = [_chunk(0.0, 5.0, "hello world")]
+
+    for endpoint in ["https://a.example", "https://a.example", "https://b.example"]:
+        assert len(embed_chunks(chunks, endpoint=endpoint, clients=clients)) == 1
+
+    assert [kwargs["azure_endpoint"] for kwargs in built] == [
+        "https://a.example",
+        "https://b.example",
+    ]
+    assert len(clients) == 2
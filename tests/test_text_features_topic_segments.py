@@ -1,8 +1,12 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import json
 
+import pytest
+
 from codex_audio.boundary.candidates import BoundaryCandidate
+from codex_audio.text_features import topic_segments
 from codex_audio.text_features.topic_segments import detect_topic_boundaries
 from codex_audio.transcription import TranscriptWord
 
@@ -60,3 +64,108 @@ def test_detect_topic_boundaries_handles_brackets(monkeypatch) -> None:
 
     assert [round(c.time_s) for c in candidates] == [10, 55]
     assert all(candidate.quote is None for candidate in candidates)
+
+
+def _hour_of_words() -> list[TranscriptWord]:
+    return [
+        TranscriptWord(text=f"w{idx}", start_s=float(idx), end_s=idx + 0.5) for idx in range(3600)
+    ]
+
+
+def _window_start(prompt: str) -> float:
+    return float(prompt.split("excerpt (", 1)[1].split("s to", 1)[0])
+
+
+def _boundary_response(prompt: str) -> str:
+    # Windows start 480 s apart, so "start + 510" of one is "start + 30" of the next.
+    start = _window_start(prompt)
+    return json.dumps({"boundaries": [{"time_s": start + 30.0}, {"time_s": start + 510.0}]})
+
+
+def test_windows_are_dispatched_concurrently_and_merged_in_window_order() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def fake_async_provider(prompt, model, key, endpoint, api_version, system_prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later windows answer first.
+        await asyncio.sleep(0.05 - _window_start(prompt) / 100_000)
+        in_flight -= 1
+        return _boundary_response(prompt)
+
+    concurrent = detect_topic_boundaries(
+        _hour_of_words(), async_response_provider=fake_async_provider, max_concurrency=3
+    )
+    sequential = detect_topic_boundaries(
+        _hour_of_words(),
+        response_provider=lambda prompt, *args: _boundary_response(prompt),
+        max_concurrency=1,
+    )
+
+    assert peak == 3
+    assert concurrent == sequential
+    assert any("votes=2" in candidate.reason for candidate in concurrent)
+
+
+def test_rate_limited_windows_are_retried(monkeypatch) -> None:
+    class RateLimitError(Exception):
+        status_code = 429
+
+    calls: list[float] = []
+
+    def flaky_provider(prompt, model, key, endpoint, api_version, system_prompt):
+        calls.append(_window_start(prompt))
+        if calls.count(_window_start(prompt)) <= 2:
+            raise RateLimitError("Too many requests")
+        return _boundary_response(prompt)
+
+    monkeypatch.setattr(topic_segments, "RETRY_BASE_DELAY_S", 0.0)
+    candidates = detect_topic_boundaries(_words(), response_provider=flaky_provider)
+    assert len(calls) == 3
+    assert [candidate.time_s for candidate in candidates] == [30.0, 510.0]
+
+    calls.clear()
+    with pytest.raises(RateLimitError):
+        detect_topic_boundaries(_words(), response_provider=flaky_provider, max_retries=1)
+
+    def broken_provider(*args):  # type: ignore[no-untyped-def]
+        calls.append(0.0)
+        raise ValueError("bad request")
+
+    calls.clear()
+    with pytest.raises(ValueError):
+        detect_topic_boundaries(_words(), response_provider=broken_provider)
+    assert len(calls) == 1
+
+
+def test_default_provider_shares_one_client_without_sdk_retries(monkeypatch) -> None:
+    built: list["FakeClient"] = []
+
+    class FakeClient:
+        def __init__(self, max_retries: int = 2, **kwargs) -> None:
+            self.max_retries = max_retries
+            self.chat = self.completions = self
+            self.prompts: list[str] = []
+            built.append(self)
+
+        def with_options(self, *, max_retries: int) -> "FakeClient":
+            copy = FakeClient(max_retries=max_retries)
+            copy.prompts = self.prompts
+            return copy
+
+        def create(self, *, messages, **kwargs):  # type: ignore[no-untyped-def]
+            assert self.max_retries == 0
+            self.prompts.append(messages[-1]["content"])
+            message = type("Message", (), {"content": _boundary_response(self.prompts[-1])})
+            return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+    monkeypatch.setattr("codex_audio.text_features.embeddings.AzureOpenAI", FakeClient)
+    words = [TranscriptWord("story", 60.0 * minute, 60.0 * minute + 0.5) for minute in range(30)]
+
+    candidates = detect_topic_boundaries(words, key="key", endpoint="https://example.com")
+
+    assert len(built) == 2 and [client.max_retries for client in built] == [2, 0]
+    assert len(built[0].prompts) == 4
+    assert candidates
@@ -1,6 +1,7 @@
 ﻿from __future__ import annotations
 
 import json
+import random
 from pathlib import Path
 
 import pytest
@@ -8,6 +9,7 @@ from pydub import AudioSegment
 from pydub.generators import Sine
 
 from codex_audio.transcription.azure_speech import (
+    QuoteIndex,
     TranscriptWord,
     TranscriptionError,
     match_quote_to_timestamps,
@@ -257,6 +259,83 @@ def test_match_quote_to_timestamps_finds_window() -> None:
     assert end_ms == 2000
 
 
+def test_match_quote_to_timestamps_uses_index_and_time_hint() -> None:
+    phrase = ["you're", "listening", "to", "global", "news"]
+    words: list[TranscriptWord] = []
+    for block in range(3):
+        base = block * 100.0
+        words.append(TranscriptWord("-", base, base + 0.1))
+        words.extend(
+            TranscriptWord(text, base + 0.5 * (i + 1), base + 0.5 * (i + 2))
+            for i, text in enumerate(phrase)
+        )
+        words.append(TranscriptWord(f"story{block}", base + 4.0, base + 4.5))
+    index = QuoteIndex(words)
+    quote = "You're listening to Global News"
+
+    expected = match_quote_to_timestamps(quote, words, exhaustive=True)
+    assert match_quote_to_timestamps(quote, words, index=index) == expected == (0, 3000)
+    assert match_quote_to_timestamps(quote, words, index=index, time_hint_s=205.0) == (
+        200000,
+        203000,
+    )
+    fuzzy = "listening to global newz"
+    assert match_quote_to_timestamps(fuzzy, words, index=index, time_hint_s=100.0) == (
+        101000,
+        102500,
+    )
+
+
+def test_indexed_quote_search_matches_exhaustive_scan() -> None:
+    vocab = (
+        "the news today weather traffic police city council mayor said don't it's "
+        "storm sports hockey rain election vote - budget school fire"
+    ).split()
+    # Inflected and misspelled forms share no whole token with the transcript
+    # but can still reach min_ratio through partial string similarity.
+    near_misses = [
+        lambda token: token + "s",
+        lambda token: token + "'s",
+        lambda token: token + "ors",
+        lambda token: token[:-1] or token,
+        lambda token: token[:1] + token[2:] if len(token) > 2 else token,
+    ]
+    repeat = "council's report . . . . . . . . government's councilors voted".split()
+    words = [TranscriptWord(text, float(idx), idx + 0.5) for idx, text in enumerate(repeat)]
+    assert match_quote_to_timestamps("governments council votes", words) == (5000, 12500)
+
+    rng = random.Random(7)
+    for _ in range(60):
+        words = []
+        clock = 0.0
+        for _ in range(rng.randint(5, 200)):
+            duration = rng.uniform(0.1, 0.6)
+            words.append(TranscriptWord(rng.choice(vocab), clock, clock + duration))
+            # Pauses spread 200 words over minutes, well past the quote hint window.
+            clock += duration + rng.uniform(0.0, 3.0)
+        start = rng.randrange(len(words))
+        quote = [word.text for word in words[start : start + rng.randint(1, 10)]]
+        for _ in range(rng.randint(0, 3)):
+            position = rng.randrange(len(quote) + 1)
+            if rng.random() < 0.5 and position < len(quote):
+                quote[position] = rng.choice(vocab)
+            else:
+                quote.insert(position, rng.choice(vocab))
+        quote = [
+            rng.choice(near_misses)(token) if rng.random() < 0.3 else token for token in quote
+        ]
+        text = " ".join(quote)
+        hint = rng.uniform(0.0, clock)
+
+        expected = match_quote_to_timestamps(text, words, exhaustive=True)
+        index = QuoteIndex(words)
+        assert match_quote_to_timestamps(text, words, index=index) == expected
+        assert (
+            match_quote_to_timestamps(text, words, index=index, time_hint_s=hint, exhaustive=True)
+            == expected
+        )
+
+
 def test_refine_range_with_silence_snaps_to_gap(tmp_path: Path) -> None:
     tone = Sine(440).to_audio_segment(duration=400)
     audio = AudioSegment.silent(duration=300) + tone + AudioSegment.silent(duration=400)
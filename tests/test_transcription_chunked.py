@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from codex_audio.features.vad import VadSegment
+from codex_audio.ingest import AudioBuffer
+from codex_audio.transcription.chunked import plan_transcription_chunks, transcribe_chunked
+from codex_audio.transcription.fake import FakeSpeechService
+
+SAMPLE_RATE = 16_000
+LOW_TONES = (300, 350, 400)
+HIGH_TONES = (1_200, 1_300, 1_400)
+
+
+def _tone_program(duration_s: float = 40.0) -> tuple[AudioBuffer, list[VadSegment]]:
+    """Bursts alternating between a low and a high "speaker", silent around 10/20/30 s."""
+
+    samples = np.zeros(int(duration_s * SAMPLE_RATE), dtype=np.float64)
+    silences = [(9.2, 10.8), (19.2, 20.8), (29.2, 30.8)]
+    regions = [(0.0, 9.2), (10.8, 19.2), (20.8, 29.2), (30.8, duration_s)]
+    for region_idx, (start, end) in enumerate(regions):
+        cursor, word_idx = start + 0.1, 0
+        while cursor + 0.3 < end:
+            # Odd regions open with the high speaker so per-session labels disagree.
+            high = (word_idx // 3 + region_idx) % 2 == 1
+            freq = (HIGH_TONES if high else LOW_TONES)[word_idx % 3]
+            first = int(round(cursor * SAMPLE_RATE))
+            t = np.arange(int(0.3 * SAMPLE_RATE)) / SAMPLE_RATE
+            samples[first : first + len(t)] = 0.5 * np.sin(2 * np.pi * freq * t)
+            cursor += 0.5
+            word_idx += 1
+    vad = [VadSegment(start, end, "silence") for start, end in silences]
+    pcm = (samples * 32767).astype(np.int16)
+    return AudioBuffer(pcm, SAMPLE_RATE), vad
+
+
+def test_plan_transcription_chunks_cuts_at_silences() -> None:
+    _, vad = _tone_program()
+
+    chunks = plan_transcription_chunks(40.0, vad, target_chunk_s=10.0, overlap_s=6.0)
+
+    assert [chunk.seam_start_s for chunk in chunks] == pytest.approx([0.0, 10.0, 20.0, 30.0])
+    assert chunks[1].start_s == pytest.approx(7.0)
+    assert chunks[1].end_s == pytest.approx(23.0)
+    assert chunks[-1].seam_end_s == pytest.approx(40.0)
+    with pytest.raises(ValueError):
+        plan_transcription_chunks(40.0, vad, target_chunk_s=0.0)
+
+
+def test_transcribe_chunked_matches_single_session(tmp_path: Path) -> None:
+    audio, vad = _tone_program()
+    audio.write_wav(tmp_path / "program.wav")
+    reference = FakeSpeechService(speaker_split_hz=800).transcribe(audio)
+    service = FakeSpeechService(speaker_split_hz=800, realtime_factor=0.02)
+
+    result = transcribe_chunked(
+        audio,
+        vad,
+        transcriber=service,
+        target_chunk_s=10.0,
+        overlap_s=6.0,
+        max_workers=4,
+        work_dir=tmp_path,
+    )
+
+    assert service.calls == 4
+    assert service.max_concurrency > 1
+    assert [word.text for word in result.words] == [word.text for word in reference.words]
+    assert [word.start_s for word in result.words] == pytest.approx(
+        [word.start_s for word in reference.words]
+    )
+    # Speaker labels agree with the single session up to renaming.
+    pairs = {(word.speaker_id, ref.speaker_id) for word, ref in zip(result.words, reference.words)}
+    assert len(pairs) == 2
+    assert len({word.speaker_id for word in result.words}) == 2
+    assert len(result.raw["chunks"]) == 4
+    assert not list(tmp_path.glob("stt-chunks-*"))
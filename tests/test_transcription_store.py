@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import numpy as np
+from typer.testing import CliRunner
+
+from codex_audio.cli import app
+from codex_audio.ingest import AudioBuffer
+from codex_audio.pipeline import PipelineConfig, StorySegmentationPipeline
+from codex_audio.transcription import TranscriptionOutput, TranscriptWord
+from codex_audio.transcription.store import TranscriptStore, audio_digest, transcript_key
+
+
+def _transcript(text: str = "hello") -> TranscriptionOutput:
+    return TranscriptionOutput(
+        words=[TranscriptWord(text, 0.5, 0.9, speaker_id="Guest-1")],
+        language="en-CA",
+        raw={"segments": [{"text": text}]},
+    )
+
+
+def test_store_round_trips_and_prunes(tmp_path: Path) -> None:
+    store_path = tmp_path / "transcripts.sqlite"
+    audio = AudioBuffer(np.arange(1_600, dtype=np.int16), 16_000)
+    key = transcript_key(
+        audio_digest(audio), language="en-CA", diarization_enabled=True, max_speakers=2
+    )
+    other = transcript_key(
+        audio_digest(audio), language="en-CA", diarization_enabled=False, max_speakers=2
+    )
+
+    with TranscriptStore(store_path) as store:
+        assert store.get(key) is None
+        store.put(key, _transcript())
+        store.put(other, _transcript("stale"))
+        assert store.get(key).to_payload() == _transcript().to_payload()
+        assert (store.hits, store.misses) == (1, 1)
+
+        store._conn.execute("UPDATE transcripts SET accessed = ? WHERE key = ?", (0.0, other))
+        assert store.prune(max_age_s=3_600) == 1
+        assert store.get(other) is None
+        assert store.prune(max_bytes=0) == 1
+        assert store.stats()["entries"] == 0
+
+
+def test_run_transcription_consults_store(monkeypatch, tmp_path: Path) -> None:
+    calls: list[Path] = []
+
+    def fake_transcribe(audio, **kwargs):  # type: ignore[no-untyped-def]
+        calls.append(audio.path)
+        return _transcript()
+
+    monkeypatch.setattr("codex_audio.pipeline.transcribe_audio", fake_transcribe)
+    audio = AudioBuffer(np.ones(1_600, dtype=np.int16), 16_000)
+    audio.write_wav(tmp_path / "norm.wav")
+    config = PipelineConfig(station="CKNW", transcript_store=tmp_path / "store.sqlite")
+
+    first = StorySegmentationPipeline(config)._run_transcription(audio)
+    second_pipeline = StorySegmentationPipeline(config)
+    second = second_pipeline._run_transcription(audio)
+
+    assert len(calls) == 1
+    assert first and second and second.words[0].text == "hello"
+    assert second_pipeline._transcript_store.hits == 1
+
+
+def test_transcripts_prune_cli(tmp_path: Path) -> None:
+    store_path = tmp_path / "store.sqlite"
+    with TranscriptStore(store_path) as store:
+        store.put("key", _transcript())
+    time.sleep(0.01)
+
+    result = CliRunner().invoke(
+        app, ["transcripts", "prune", "--store", str(store_path), "--max-age-days", "0"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Removed 1 transcripts" in result.output
+
+
+def test_transcripts_stats_cli_counts_lookups_across_handles(tmp_path: Path) -> None:
+    store_path = tmp_path / "store.sqlite"
+    with TranscriptStore(store_path) as store:
+        assert store.get("key") is None
+        store.put("key", _transcript())
+    with TranscriptStore(store_path) as store:
+        assert store.get("key") is not None
+        assert store.get("other") is None
+
+    result = CliRunner().invoke(app, ["transcripts", "stats", "--store", str(store_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "1 transcripts" in result.output
+    assert "1 hits, 2 misses (33% hit rate)" in result.output
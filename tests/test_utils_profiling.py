@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+import pstats
+import threading
+from pathlib import Path
+
+from codex_audio.utils.profiling import StageProfiler, count_items
+
+
+def _busy(count: int) -> list[int]:
+    return [value * value for value in range(count)]
+
+
+def test_stage_profiler_records_nested_and_threaded_stages(tmp_path: Path) -> None:
+    profiler = StageProfiler(profile_dir=tmp_path / "profiles")
+
+    with profiler.stage("outer") as record:
+        squares = profiler.call("inner", _busy, 50_000)
+        record.items = 1
+    worker = threading.Thread(target=profiler.call, args=("threaded", _busy, 10), name="side")
+    worker.start()
+    worker.join()
+
+    stages = {entry["stage"]: entry for entry in profiler.to_payload()["stages"]}
+    assert len(squares) == 50_000
+    assert stages["inner"]["parent"] == "outer"
+    assert stages["inner"]["items"] == 50_000
+    assert stages["outer"]["parent"] is None
+    assert stages["outer"]["wall_s"] >= stages["inner"]["wall_s"]
+    assert stages["outer"]["cpu_s"] > 0
+    assert stages["threaded"]["thread"] == "side"
+    # Only outermost stages get a cProfile dump of their own.
+    assert sorted(path.name for path in (tmp_path / "profiles").iterdir()) == [
+        "outer.prof",
+        "threaded.prof",
+    ]
+    assert pstats.Stats(str(tmp_path / "profiles" / "outer.prof")).total_calls > 0
+
+    trace = json.loads(profiler.write_chrome_trace(tmp_path / "trace.json").read_text())
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert [event["name"] for event in complete] == ["outer", "inner", "threaded"]
+    assert complete[0]["tid"] == complete[1]["tid"] != complete[2]["tid"]
+
+
+def test_stage_profiles_accumulate_across_repeated_stages(tmp_path: Path) -> None:
+    profiler = StageProfiler(profile_dir=tmp_path / "profiles")
+
+    def first_window() -> list[int]:
+        return _busy(1_000)
+
+    def second_window() -> list[int]:
+        return _busy(2_000)
+
+    for window in (first_window, second_window):
+        profiler.call("vad", window)
+
+    stats = pstats.Stats(str(tmp_path / "profiles" / "vad.prof"))
+    profiled = {function for _, _, function in stats.stats}  # type: ignore[attr-defined]
+    assert {"first_window", "second_window"} <= profiled
+    assert [path.name for path in (tmp_path / "profiles").iterdir()] == ["vad.prof"]
+
+
+def test_count_items_uses_length_or_transcript_words() -> None:
+    class Transcript:
+        words = ["a", "b", "c"]
+
+    assert count_items([1, 2]) == 2
+    assert count_items(None) == 0
+    assert count_items(Transcript()) == 3
+    assert count_items(1.5) is None
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from codex_audio.utils.rate_limit import TokenBucket
+
+
+def test_token_bucket_allows_a_burst_then_holds_the_rate() -> None:
+    async def acquire_times(bucket: TokenBucket, count: int) -> list[float]:
+        start = time.monotonic()
+        stamps = []
+        for _ in range(count):
+            await bucket.acquire()
+            stamps.append(time.monotonic() - start)
+        return stamps
+
+    stamps = asyncio.run(acquire_times(TokenBucket(50.0, capacity=3), 8))
+    assert stamps[2] < 0.01  # the burst
+    # Five more tokens at 50/s take at least 0.1 s.
+    assert stamps[-1] >= 0.1 - 0.005
+
+    with pytest.raises(ValueError):
+        TokenBucket(0.0)
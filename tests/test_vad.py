@@ -7,6 +7,7 @@ import pytest
 from pydub.generators import Sine
 
 from codex_audio.features import vad
+from codex_audio.ingest import AudioBuffer
 
 
 def _write_audio(tmp_path: Path, duration_ms: int) -> Path:
@@ -51,3 +52,45 @@ def test_run_vad_missing_audio(tmp_path: Path) -> None:
     missing = tmp_path / "missing.wav"
     with pytest.raises(FileNotFoundError):
         vad.run_vad(missing)
+
+
+def test_run_vad_accepts_audio_buffer(monkeypatch, tmp_path: Path) -> None:
+    audio_path = _write_audio(tmp_path, duration_ms=900)
+    buffer = AudioBuffer.from_wav(audio_path)
+
+    class AlwaysSpeech:
+        def __init__(self, aggressiveness: int) -> None:
+            pass
+
+        def is_speech(self, frame: bytes, sample_rate: int) -> bool:
+            return True
+
+    monkeypatch.setattr(vad.webrtcvad, "Vad", AlwaysSpeech)
+
+    from_path = vad.run_vad(audio_path)
+    from_buffer = vad.run_vad(buffer)
+
+    assert from_buffer == from_path
+    assert from_buffer[-1].end_s == pytest.approx(0.9)
+
+
+def test_vad_timeline_queries_match_segment_scans() -> None:
+    segments = [
+        vad.VadSegment(0.0, 1.0, "speech"),
+        vad.VadSegment(1.0, 1.3, "silence"),
+        vad.VadSegment(1.3, 4.0, "speech"),
+        vad.VadSegment(4.0, 4.9, "silence"),
+        vad.VadSegment(4.9, 5.2, "speech"),
+        vad.VadSegment(5.2, 5.4, "silence"),
+    ]
+    timeline = vad.VadTimeline.from_segments(segments)
+
+    assert list(timeline) == segments
+    assert timeline.label_at(1.1) == vad.SILENCE_LABEL
+    # Shared edges resolve to the earlier segment, as a front-to-back scan would.
+    assert timeline.index_at(1.0) == 0
+    assert timeline.label_at(6.0) is None
+    assert timeline.silences_overlapping(0.5, 4.0).tolist() == [1]
+    assert timeline.silences_overlapping(3.9, 5.3).tolist() == [3, 5]
+    assert timeline.longest_silence_in(0.5, 5.3) == 3
+    assert timeline.longest_silence_in(1.5, 3.5) is None